@@ -0,0 +1,87 @@
+"""
+Benchmark bundle serialization: the stix2 path versus the fast path.
+
+Synthesizes a dataset, converts it to stix2 objects, and measures
+objects per second for:
+
+- bundle: stix2.Bundle(...).serialize() versus iter_bundle_json()
+- to_dict: json.loads(obj.serialize()) versus serialization.to_dict()
+- dicts: iter_bundle_json() over plain dictionaries (no stix2 objects at all),
+  with orjson and with the json module fallback
+
+Usage:
+    python -m benchmarks.serialization --count 20000 [--compact]
+"""
+
+import json
+import time
+import argparse
+from typing import Callable, Dict, Any, List
+
+from stix2 import Bundle, parse
+
+from stix_generator.core.bundler import iter_bundle_json
+from stix_generator.core.context import ContextStore
+from stix_generator.core.synthesizer import StixObjectSynthesizer
+from stix_generator.utils import serialization
+
+OBJECT_TYPES = ["threat-actor", "malware", "tool", "attack-pattern", "indicator", "vulnerability", "identity"]
+
+def build_dataset(count: int, seed: int) -> List[Dict[str, Any]]:
+    """Synthesize count objects spread over OBJECT_TYPES."""
+    synthesizer = StixObjectSynthesizer(seed)
+    context = ContextStore()
+    per_type = max(1, count // len(OBJECT_TYPES))
+    for obj_type in OBJECT_TYPES:
+        context.extend(synthesizer.generate(obj_type, per_type, context))
+    return list(context)
+
+def measure(label: str, count: int, run: Callable[[], Any], repeat: int) -> float:
+    """Run a callable repeat times and print the best throughput."""
+    best = min(_timed(run) for _ in range(repeat))
+    rate = count / best
+    print(f"  {label:<32} {best:8.3f}s  {rate:12,.0f} objects/s")
+    return rate
+
+def _timed(run: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark STIX bundle serialization")
+    parser.add_argument("--count", "-n", type=int, default=20000, help="Number of objects (default: 20000)")
+    parser.add_argument("--seed", "-s", type=int, default=42, help="Synthesizer seed (default: 42)")
+    parser.add_argument("--repeat", "-r", type=int, default=3, help="Runs per measurement (default: 3)")
+    parser.add_argument("--compact", action="store_true", help="Serialize without indentation")
+    args = parser.parse_args()
+    pretty = not args.compact
+
+    dicts = build_dataset(args.count, args.seed)
+    stix2_objects = [parse(obj, allow_custom=True) for obj in dicts]
+    count = len(stix2_objects)
+    backend = "orjson" if serialization.orjson is not None else "json"
+    print(f"{count} objects, {'pretty' if pretty else 'compact'} output, fast backend: {backend}")
+
+    print("bundle")
+    slow = measure("stix2 Bundle.serialize", count, lambda: Bundle(objects=stix2_objects).serialize(pretty=pretty), args.repeat)
+    fast = measure("iter_bundle_json", count, lambda: "".join(iter_bundle_json(stix2_objects, pretty)), args.repeat)
+    print(f"  speedup {fast / slow:.1f}x")
+
+    print("to_dict")
+    slow = measure("json.loads(obj.serialize())", count, lambda: [json.loads(obj.serialize()) for obj in stix2_objects], args.repeat)
+    fast = measure("serialization.to_dict", count, lambda: [serialization.to_dict(obj) for obj in stix2_objects], args.repeat)
+    print(f"  speedup {fast / slow:.1f}x")
+
+    print("dicts")
+    fast = measure(f"iter_bundle_json ({backend})", count, lambda: "".join(iter_bundle_json(dicts, pretty)), args.repeat)
+    if serialization.orjson is not None:
+        orjson, serialization.orjson = serialization.orjson, None
+        try:
+            slow = measure("iter_bundle_json (json)", count, lambda: "".join(iter_bundle_json(dicts, pretty)), args.repeat)
+        finally:
+            serialization.orjson = orjson
+        print(f"  speedup {fast / slow:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -34,6 +34,7 @@ import {
 } from '@chakra-ui/react';
 import { FiBarChart2, FiCopy, FiEye, FiSun, FiMoon, FiDownload, FiEdit, FiChevronDown, FiChevronUp } from 'react-icons/fi';
 import { useStix } from './StixContext';
+import { streamGeneration, fetchBundle } from './streamGeneration';
 import { MouseTrail } from '../MouseTrail/MouseTrail';
 import { useMetrics } from '../../contexts/MetricsContext';
 import Metrics from '../Metrics/Metrics';
@@ -108,6 +109,36 @@ const EntitySelector = () => {
     }));
   };
 
+  // Stream a generation, rendering objects as they arrive, and resolve with the
+  // final "complete" event once the bundle has been saved on the server
+  const runStreamingGeneration = async (body) => {
+    let completion = null;
+    setStixBundle({ type: 'bundle', id: 'bundle--streaming', objects: [] });
+
+    await streamGeneration(body, {
+      onObjects: (objects) => {
+        setStixBundle(prev => ({
+          ...prev,
+          objects: [...(prev ? prev.objects : []), ...objects]
+        }));
+      },
+      onEvent: (event, data) => {
+        if (event === 'complete' || event === 'error') {
+          completion = data;
+        }
+      }
+    });
+
+    if (!completion) {
+      throw new Error('Generation stream ended unexpectedly');
+    }
+    if (completion.status === 'success') {
+      // Replace the streamed preview with the validated bundle written by the server
+      setStixBundle(await fetchBundle(completion.download_url));
+    }
+    return completion;
+  };
+
   const generateGraph = async () => {
     setLoading(true);
     setError(null);
@@ -123,23 +154,15 @@ const EntitySelector = () => {
         }
       });
 
-      const response = await fetch('http://localhost:5000/api/generate-graph', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({
-          method: 'manual',
-          counts: counts,
-          use_cache: useCache,
-          special_instructions: filteredInstructions
-        })
+      const data = await runStreamingGeneration({
+        method: 'manual',
+        counts: counts,
+        use_cache: useCache,
+        special_instructions: filteredInstructions
       });
 
-      const data = await response.json();
       if (data.status === 'success') {
-        setStixBundle(JSON.parse(data.stix_bundle));
-        setStory(data.scenario);
+        setStory(data.story);
         setMetrics(data.metrics);
       } else {
         setError(data.error || 'Failed to generate graph');
@@ -166,22 +189,14 @@ const EntitySelector = () => {
         }
       });
 
-      const response = await fetch('http://localhost:5000/api/generate-graph', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({
-          method: 'total',
-          totalCount: totalStixCount,
-          use_cache: useCache,
-          special_instructions: filteredInstructions
-        })
+      const data = await runStreamingGeneration({
+        method: 'total',
+        totalCount: totalStixCount,
+        use_cache: useCache,
+        special_instructions: filteredInstructions
       });
 
-      const data = await response.json();
       if (data.status === 'success') {
-        setStixBundle(JSON.parse(data.stix_bundle));
         setStory(data.story);
         setMetrics(data.metrics);
         
@@ -0,0 +1,81 @@
+const API_URL = 'http://localhost:5000/api';
+
+// Parse a single SSE frame ("event: x\ndata: {...}") into { event, data }
+const parseFrame = (frame) => {
+  let event = 'message';
+  const dataLines = [];
+  frame.split('\n').forEach((line) => {
+    if (line.startsWith('event:')) {
+      event = line.slice(6).trim();
+    } else if (line.startsWith('data:')) {
+      dataLines.push(line.slice(5).trim());
+    }
+  });
+  if (dataLines.length === 0) {
+    return null;
+  }
+  return { event, data: JSON.parse(dataLines.join('\n')) };
+};
+
+/**
+ * Stream a generation from /api/generate-stream.
+ *
+ * EventSource only supports GET, so the POST body is sent with fetch and the
+ * Server-Sent Events are read from the response body.
+ *
+ * handlers.onObjects(objects) receives each chunk of newly arrived objects and
+ * relationships; handlers.onEvent(event, data) receives every other event
+ * (job, phase, complete, error).
+ */
+export const streamGeneration = async (body, handlers = {}) => {
+  const response = await fetch(`${API_URL}/generate-stream`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify(body)
+  });
+
+  if (!response.ok) {
+    const data = await response.json().catch(() => ({}));
+    throw new Error(data.error || `Request failed with status ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) {
+      break;
+    }
+    buffer += decoder.decode(value, { stream: true });
+
+    const frames = buffer.split('\n\n');
+    buffer = frames.pop();
+
+    // Collect everything that arrived in this chunk so the UI updates once per chunk
+    const arrived = [];
+    frames.forEach((frame) => {
+      const parsed = parseFrame(frame);
+      if (!parsed) {
+        return;
+      }
+      if (parsed.event === 'object' || parsed.event === 'relationship') {
+        arrived.push(parsed.data);
+      } else if (handlers.onEvent) {
+        handlers.onEvent(parsed.event, parsed.data);
+      }
+    });
+
+    if (arrived.length > 0 && handlers.onObjects) {
+      handlers.onObjects(arrived);
+    }
+  }
+};
+
+export const fetchBundle = async (downloadUrl) => {
+  const response = await fetch(`${API_URL.replace(/\/api$/, '')}${downloadUrl}`);
+  return response.json();
+};
@@ -0,0 +1,227 @@
+"""
+Background job management for long-running STIX generations.
+"""
+
+import uuid
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Callable
+
+from ..config import MAX_CONCURRENT_JOBS, MAX_JOB_HISTORY, MAX_QUEUED_JOBS
+from ..utils.logging_utils import api_logger as logger
+
+class JobQueueFullError(Exception):
+    """Raised when a job is submitted while the job queue is full."""
+
+class GenerationJob:
+    """State of a single queued or running generation."""
+
+    def __init__(
+        self,
+        params: Dict[str, Any],
+        object_counts: Dict[str, int],
+        lock: Optional[threading.Lock] = None
+    ):
+        """
+        Initialize a job.
+
+        Args:
+            params: Generation parameters (seed, cache usage, instructions)
+            object_counts: Dictionary mapping object types to requested counts
+            lock: Lock guarding the job's state (the job manager shares its own)
+        """
+        self.id = str(uuid.uuid4())
+        self.params = params
+        self.status = "queued"
+        self.phase = "queued"
+        self.progress = {
+            obj_type: {"requested": count, "generated": 0}
+            for obj_type, count in object_counts.items()
+        }
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created = datetime.now().isoformat()
+        self.updated = self.created
+        self._lock = lock or threading.Lock()
+
+    def set_status(
+        self,
+        status: str,
+        phase: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """
+        Record a status change of the job.
+
+        Args:
+            status: Job status ("running", "completed" or "failed")
+            phase: Pipeline phase the job is in
+            result: Result fields of a completed job
+            error: Error message of a failed job
+        """
+        with self._lock:
+            self.status = status
+            self.phase = phase
+            if result is not None:
+                self.result = result
+            if error is not None:
+                self.error = error
+            self.updated = datetime.now().isoformat()
+
+    def set_phase(self, phase: str) -> None:
+        """
+        Record the pipeline phase the job is in.
+
+        Args:
+            phase: Phase name
+        """
+        with self._lock:
+            self.phase = phase
+            self.updated = datetime.now().isoformat()
+
+    def add_progress(self, obj_type: str, count: int) -> None:
+        """
+        Record newly generated objects of a type.
+
+        Args:
+            obj_type: STIX object type
+            count: Number of newly generated objects
+        """
+        with self._lock:
+            entry = self.progress.setdefault(obj_type, {"requested": 0, "generated": 0})
+            entry["generated"] += count
+            self.updated = datetime.now().isoformat()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get a JSON-serializable snapshot of the job.
+
+        Returns:
+            Job status dictionary
+        """
+        with self._lock:
+            requested = sum(p["requested"] for p in self.progress.values())
+            generated = sum(min(p["generated"], p["requested"]) for p in self.progress.values())
+            snapshot = {
+                "job_id": self.id,
+                "status": self.status,
+                "phase": self.phase,
+                "progress": {obj_type: dict(p) for obj_type, p in self.progress.items()},
+                "percent_objects": round(generated / requested * 100, 1) if requested else 0.0,
+                "created": self.created,
+                "updated": self.updated
+            }
+            if self.result is not None:
+                snapshot.update(self.result)
+            if self.error is not None:
+                snapshot["error"] = self.error
+            return snapshot
+
+class JobManager:
+    """
+    Runs generation jobs on a bounded worker pool and tracks their state.
+
+    The manager and all of its jobs share one lock, so job lookups, listings
+    and pruning always see a job's status and timestamps updated together.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = MAX_CONCURRENT_JOBS,
+        max_history: int = MAX_JOB_HISTORY,
+        max_queued: int = MAX_QUEUED_JOBS
+    ):
+        """
+        Initialize the job manager.
+
+        Args:
+            max_workers: Maximum number of jobs executing at once
+            max_history: Maximum number of finished jobs to remember
+            max_queued: Maximum number of jobs waiting for a worker (0 for no limit)
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_history = max_history
+        self.max_queued = max_queued
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stix-job")
+        self._jobs: Dict[str, GenerationJob] = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        params: Dict[str, Any],
+        object_counts: Dict[str, int],
+        runner: Callable[[GenerationJob], Dict[str, Any]]
+    ) -> GenerationJob:
+        """
+        Queue a generation job.
+
+        Args:
+            params: Generation parameters
+            object_counts: Dictionary mapping object types to requested counts
+            runner: Callable executing the job and returning its result fields
+
+        Returns:
+            The queued job
+
+        Raises:
+            JobQueueFullError: If every worker is busy and the queue is full
+        """
+        job = GenerationJob(params, object_counts, self._lock)
+        with self._lock:
+            if self.max_queued and self._pending >= self.max_workers + self.max_queued:
+                raise JobQueueFullError(f"Job queue is full ({self._pending} jobs pending)")
+            self._pending += 1
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, runner)
+        logger.info(f"Queued generation job {job.id}")
+        return job
+
+    def _run(self, job: GenerationJob, runner: Callable[[GenerationJob], Dict[str, Any]]) -> None:
+        """Worker entry point: execute a job and record its outcome."""
+        job.set_status("running", "starting")
+        try:
+            result = runner(job)
+            job.set_status("completed", "done", result=result)
+            logger.info(f"Generation job {job.id} completed")
+        except Exception as e:
+            logger.error(f"Generation job {job.id} failed: {str(e)}", exc_info=True)
+            job.set_status("failed", "failed", error=str(e))
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        """
+        Look up a job.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            The job, or None if unknown
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[GenerationJob]:
+        """
+        Get all tracked jobs, newest first.
+
+        Returns:
+            List of jobs
+        """
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.created, reverse=True)
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond max_history. Call with the lock held."""
+        finished = [job for job in self._jobs.values() if job.status in ("completed", "failed")]
+        finished.sort(key=lambda job: job.updated)
+        for job in finished[:max(0, len(finished) - self.max_history)]:
+            del self._jobs[job.id]
+
+job_manager = JobManager()
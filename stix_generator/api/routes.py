@@ -4,27 +4,35 @@ Flask API routes for STIX generator.
 
 import os
 import json
-import asyncio
+import queue
 import shutil
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Callable, Iterable
 
-from flask import Blueprint, request, jsonify, render_template, send_file, current_app
+from flask import Blueprint, Response, request, jsonify, render_template, send_file, current_app, stream_with_context
 from werkzeug.utils import secure_filename
 
 from ..config import (
     DEFAULT_OBJECT_COUNTS, DISPLAY_TO_STIX_TYPE, OBJECT_TYPE_DISPLAY_NAMES,
-    OUTPUT_DIR, CACHE_DIR, CACHE_ENABLED
+    OUTPUT_DIR, CACHE_DIR, CACHE_ENABLED, STREAM_KEEPALIVE_SECONDS, OBJECT_GENERATION_MODE,
+    BUNDLE_PRETTY_PRINT
 )
 from ..utils.logging_utils import api_logger as logger
-from ..core.object_generator import StixObjectGenerator
+from ..core.object_generator import StixObjectGenerator, GENERATION_MODES
 from ..core.relationship_generator import RelationshipGenerator
-from ..core.bundler import create_bundle, serialize_bundle
+from ..core.bundler import iter_valid_objects, write_bundle
 from ..utils.metrics import analyze_stix_bundle
+from ..utils.cache import get_object_cache
+from ..utils.ids import bundle_stix_id
+from ..utils.event_loop import run_async
+from .jobs import GenerationJob, JobQueueFullError, job_manager
 
 # Create Blueprint
 api_bp = Blueprint('api', __name__)
 
+# Size of the chunks a saved bundle is streamed back to the client in
+BUNDLE_STREAM_CHUNK_SIZE = 64 * 1024
+
 def distribute_total_count(total_count: int) -> Dict[str, int]:
     """
     Distribute a total count across STIX object types.
@@ -82,6 +90,277 @@ def get_object_types():
         "object_types": OBJECT_TYPE_DISPLAY_NAMES
     })
 
+def _empty_metrics(total_objects: int, relationship_count: int, recommendations: List[str]) -> Dict[str, Any]:
+    """
+    Build a zeroed metrics structure in the shape the frontend expects.
+    
+    Args:
+        total_objects: Number of objects in the bundle
+        relationship_count: Number of relationships in the bundle
+        recommendations: Recommendations to include
+        
+    Returns:
+        Metrics dictionary
+    """
+    return {
+        "basic_metrics": {
+            "summary": {
+                "total_objects": total_objects,
+                "relationship_count": relationship_count,
+                "quality_score": 0.0,
+                "completeness_score": 0.0,
+                "consistency_score": 0.0,
+                "relationship_score": 0.0,
+                "relationship_density": 0.0
+            },
+            "object_type_distribution": {},
+            "relationship_type_distribution": {}
+        },
+        "advanced_metrics": {
+            "object_connectivity": 0.0,
+            "relationship_diversity": 0.0,
+            "narrative_coherence": 0.0,
+            "largest_component": 0.0
+        },
+        "recommendations": recommendations
+    }
+
+def parse_generation_request(data: Dict[str, Any]) -> Tuple[Dict[str, int], Optional[str]]:
+    """
+    Extract object counts from a generation request body.
+    
+    Also checks the requested generation mode, so an unknown mode is
+    rejected before any work starts.
+    
+    Args:
+        data: Request JSON body
+        
+    Returns:
+        Tuple of (object counts, error message or None)
+    """
+    generation_mode = data.get('generation_mode')
+    if generation_mode is not None and generation_mode not in GENERATION_MODES:
+        return {}, f"Invalid generation mode: {generation_mode} (expected one of {', '.join(GENERATION_MODES)})"
+    
+    # Get generation method and object counts
+    generation_method = data.get('method', 'manual')
+    object_counts = {}
+    
+    if generation_method == 'manual':
+        # Get counts from the data
+        counts = data.get('counts', {})
+        if isinstance(counts, dict):
+            raw_counts = counts
+        else:
+            raw_counts = data
+        
+        # Process object counts
+        for display_name, count in raw_counts.items():
+            try:
+                stix_type = DISPLAY_TO_STIX_TYPE.get(display_name)
+                if not stix_type:
+                    stix_type = display_name  # Try using the name directly
+                    
+                if stix_type and int(count) > 0:
+                    object_counts[stix_type] = int(count)
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Invalid count for {display_name}: {count}")
+                continue
+                
+        logger.info(f"Processed object counts: {object_counts}")
+        
+    else:
+        # Handle total count method
+        try:
+            total_count = int(data.get('totalCount', 0))
+            if total_count <= 0:
+                return {}, "Total count must be greater than 0"
+                
+            object_counts = distribute_total_count(total_count)
+            logger.info(f"Distributed total count {total_count} into: {object_counts}")
+            
+        except (ValueError, TypeError) as e:
+            return {}, f"Invalid total count: {data.get('totalCount')}"
+    
+    # Validate object counts
+    if not object_counts:
+        logger.error(f"No valid object counts found in request data: {data}")
+        return {}, "No objects selected for generation"
+    
+    return object_counts, None
+
+def run_generation(
+    object_counts: Dict[str, int],
+    special_instructions: Dict[str, str],
+    seed: int = 42,
+    use_cache: bool = True,
+    generation_mode: Optional[str] = None,
+    on_phase: Optional[Callable[[str], None]] = None,
+    on_objects: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None,
+    on_relationships: Optional[Callable[[Iterable[Dict[str, Any]]], None]] = None,
+    filename: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Run the full generation pipeline and save the bundle to OUTPUT_DIR.
+    
+    Args:
+        object_counts: Dictionary mapping object types to counts
+        special_instructions: Dictionary mapping object types to special instructions
+        seed: Random seed for generation
+        use_cache: Whether to use cached objects
+        generation_mode: Object generation mode ("llm", "synthetic" or "hybrid"; defaults to OBJECT_GENERATION_MODE)
+        on_phase: Called with the name of each pipeline phase as it starts
+        on_objects: Called with (object_type, objects) as each batch of objects is generated
+        on_relationships: Called with the generated relationships once they are available
+        filename: Output filename (auto-generated if not provided)
+        
+    Returns:
+        Dictionary with the metrics, story and filename of the saved bundle
+    """
+    def phase(name: str) -> None:
+        if on_phase:
+            on_phase(name)
+    
+    # Initialize generators
+    object_generator = StixObjectGenerator(
+        seed=seed,
+        use_cache=use_cache,
+        progress_callback=on_objects,
+        generation_mode=generation_mode or OBJECT_GENERATION_MODE
+    )
+    relationship_generator = RelationshipGenerator(seed=seed)
+    
+    # Generate objects on the shared background loop so concurrent
+    # requests interleave their LLM waits (CPU-bound steps run in workers)
+    logger.info("Generating STIX objects...")
+    phase("generating_objects")
+    stix_objects_dict = run_async(object_generator.generate_dataset(object_counts, special_instructions))
+    
+    # Flatten objects list
+    all_stix_objects = []
+    for obj_list in stix_objects_dict.values():
+        all_stix_objects.extend(obj_list)
+    
+    # Convert to STIX2 objects in this thread; conversion is CPU-bound and
+    # would stall the shared loop
+    logger.info("Converting to STIX2 objects...")
+    phase("converting_objects")
+    stix2_objects_dict = object_generator.create_stix2_objects(stix_objects_dict)
+    stix2_objects = list(stix2_objects_dict.values())
+    
+    # Generate relationships
+    logger.info("Generating relationships...")
+    phase("generating_relationships")
+    relationship_output = run_async(relationship_generator.generate_relationships(all_stix_objects))
+    graph = relationship_output['graph']
+    if on_relationships:
+        on_relationships(graph.iter_dicts())
+    
+    # Convert relationships to STIX2 objects; their dictionaries are only built now
+    stix2_relationships = relationship_generator.create_stix2_relationships(graph.iter_dicts())
+    
+    # Collect the bundle's objects; the bundle itself is only ever serialized to the file
+    logger.info("Creating STIX bundle...")
+    phase("bundling")
+    bundle_objects = list(iter_valid_objects(stix2_objects, stix2_relationships))
+    total_objects = len(bundle_objects)
+    
+    # Calculate metrics
+    logger.info("Calculating metrics...")
+    phase("calculating_metrics")
+    try:
+        # The generator's graph can hold edges that were dropped on conversion,
+        # so the metrics graph is built from the bundled relationships
+        metrics = analyze_stix_bundle({"type": "bundle", "objects": bundle_objects})
+        
+        # Ensure metrics has the expected structure to match frontend expectations
+        if "basic_metrics" not in metrics:
+            metrics = _empty_metrics(total_objects, len(stix2_relationships), [])
+        
+        # Ensure all required fields exist
+        if "summary" not in metrics.get("basic_metrics", {}):
+            metrics["basic_metrics"]["summary"] = _empty_metrics(
+                total_objects, len(stix2_relationships), []
+            )["basic_metrics"]["summary"]
+        
+        # Make sure relationship_density is defined
+        if "relationship_density" not in metrics.get("basic_metrics", {}).get("summary", {}):
+            metrics["basic_metrics"]["summary"]["relationship_density"] = 0.0
+        
+    except Exception as e:
+        logger.error(f"Error calculating metrics: {str(e)}")
+        metrics = _empty_metrics(total_objects, len(stix2_relationships), ["Error calculating metrics"])
+    
+    # Save bundle to file
+    phase("saving")
+    if not filename:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = f"stix_bundle_{timestamp}_{seed}.json"
+    filename = secure_filename(filename)
+    filepath = os.path.join(OUTPUT_DIR, filename)
+    
+    bundle_id = bundle_stix_id(seed, (obj['id'] for obj in bundle_objects))
+    write_bundle(filepath, bundle_objects, pretty=BUNDLE_PRETTY_PRINT, bundle_id=bundle_id)
+    
+    logger.info(f"STIX bundle saved to {filepath}")
+    
+    return {
+        "metrics": metrics,
+        "story": relationship_output.get('scenario', ''),
+        "filename": filename
+    }
+
+def _generation_params(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract seed, cache usage, generation mode and special instructions from a request body.
+    
+    Args:
+        data: Request JSON body
+        
+    Returns:
+        Dictionary of generation parameters
+    """
+    # Get cache usage preference
+    use_cache = data.get('use_cache', True)
+    logger.info(f"Cache usage set to: {use_cache}")
+    
+    # Get special instructions
+    special_instructions = data.get('special_instructions', {})
+    logger.info(f"Special instructions received: {special_instructions}")
+    
+    return {
+        "seed": data.get('seed', 42),
+        "use_cache": use_cache,
+        "generation_mode": data.get('generation_mode'),
+        "special_instructions": special_instructions
+    }
+
+def _bundle_response(result: Dict[str, Any]) -> Response:
+    """
+    Build the /generate-graph response, streaming the saved bundle into it.
+    
+    The bundle is returned as a JSON string under "stix_bundle", as before,
+    but is read from disk chunk by chunk instead of being held in memory.
+    
+    Args:
+        result: Result of run_generation
+        
+    Returns:
+        Streaming JSON response
+    """
+    filepath = os.path.join(OUTPUT_DIR, result["filename"])
+    head = json.dumps({**result, "status": "success"})[:-1]
+    
+    def body():
+        yield head + ', "stix_bundle": "'
+        with open(filepath, encoding='utf-8') as f:
+            for chunk in iter(lambda: f.read(BUNDLE_STREAM_CHUNK_SIZE), ''):
+                # Escaping is per character, so chunks can be encoded separately
+                yield json.dumps(chunk)[1:-1]
+        yield '"}'
+    
+    return Response(stream_with_context(body()), mimetype='application/json')
+
 # This is the main route used by the frontend
 @api_bp.route('/generate-graph', methods=['POST'])
 def generate_graph():
@@ -90,211 +369,24 @@ def generate_graph():
         data = request.get_json()
         logger.info(f"Received generation request: {data}")
         
-        # Get generation method and object counts
-        generation_method = data.get('method', 'manual')
-        object_counts = {}
-        
-        # Get cache usage preference
-        use_cache = data.get('use_cache', True)
-        logger.info(f"Cache usage set to: {use_cache}")
-        
-        # Get special instructions
-        special_instructions = data.get('special_instructions', {})
-        logger.info(f"Special instructions received: {special_instructions}")
-        
-        if generation_method == 'manual':
-            # Get counts from the data
-            counts = data.get('counts', {})
-            if isinstance(counts, dict):
-                raw_counts = counts
-            else:
-                raw_counts = data
-            
-            # Process object counts
-            for display_name, count in raw_counts.items():
-                try:
-                    stix_type = DISPLAY_TO_STIX_TYPE.get(display_name)
-                    if not stix_type:
-                        stix_type = display_name  # Try using the name directly
-                        
-                    if stix_type and int(count) > 0:
-                        object_counts[stix_type] = int(count)
-                except (ValueError, TypeError) as e:
-                    logger.warning(f"Invalid count for {display_name}: {count}")
-                    continue
-                    
-            logger.info(f"Processed object counts: {object_counts}")
-            
-        else:
-            # Handle total count method
-            try:
-                total_count = int(data.get('totalCount', 0))
-                if total_count <= 0:
-                    return jsonify({
-                        "error": "Total count must be greater than 0",
-                        "status": "error"
-                    }), 400
-                    
-                object_counts = distribute_total_count(total_count)
-                logger.info(f"Distributed total count {total_count} into: {object_counts}")
-                
-            except (ValueError, TypeError) as e:
-                return jsonify({
-                    "error": f"Invalid total count: {data.get('totalCount')}",
-                    "status": "error"
-                }), 400
-        
-        # Validate object counts
-        if not object_counts:
-            logger.error(f"No valid object counts found in request data: {data}")
+        params = _generation_params(data)
+        object_counts, error = parse_generation_request(data)
+        if error:
             return jsonify({
-                "error": "No objects selected for generation",
+                "error": error,
                 "status": "error"
             }), 400
         
-        # Initialize generators
-        seed = data.get('seed', 42)
-        object_generator = StixObjectGenerator(seed=seed, use_cache=use_cache)
-        relationship_generator = RelationshipGenerator(seed=seed)
+        result = run_generation(
+            object_counts,
+            params["special_instructions"],
+            seed=params["seed"],
+            use_cache=params["use_cache"],
+            generation_mode=params["generation_mode"]
+        )
         
-        # Create the event loop but don't close it immediately
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            # Generate objects
-            logger.info("Generating STIX objects...")
-            stix_objects_dict = loop.run_until_complete(object_generator.generate_dataset(object_counts, special_instructions))
-            
-            # Flatten objects list
-            all_stix_objects = []
-            for obj_list in stix_objects_dict.values():
-                all_stix_objects.extend(obj_list)
-            
-            # Convert to STIX2 objects
-            logger.info("Converting to STIX2 objects...")
-            stix2_objects_dict = loop.run_until_complete(object_generator.create_stix2_objects(stix_objects_dict))
-            stix2_objects = list(stix2_objects_dict.values())
-            
-            # Generate relationships
-            logger.info("Generating relationships...")
-            relationship_output = loop.run_until_complete(relationship_generator.generate_relationships(all_stix_objects))
-            
-            # Run any pending tasks to allow for proper cleanup
-            pending = asyncio.all_tasks(loop)
-            if pending:
-                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-            
-            # Convert relationships to STIX2 objects
-            stix2_relationships = relationship_generator.create_stix2_relationships(
-                relationship_output['relationships']
-            )
-            
-            # Create bundle
-            logger.info("Creating STIX bundle...")
-            stix_bundle = create_bundle(stix2_objects, stix2_relationships)
-            
-            # Calculate metrics
-            logger.info("Calculating metrics...")
-            try:
-                bundle_json = serialize_bundle(stix_bundle)
-                metrics = analyze_stix_bundle(bundle_json)
-                
-                # Ensure metrics has the expected structure to match frontend expectations
-                if "basic_metrics" not in metrics:
-                    metrics = {
-                        "basic_metrics": {
-                            "summary": {
-                                "total_objects": len(stix_bundle.objects) if hasattr(stix_bundle, 'objects') else 0,
-                                "relationship_count": len(stix2_relationships),
-                                "quality_score": 0.0,
-                                "completeness_score": 0.0,
-                                "consistency_score": 0.0,
-                                "relationship_score": 0.0,
-                                "relationship_density": 0.0
-                            },
-                            "object_type_distribution": {},
-                            "relationship_type_distribution": {}
-                        },
-                        "advanced_metrics": {
-                            "object_connectivity": 0.0,
-                            "relationship_diversity": 0.0,
-                            "narrative_coherence": 0.0
-                        },
-                        "recommendations": []
-                    }
-                
-                # Ensure all required fields exist
-                if "summary" not in metrics.get("basic_metrics", {}):
-                    metrics["basic_metrics"]["summary"] = {
-                        "total_objects": len(stix_bundle.objects) if hasattr(stix_bundle, 'objects') else 0,
-                        "relationship_count": len(stix2_relationships),
-                        "quality_score": 0.0,
-                        "completeness_score": 0.0,
-                        "consistency_score": 0.0,
-                        "relationship_score": 0.0,
-                        "relationship_density": 0.0
-                    }
-                
-                # Make sure relationship_density is defined
-                if "relationship_density" not in metrics.get("basic_metrics", {}).get("summary", {}):
-                    metrics["basic_metrics"]["summary"]["relationship_density"] = 0.0
-                
-            except Exception as e:
-                logger.error(f"Error calculating metrics: {str(e)}")
-                metrics = {
-                    "basic_metrics": {
-                        "summary": {
-                            "total_objects": len(stix_bundle.objects) if hasattr(stix_bundle, 'objects') else 0,
-                            "relationship_count": len(stix2_relationships),
-                            "quality_score": 0.0,
-                            "completeness_score": 0.0,
-                            "consistency_score": 0.0,
-                            "relationship_score": 0.0,
-                            "relationship_density": 0.0
-                        },
-                        "object_type_distribution": {},
-                        "relationship_type_distribution": {}
-                    },
-                    "advanced_metrics": {
-                        "object_connectivity": 0.0,
-                        "relationship_diversity": 0.0,
-                        "narrative_coherence": 0.0
-                    },
-                    "recommendations": ["Error calculating metrics"]
-                }
-            
-            # Save bundle to file
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"stix_bundle_{timestamp}_{seed}.json"
-            filepath = os.path.join(OUTPUT_DIR, secure_filename(filename))
-            
-            with open(filepath, 'w') as f:
-                f.write(bundle_json)
-            
-            logger.info(f"STIX bundle saved to {filepath}")
-            
-            # Return result in the format expected by the frontend
-            return jsonify({
-                "stix_bundle": bundle_json,
-                "metrics": metrics,
-                "story": relationship_output.get('scenario', ''),
-                "status": "success",
-                "filename": filename
-            })
-            
-        finally:
-            # Properly close the loop after all tasks are done
-            try:
-                # Cancel any remaining tasks
-                for task in asyncio.all_tasks(loop):
-                    task.cancel()
-                
-                # Run the event loop once more to let any callbacks run
-                loop.run_until_complete(asyncio.sleep(0.1))
-                loop.close()
-            except Exception as e:
-                logger.warning(f"Error during event loop cleanup: {e}")
+        # Return result in the format expected by the frontend
+        return _bundle_response(result)
         
     except Exception as e:
         logger.error(f"Error in generate_graph: {str(e)}", exc_info=True)
@@ -314,6 +406,185 @@ def generate_graph():
             }
         }), 500
 
+@api_bp.route('/jobs', methods=['POST'])
+def create_job():
+    """Queue a generation job and return its id immediately."""
+    try:
+        data = request.get_json() or {}
+        logger.info(f"Received generation job request: {data}")
+        
+        params = _generation_params(data)
+        object_counts, error = parse_generation_request(data)
+        if error:
+            return jsonify({
+                "error": error,
+                "status": "error"
+            }), 400
+        
+        def runner(job: GenerationJob) -> Dict[str, Any]:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            result = run_generation(
+                object_counts,
+                params["special_instructions"],
+                seed=params["seed"],
+                use_cache=params["use_cache"],
+                generation_mode=params["generation_mode"],
+                on_phase=job.set_phase,
+                on_objects=lambda obj_type, objects: job.add_progress(obj_type, len(objects)),
+                filename=f"stix_bundle_{timestamp}_{params['seed']}_{job.id[:8]}.json"
+            )
+            # The bundle itself is fetched through /api/download/<filename>
+            return {
+                "filename": result["filename"],
+                "download_url": f"/api/download/{result['filename']}",
+                "metrics": result["metrics"],
+                "story": result["story"]
+            }
+        
+        job = job_manager.submit(params, object_counts, runner)
+        
+        return jsonify({
+            "job_id": job.id,
+            "status": "queued",
+            "status_url": f"/api/jobs/{job.id}"
+        }), 202
+        
+    except JobQueueFullError as e:
+        logger.warning(f"Rejected generation job: {str(e)}")
+        return jsonify({
+            "error": str(e),
+            "status": "error"
+        }), 429
+        
+    except Exception as e:
+        logger.error(f"Error creating generation job: {str(e)}", exc_info=True)
+        return jsonify({
+            "error": str(e),
+            "status": "error"
+        }), 500
+
+def _sse_event(event: str, data: Any) -> str:
+    """
+    Format a Server-Sent Events message.
+    
+    Args:
+        event: Event name
+        data: JSON-serializable payload
+        
+    Returns:
+        SSE-formatted message
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@api_bp.route('/generate-stream', methods=['POST'])
+def generate_stream():
+    """Generate a STIX graph, streaming objects and relationships as Server-Sent Events."""
+    data = request.get_json() or {}
+    logger.info(f"Received streaming generation request: {data}")
+    
+    params = _generation_params(data)
+    object_counts, error = parse_generation_request(data)
+    if error:
+        return jsonify({
+            "error": error,
+            "status": "error"
+        }), 400
+    
+    # Events are serialized when produced, since the pipeline keeps mutating
+    # the underlying objects on other threads
+    events = queue.Queue()
+    done = object()
+    
+    def runner(job: GenerationJob) -> Dict[str, Any]:
+        def on_objects(obj_type: str, objects: List[Dict[str, Any]]) -> None:
+            job.add_progress(obj_type, len(objects))
+            for obj in objects:
+                events.put(_sse_event("object", obj))
+        
+        def on_phase(phase: str) -> None:
+            job.set_phase(phase)
+            events.put(_sse_event("phase", {"phase": phase}))
+        
+        def on_relationships(relationships: Iterable[Dict[str, Any]]) -> None:
+            for rel in relationships:
+                events.put(_sse_event("relationship", rel))
+        
+        try:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            result = run_generation(
+                object_counts,
+                params["special_instructions"],
+                seed=params["seed"],
+                use_cache=params["use_cache"],
+                generation_mode=params["generation_mode"],
+                on_phase=on_phase,
+                on_objects=on_objects,
+                on_relationships=on_relationships,
+                filename=f"stix_bundle_{timestamp}_{params['seed']}_{job.id[:8]}.json"
+            )
+            summary = {
+                "filename": result["filename"],
+                "download_url": f"/api/download/{result['filename']}",
+                "metrics": result["metrics"],
+                "story": result["story"]
+            }
+            events.put(_sse_event("complete", {**summary, "status": "success"}))
+            return summary
+        except Exception as e:
+            events.put(_sse_event("error", {"error": str(e), "status": "error"}))
+            raise
+        finally:
+            events.put(done)
+    
+    # Run on the job pool so streams share the same concurrency bound and can
+    # also be polled through /api/jobs/<id>
+    try:
+        job = job_manager.submit(params, object_counts, runner)
+    except JobQueueFullError as e:
+        logger.warning(f"Rejected streaming generation: {str(e)}")
+        return jsonify({
+            "error": str(e),
+            "status": "error"
+        }), 429
+    
+    def stream():
+        yield _sse_event("job", {"job_id": job.id, "status_url": f"/api/jobs/{job.id}"})
+        while True:
+            try:
+                item = events.get(timeout=STREAM_KEEPALIVE_SECONDS)
+            except queue.Empty:
+                # Comment line keeps proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+                continue
+            if item is done:
+                break
+            yield item
+    
+    return Response(
+        stream_with_context(stream()),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@api_bp.route('/jobs', methods=['GET'])
+def list_jobs():
+    """List tracked generation jobs."""
+    return jsonify({
+        "jobs": [job.to_dict() for job in job_manager.list()],
+        "status": "success"
+    })
+
+@api_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get the status and progress of a generation job."""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({
+            "error": f"Job {job_id} not found",
+            "status": "error"
+        }), 404
+    return jsonify(job.to_dict())
+
 @api_bp.route('/download/<filename>')
 def download_file(filename):
     """Download a generated STIX bundle."""
@@ -351,7 +622,7 @@ def list_files():
                 # Get object counts and metrics if possible
                 metrics = {"object_count": 0, "quality_score": 0}
                 try:
-                    with open(filepath, 'r') as f:
+                    with open(filepath, 'r', encoding='utf-8') as f:
                         bundle = json.load(f)
                         metrics["object_count"] = len(bundle.get("objects", []))
                 except:
@@ -396,6 +667,9 @@ def clear_cache():
                 elif os.path.isdir(file_path):
                     shutil.rmtree(file_path)
             
+            # Drop in-memory indexes of the deleted cache files
+            get_object_cache(CACHE_DIR).clear()
+            
             return jsonify({
                 "status": "success",
                 "message": "Cache cleared successfully"
@@ -410,4 +684,13 @@ def clear_cache():
         return jsonify({
             "status": "error",
             "error": f"Failed to clear cache: {str(e)}"
-        }), 500
\ No newline at end of file
+        }), 500
+
+@api_bp.route('/cache/stats')
+def cache_stats():
+    """Get in-memory object cache statistics."""
+    return jsonify({
+        "enabled": CACHE_ENABLED,
+        "stats": get_object_cache(CACHE_DIR).stats(),
+        "status": "success"
+    })
@@ -3,6 +3,7 @@ Flask application for STIX generation.
 """
 
 import os
+import atexit
 import asyncio
 from dotenv import load_dotenv
 from flask import Flask, render_template, send_from_directory, request, jsonify
@@ -16,6 +17,8 @@ from stix_generator.config import (
     OPENAI_API_KEY, OUTPUT_DIR
 )
 from stix_generator.api.routes import api_bp, generate_graph
+from stix_generator.llm.client import close_llm_clients
+from stix_generator.utils.event_loop import shutdown_event_loop
 from stix_generator.utils.logging_utils import setup_logger
 
 # Check if OpenAI API key is set
@@ -30,6 +33,12 @@ if not os.path.exists(OUTPUT_DIR):
 # Set up logger
 logger = setup_logger("stix_generator.app")
 
+# Release pooled LLM clients and their HTTP connections on shutdown, then stop
+# the background event loop (atexit runs hooks in reverse order). Registered
+# here rather than in create_app so repeated app creation adds no hooks.
+atexit.register(shutdown_event_loop)
+atexit.register(close_llm_clients)
+
 def create_app():
     """Create and configure the Flask application."""
     app = Flask(
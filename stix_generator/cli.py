@@ -15,12 +15,13 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from stix_generator.config import (
-    DEFAULT_OBJECT_COUNTS, OUTPUT_DIR, OPENAI_API_KEY
+    DEFAULT_OBJECT_COUNTS, OUTPUT_DIR, OPENAI_API_KEY, BUNDLE_PRETTY_PRINT
 )
 from stix_generator.core.object_generator import StixObjectGenerator
 from stix_generator.core.relationship_generator import RelationshipGenerator
-from stix_generator.core.bundler import create_bundle, serialize_bundle
+from stix_generator.core.bundler import iter_valid_objects, write_bundle
 from stix_generator.utils.metrics import analyze_stix_bundle
+from stix_generator.utils.ids import bundle_stix_id
 from stix_generator.utils.logging_utils import setup_logger
 
 # Set up logger
@@ -69,33 +70,31 @@ async def generate_stix_data(
         
         # Convert to STIX2 objects
         logger.info("Converting to STIX2 objects...")
-        stix2_objects_dict = await object_generator.create_stix2_objects(stix_objects_dict)
+        stix2_objects_dict = object_generator.create_stix2_objects(stix_objects_dict)
         stix2_objects = list(stix2_objects_dict.values())
         
         # Generate relationships
         logger.info("Generating relationships...")
         relationship_output = await relationship_generator.generate_relationships(all_stix_objects)
         
-        # Convert relationships to STIX2 objects
-        stix2_relationships = relationship_generator.create_stix2_relationships(
-            relationship_output['relationships']
-        )
+        # Convert relationships to STIX2 objects; their dictionaries are only built now
+        graph = relationship_output['graph']
+        stix2_relationships = relationship_generator.create_stix2_relationships(graph.iter_dicts())
         
-        # Create bundle
+        # Write the bundle object by object
         logger.info("Creating STIX bundle...")
-        stix_bundle = create_bundle(stix2_objects, stix2_relationships)
-        
-        # Serialize and save bundle
-        bundle_json = serialize_bundle(stix_bundle)
-        with open(output_file, 'w') as f:
-            f.write(bundle_json)
+        bundle_objects = list(iter_valid_objects(stix2_objects, stix2_relationships))
+        bundle_id = bundle_stix_id(seed, (obj['id'] for obj in bundle_objects))
+        write_bundle(output_file, bundle_objects, pretty=BUNDLE_PRETTY_PRINT, bundle_id=bundle_id)
         
         logger.info(f"STIX bundle saved to {output_file}")
         
         # Calculate and print metrics if requested
         if analyze:
             logger.info("Analyzing STIX bundle...")
-            metrics = analyze_stix_bundle(bundle_json)
+            # The generator's graph can hold edges that were dropped on conversion,
+            # so the metrics graph is built from the bundled relationships
+            metrics = analyze_stix_bundle({"type": "bundle", "objects": bundle_objects})
             
             # Print summary metrics
             summary = metrics["basic_metrics"]["summary"]
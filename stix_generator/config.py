@@ -22,12 +22,36 @@ LLM_OBJECT_TEMPERATURE = float(os.getenv("LLM_OBJECT_TEMPERATURE", "0.7"))
 LLM_RELATIONSHIP_TEMPERATURE = float(os.getenv("LLM_RELATIONSHIP_TEMPERATURE", "0.2"))
 MAX_TOKENS = int(os.getenv("MAX_TOKENS", "4000"))
 
+# LLM response memoization (keyed by model, temperature, prompt and seed)
+LLM_MEMO_ENABLED = os.getenv("LLM_MEMO_ENABLED", "False").lower() == "true"
+LLM_MEMO_DIR = os.getenv("LLM_MEMO_DIR", "./llm_memo")
+LLM_MEMO_TTL = int(os.getenv("LLM_MEMO_TTL", str(7 * 24 * 3600)))
+LLM_MEMO_MAX_ENTRIES = int(os.getenv("LLM_MEMO_MAX_ENTRIES", "10000"))
+
 # Generation settings
 DEFAULT_BATCH_SIZE = 5
 MAX_BATCH_SIZE = 10
 MAX_CONCURRENT_REQUESTS = 5
+RELATIONSHIP_CHUNK_SIZE = int(os.getenv("RELATIONSHIP_CHUNK_SIZE", "40"))
+RELATIONSHIP_MAX_CHUNKS = int(os.getenv("RELATIONSHIP_MAX_CHUNKS", "50"))
+MAX_CONCURRENT_JOBS = int(os.getenv("MAX_CONCURRENT_JOBS", "2"))
+MAX_JOB_HISTORY = int(os.getenv("MAX_JOB_HISTORY", "100"))
+MAX_QUEUED_JOBS = int(os.getenv("MAX_QUEUED_JOBS", "10"))  # Jobs waiting for a worker; 0 means unbounded
+STREAM_KEEPALIVE_SECONDS = float(os.getenv("STREAM_KEEPALIVE_SECONDS", "15"))
+# Object generation mode: "llm", "synthetic" (local, template-based, no LLM calls) or
+# "hybrid" (HYBRID_SEED_COUNT LLM objects per type, expanded locally to the full count).
+# Types in SYNTHETIC_TYPES are always synthesized; with SYNTHETIC_FALLBACK, types the
+# LLM could not fully generate are topped up with synthesized objects.
+OBJECT_GENERATION_MODE = os.getenv("OBJECT_GENERATION_MODE", "llm")
+HYBRID_SEED_COUNT = int(os.getenv("HYBRID_SEED_COUNT", "10"))
+SYNTHETIC_TYPES = [t.strip() for t in os.getenv("SYNTHETIC_TYPES", "").split(",") if t.strip()]
+SYNTHETIC_FALLBACK = os.getenv("SYNTHETIC_FALLBACK", "False").lower() == "true"
+# Fixed ISO time used instead of the wall clock for repaired timestamps (empty for the clock)
+GENERATION_REFERENCE_TIME = os.getenv("GENERATION_REFERENCE_TIME", "")
 CACHE_ENABLED = os.getenv("CACHE_ENABLED", "True").lower() == "true"
 CACHE_DIR = os.getenv("CACHE_DIR", "./stix_cache")
+OBJECT_CACHE_MAX_TYPES = int(os.getenv("OBJECT_CACHE_MAX_TYPES", "32"))
+OBJECT_CACHE_MAX_OBJECTS = int(os.getenv("OBJECT_CACHE_MAX_OBJECTS", "100000"))
 
 # Default distribution of STIX objects
 DEFAULT_OBJECT_COUNTS = {
@@ -89,6 +113,16 @@ RELATIONSHIP_MAP = {
     "vulnerability": {"attack-pattern": ["targets"], "campaign": ["targets"], "intrusion-set": ["targets"], "malware": ["targets", "exploits"], "threat-actor": ["targets"], "tool": ["targets"], "course-of-action": ["mitigates"], "infrastructure": ["has"]}
 }
 
+# Shape of the rules-based relationship graph
+RELATIONSHIP_DEGREE_DISTRIBUTION = os.getenv("RELATIONSHIP_DEGREE_DISTRIBUTION", "uniform")  # "uniform" or "power-law"
+RELATIONSHIP_MAX_OUT_DEGREE = int(os.getenv("RELATIONSHIP_MAX_OUT_DEGREE", "3"))
+RELATIONSHIP_POWER_LAW_EXPONENT = float(os.getenv("RELATIONSHIP_POWER_LAW_EXPONENT", "2.5"))
+RELATIONSHIP_MAX_IN_DEGREE = int(os.getenv("RELATIONSHIP_MAX_IN_DEGREE", "0"))  # 0 means unbounded
+RELATIONSHIP_ENSURE_CONNECTED = os.getenv("RELATIONSHIP_ENSURE_CONNECTED", "True").lower() == "true"
+
+# Per-type in-degree caps, overriding RELATIONSHIP_MAX_IN_DEGREE
+RELATIONSHIP_TYPE_MAX_IN_DEGREE: Dict[str, int] = {}
+
 # Flask settings
 FLASK_SECRET_KEY = os.getenv("FLASK_SECRET_KEY", "development-key-change-in-production")
 FLASK_DEBUG = os.getenv("FLASK_DEBUG", "True").lower() == "true"
@@ -101,5 +135,13 @@ LOG_FILE = os.getenv("LOG_FILE", "stix_generator.log")
 
 # Output directory
 OUTPUT_DIR = os.getenv("OUTPUT_DIR", "./stix_output")
+# Whether bundles are written indented (False writes compact JSON)
+BUNDLE_PRETTY_PRINT = os.getenv("BUNDLE_PRETTY_PRINT", "True").lower() == "true"
+# Serialize objects from their properties (with orjson if installed) instead of stix2's serialize()
+FAST_SERIALIZATION = os.getenv("FAST_SERIALIZATION", "True").lower() == "true"
+# "eager" builds a stix2 instance per object; "lazy" keeps validated dictionaries and only
+# builds stix2 instances on request, fully validating a sampled fraction of objects with stix2
+STIX2_CONSTRUCTION = os.getenv("STIX2_CONSTRUCTION", "eager")
+LAZY_VALIDATION_SAMPLE_RATE = float(os.getenv("LAZY_VALIDATION_SAMPLE_RATE", "0.05"))
 if not os.path.exists(OUTPUT_DIR):
     os.makedirs(OUTPUT_DIR)
\ No newline at end of file
@@ -2,13 +2,59 @@
 STIX bundling utilities.
 """
 
+import re
 import json
+import uuid
+import tempfile
 import traceback
-from typing import List, Dict, Any, Union, Optional
+from typing import List, Dict, Any, Union, Optional, Iterable, Iterator, TextIO
 
 from stix2 import Bundle
 
 from ..utils.logging_utils import bundler_logger as logger
+from ..utils.serialization import INDENT, dumps, loads, serialize_object
+from .sharding import plan_shards
+
+# Indentation of the envelope and of objects inside a pretty-printed bundle
+_ENVELOPE_INDENT = " " * INDENT
+_OBJECT_INDENT = " " * (2 * INDENT)
+
+# Characters read at a time when streaming objects out of a bundle file
+BUNDLE_READ_CHUNK_SIZE = 64 * 1024
+
+_OBJECTS_ARRAY = re.compile(r'"objects"\s*:\s*\[')
+
+def iter_valid_objects(
+    stix_objects: Iterable[Any],
+    relationships: Iterable[Any] = (),
+    validate: bool = True
+) -> Iterator[Any]:
+    """
+    Yield the objects and relationships that can go into a bundle.
+    
+    Args:
+        stix_objects: STIX objects
+        relationships: STIX relationships
+        validate: Whether to skip objects that cannot be serialized or have no ID
+        
+    Yields:
+        STIX objects followed by relationships
+    """
+    for obj in stix_objects:
+        if validate:
+            if not hasattr(obj, 'serialize'):
+                logger.warning(f"Invalid STIX object (missing serialize method): {type(obj)}")
+                continue
+            if not getattr(obj, 'id', None):
+                logger.warning(f"Invalid STIX object (missing id): {obj}")
+                continue
+        yield obj
+    
+    for rel in relationships:
+        if validate and not hasattr(rel, 'serialize'):
+            logger.warning(f"Invalid relationship object: {type(rel)}")
+            continue
+        yield rel
 
 def create_bundle(
     stix_objects: List[Any], 
@@ -35,34 +81,7 @@ def create_bundle(
             raise ValueError("Both stix_objects and relationships must be lists")
 
         # Combine objects
-        all_objects = []
-        
-        # Add STIX objects
-        for obj in stix_objects:
-            try:
-                if validate:
-                    if not hasattr(obj, 'serialize'):
-                        logger.warning(f"Invalid STIX object (missing serialize method): {type(obj)}")
-                        continue
-                    if not getattr(obj, 'id', None):
-                        logger.warning(f"Invalid STIX object (missing id): {obj}")
-                        continue
-                all_objects.append(obj)
-            except Exception as e:
-                logger.error(f"Error processing STIX object: {str(e)}")
-                continue
-                
-        # Add relationships
-        for rel in relationships:
-            try:
-                if validate:
-                    if not hasattr(rel, 'serialize'):
-                        logger.warning(f"Invalid relationship object: {type(rel)}")
-                        continue
-                all_objects.append(rel)
-            except Exception as e:
-                logger.error(f"Error processing relationship: {str(e)}")
-                continue
+        all_objects = list(iter_valid_objects(stix_objects, relationships, validate))
 
         # Create and return bundle
         bundle = Bundle(objects=all_objects)
@@ -77,15 +96,22 @@ def create_bundle(
 def create_bundle_batches(
     stix_objects: List[Any], 
     relationships: List[Any] = None, 
-    batch_size: int = 1000
+    batch_size: int = 1000,
+    stats: Optional[Dict[str, Any]] = None
 ) -> List[Bundle]:
     """
     Create multiple bundles for large datasets.
     
+    Bundles are referentially closed: every relationship is placed in a bundle
+    together with its source and target objects, copying objects shared
+    between bundles where needed (see core.sharding).
+    
     Args:
         stix_objects: List of STIX objects
         relationships: List of STIX relationships (optional)
-        batch_size: Maximum number of objects per bundle
+        batch_size: Maximum number of objects (including copies) and relationships per bundle
+        stats: Dictionary to fill with the shard statistics, including the
+            duplication overhead (optional)
         
     Returns:
         List of STIX Bundles
@@ -97,26 +123,29 @@ def create_bundle_batches(
         if total_objects <= batch_size:
             return [create_bundle(stix_objects, relationships)]
 
+        plan = plan_shards(
+            [obj['id'] for obj in stix_objects],
+            ((rel.get('source_ref'), rel.get('target_ref')) for rel in relationships),
+            batch_size
+        )
+        shard_stats = plan.stats()
+        logger.info(
+            f"Planned {shard_stats['shard_count']} closed shards, duplicating {shard_stats['duplicated_objects']} "
+            f"objects ({shard_stats['duplication_overhead']:.1%} overhead)"
+        )
+        if shard_stats['dangling_relationships']:
+            logger.warning(f"{shard_stats['dangling_relationships']} relationships reference objects outside the dataset")
+        if stats is not None:
+            stats.update(shard_stats)
+
         bundles = []
-        
-        # Process objects in batches
-        for i in range(0, len(stix_objects), batch_size):
-            batch_objects = stix_objects[i:i + batch_size]
-            
-            # Calculate how many relationships to include
-            rels_per_batch = min(
-                len(relationships),
-                max(1, batch_size - len(batch_objects))
-            )
-            
-            # Use a copy to avoid modifying the original list
-            batch_relationships = relationships[:rels_per_batch]
-            relationships = relationships[rels_per_batch:]  # Remove used relationships
-            
+        for object_indexes, relationship_indexes in zip(plan.shard_objects, plan.shard_relationships):
+            batch_objects = [stix_objects[i] for i in object_indexes]
+            batch_relationships = [relationships[i] for i in relationship_indexes]
             try:
                 bundle = create_bundle(batch_objects, batch_relationships)
                 bundles.append(bundle)
-                logger.info(f"Created batch bundle {len(bundles)} with {len(batch_objects)} objects and {rels_per_batch} relationships")
+                logger.info(f"Created batch bundle {len(bundles)} with {len(batch_objects)} objects and {len(batch_relationships)} relationships")
             except Exception as e:
                 logger.error(f"Error creating batch bundle: {str(e)}")
                 continue
@@ -127,10 +156,26 @@ def create_bundle_batches(
         logger.error(f"Error in create_bundle_batches: {str(e)}\n{traceback.format_exc()}")
         return []
 
+def _version_key(obj: Any) -> str:
+    """
+    Get a sortable key for the version of an object.
+    
+    Uses modified (or created for unversioned objects), with fractional
+    seconds padded so that timestamps of different precision compare correctly.
+    """
+    value = obj.get('modified') or obj.get('created') or ''
+    if not isinstance(value, str):
+        value = value.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    stamp, _, fraction = value.rstrip('Z').partition('.')
+    return f"{stamp}.{fraction.ljust(9, '0')}"
+
 def merge_bundles(bundles: List[Bundle]) -> Bundle:
     """
     Merge multiple STIX bundles into a single bundle.
     
+    Objects sharing an ID are deduplicated to their latest version (by
+    modified); each ID keeps the position where it was first seen.
+    
     Args:
         bundles: List of STIX Bundles
         
@@ -138,20 +183,21 @@ def merge_bundles(bundles: List[Bundle]) -> Bundle:
         Merged STIX Bundle
     """
     try:
-        all_objects = []
-        seen_ids = set()
+        latest = {}
 
         for bundle in bundles:
             try:
                 for obj in bundle.objects:
-                    # Avoid duplicate objects
-                    if obj.id not in seen_ids:
-                        all_objects.append(obj)
-                        seen_ids.add(obj.id)
+                    # Keep only the newest version of each object
+                    key = _version_key(obj)
+                    current = latest.get(obj.id)
+                    if current is None or key > current[0]:
+                        latest[obj.id] = (key, obj)
             except Exception as e:
                 logger.error(f"Error processing bundle: {str(e)}")
                 continue
 
+        all_objects = [obj for _, obj in latest.values()]
         merged_bundle = Bundle(objects=all_objects)
         logger.info(f"Successfully merged {len(bundles)} bundles into one with {len(all_objects)} objects")
         return merged_bundle
@@ -160,6 +206,140 @@ def merge_bundles(bundles: List[Bundle]) -> Bundle:
         logger.error(f"Error merging bundles: {str(e)}\n{traceback.format_exc()}")
         return Bundle(objects=[])
 
+def _read_bundle_stream(stream: TextIO, chunk_size: int = BUNDLE_READ_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Decode the members of a bundle's objects array one at a time from a text stream."""
+    decoder = json.JSONDecoder()
+    buffer, eof = '', False
+
+    def fill(keep_from: int) -> int:
+        nonlocal buffer, eof
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[keep_from:] + chunk
+        return 0
+
+    # Skip the envelope up to the start of the objects array
+    while True:
+        match = _OBJECTS_ARRAY.search(buffer)
+        if match:
+            pos = match.end()
+            break
+        if eof:
+            return
+        fill(0)
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                raise ValueError("Unterminated objects array")
+            pos = fill(pos)
+            continue
+        if buffer[pos] == ']':
+            return
+        try:
+            obj, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # Most likely an object cut off at the end of the buffer
+            if eof:
+                raise
+            pos = fill(pos)
+            continue
+        yield obj
+        pos = end
+        if pos > chunk_size:
+            buffer, pos = buffer[pos:], 0
+
+def iter_bundle_objects(source: Any) -> Iterator[Any]:
+    """
+    Iterate over the objects of a bundle without loading it whole.
+    
+    Args:
+        source: Bundle file path, readable text stream, stix2 Bundle, bundle
+            dictionary, or iterable of objects
+        
+    Yields:
+        STIX objects (dictionaries, or stix2 objects for stix2 bundles)
+    """
+    if isinstance(source, str):
+        with open(source, encoding='utf-8') as f:
+            yield from _read_bundle_stream(f)
+    elif hasattr(source, 'read'):
+        yield from _read_bundle_stream(source)
+    elif isinstance(source, dict):
+        yield from source.get('objects', [])
+    elif hasattr(source, 'objects'):
+        yield from source.objects
+    else:
+        yield from source
+
+def merge_bundle_files(
+    sources: Iterable[Any],
+    destination: Union[str, TextIO],
+    pretty: bool = True,
+    bundle_id: Optional[str] = None
+) -> Dict[str, int]:
+    """
+    Merge bundles into one, streaming objects from the inputs to the output.
+    
+    Only an index of ID to (version, spool offset) is kept in memory; the
+    newest version of each object seen so far is spooled to a temporary file
+    and the winners are written out once all inputs have been read. Each ID
+    keeps the position where it was first seen.
+    
+    Args:
+        sources: Bundle file paths, readable streams, bundles or object iterables
+        destination: Output file path or writable text stream
+        pretty: Whether to format the JSON with indentation
+        bundle_id: ID of the merged bundle (generated if omitted)
+        
+    Returns:
+        Dictionary with the number of inputs, objects read and objects written
+    """
+    index: Dict[str, tuple] = {}
+    inputs = objects_read = 0
+
+    with tempfile.TemporaryFile() as spool:
+        offset = 0
+        for source in sources:
+            inputs += 1
+            try:
+                for obj in iter_bundle_objects(source):
+                    objects_read += 1
+                    obj_id = obj.get('id')
+                    if not obj_id:
+                        logger.warning("Skipping object without id while merging")
+                        continue
+                    
+                    # Only spool objects newer than the version already indexed
+                    key = _version_key(obj)
+                    current = index.get(obj_id)
+                    if current is not None and key <= current[0]:
+                        continue
+                    line = (dumps(obj) + "\n").encode('utf-8')
+                    spool.write(line)
+                    index[obj_id] = (key, offset)
+                    offset += len(line)
+            except Exception as e:
+                logger.error(f"Error reading bundle {source if isinstance(source, str) else inputs}: {str(e)}")
+                continue
+
+        def winners() -> Iterator[Dict[str, Any]]:
+            for _, position in index.values():
+                spool.seek(position)
+                yield loads(spool.readline())
+
+        spool.flush()
+        objects_written = write_bundle(destination, winners(), pretty, bundle_id)
+
+    logger.info(f"Merged {inputs} bundles: read {objects_read} objects, wrote {objects_written}")
+    return {
+        "inputs": inputs,
+        "objects_read": objects_read,
+        "objects_written": objects_written
+    }
+
 def serialize_bundle(bundle: Bundle, pretty: bool = True) -> str:
     """
     Serialize a STIX bundle to JSON.
@@ -177,6 +357,80 @@ def serialize_bundle(bundle: Bundle, pretty: bool = True) -> str:
         logger.error(f"Error serializing bundle: {str(e)}")
         return json.dumps({"type": "bundle", "id": f"bundle--error", "objects": []})
 
+def iter_bundle_json(
+    objects: Iterable[Any],
+    pretty: bool = True,
+    bundle_id: Optional[str] = None
+) -> Iterator[str]:
+    """
+    Serialize a bundle incrementally.
+    
+    The envelope and each object are yielded as separate chunks, so only one
+    object is serialized at a time however large the bundle is.
+    
+    Args:
+        objects: STIX objects (stix2 objects or dictionaries), possibly a generator
+        pretty: Whether to format the JSON with indentation
+        bundle_id: Bundle ID (generated if omitted)
+        
+    Yields:
+        Chunks of the bundle JSON
+    """
+    bundle_id = bundle_id or f"bundle--{uuid.uuid4()}"
+    if pretty:
+        indent = _ENVELOPE_INDENT
+        header = f'{{\n{indent}"type": "bundle",\n{indent}"id": "{bundle_id}",\n{indent}"objects": ['
+        separator, footer = ",\n", f"\n{indent}]\n}}\n"
+    else:
+        header = f'{{"type":"bundle","id":"{bundle_id}","objects":['
+        separator, footer = ",", "]}"
+    
+    yield header
+    first = True
+    for obj in objects:
+        text = serialize_object(obj, pretty)
+        if pretty:
+            text = _OBJECT_INDENT + text.replace("\n", "\n" + _OBJECT_INDENT)
+            yield ("\n" if first else separator) + text
+        else:
+            yield text if first else separator + text
+        first = False
+    yield "]\n}\n" if pretty and first else footer
+
+def write_bundle(
+    destination: Union[str, TextIO],
+    objects: Iterable[Any],
+    pretty: bool = True,
+    bundle_id: Optional[str] = None
+) -> int:
+    """
+    Write a bundle to a file or stream without building it in memory.
+    
+    Args:
+        destination: File path, or a writable text stream (e.g. an open file or socket.makefile('w'))
+        objects: STIX objects (stix2 objects or dictionaries), possibly a generator
+        pretty: Whether to format the JSON with indentation
+        bundle_id: Bundle ID (generated if omitted)
+        
+    Returns:
+        Number of objects written
+    """
+    if isinstance(destination, str):
+        with open(destination, 'w', encoding='utf-8') as f:
+            return write_bundle(f, objects, pretty, bundle_id)
+    
+    count = 0
+    def counted(items: Iterable[Any]) -> Iterator[Any]:
+        nonlocal count
+        for item in items:
+            count += 1
+            yield item
+    
+    for chunk in iter_bundle_json(counted(objects), pretty, bundle_id):
+        destination.write(chunk)
+    logger.info(f"Wrote bundle with {count} objects")
+    return count
+
 def load_bundle(bundle_json: str) -> Optional[Bundle]:
     """
     Load a STIX bundle from JSON.
@@ -0,0 +1,186 @@
+"""
+Generation context with per-type ID indexes.
+
+Objects are indexed by type as they are added, so reference lookups and
+random sampling do not scan the whole context.
+"""
+
+import random
+from typing import Dict, Any, List, Optional, Iterable, Iterator
+
+def _object_field(obj: Any, field: str) -> Optional[Any]:
+    """Read a field from a STIX dictionary or stix2 object."""
+    if isinstance(obj, dict):
+        return obj.get(field)
+    return getattr(obj, field, None)
+
+class ContextStore:
+    """
+    Append-only collection of generated STIX objects indexed by type and ID.
+
+    Iterating the store yields objects in insertion order, so it can be used
+    wherever the plain context list was used before.
+    """
+
+    def __init__(self, objects: Optional[Iterable[Any]] = None):
+        """
+        Initialize the context store.
+
+        Args:
+            objects: Initial objects to add
+        """
+        self._objects: List[Any] = []
+        self._by_id: Dict[str, Any] = {}
+        self._ids: List[str] = []
+        self._ids_by_type: Dict[str, List[str]] = {}
+        if objects:
+            self.extend(objects)
+
+    def append(self, obj: Any) -> bool:
+        """
+        Add an object to the context.
+
+        Objects without an ID are kept for iteration but not indexed; objects
+        whose ID is already present are ignored.
+
+        Args:
+            obj: STIX object as dictionary or stix2 object
+
+        Returns:
+            True if the object was added
+        """
+        obj_id = _object_field(obj, 'id')
+        if obj_id is not None:
+            if obj_id in self._by_id:
+                return False
+            self._by_id[obj_id] = obj
+            self._ids.append(obj_id)
+            obj_type = _object_field(obj, 'type')
+            if obj_type:
+                self._ids_by_type.setdefault(obj_type, []).append(obj_id)
+        self._objects.append(obj)
+        return True
+
+    def extend(self, objects: Iterable[Any]) -> None:
+        """
+        Add several objects to the context.
+
+        Args:
+            objects: STIX objects to add
+        """
+        for obj in objects:
+            self.append(obj)
+
+    def get(self, obj_id: str) -> Optional[Any]:
+        """
+        Look up an object by ID.
+
+        Args:
+            obj_id: STIX ID
+
+        Returns:
+            The object or None
+        """
+        return self._by_id.get(obj_id)
+
+    def ids(self, obj_type: Optional[str] = None) -> List[str]:
+        """
+        Get the indexed IDs of a type, in insertion order.
+
+        The returned list is the live index and must not be modified.
+
+        Args:
+            obj_type: STIX object type, or None for all types
+
+        Returns:
+            List of object IDs
+        """
+        if obj_type is None:
+            return self._ids
+        return self._ids_by_type.get(obj_type, [])
+
+    def count(self, obj_type: Optional[str] = None) -> int:
+        """
+        Count indexed objects of a type.
+
+        Args:
+            obj_type: STIX object type, or None for all types
+
+        Returns:
+            Number of objects
+        """
+        return len(self.ids(obj_type))
+
+    def types(self) -> List[str]:
+        """
+        Get the object types present in the context.
+
+        Returns:
+            List of STIX object types
+        """
+        return list(self._ids_by_type.keys())
+
+    def first(self, obj_type: Optional[str] = None) -> Optional[str]:
+        """
+        Get the ID of the earliest object of a type.
+
+        Args:
+            obj_type: STIX object type, or None for any type
+
+        Returns:
+            Object ID or None if there is none
+        """
+        ids = self.ids(obj_type)
+        return ids[0] if ids else None
+
+    def choice(self, obj_type: Optional[str] = None, rng: Any = random) -> Optional[str]:
+        """
+        Pick a random object ID of a type.
+
+        Args:
+            obj_type: STIX object type, or None for any type
+            rng: Random number generator to draw from
+
+        Returns:
+            Object ID or None if there is none
+        """
+        ids = self.ids(obj_type)
+        return rng.choice(ids) if ids else None
+
+    def sample(self, obj_type: Optional[str], count: int, rng: Any = random) -> List[str]:
+        """
+        Pick up to count distinct random object IDs of a type.
+
+        Args:
+            obj_type: STIX object type, or None for any type
+            count: Number of IDs to pick
+            rng: Random number generator to draw from
+
+        Returns:
+            List of object IDs
+        """
+        ids = self.ids(obj_type)
+        return rng.sample(ids, min(count, len(ids)))
+
+    def __contains__(self, obj_id: Any) -> bool:
+        return obj_id in self._by_id
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._objects)
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+def as_context_store(context: Optional[Iterable[Any]]) -> ContextStore:
+    """
+    Get a ContextStore for a context, indexing plain lists on the fly.
+
+    Args:
+        context: ContextStore or iterable of STIX objects
+
+    Returns:
+        ContextStore over the context
+    """
+    if isinstance(context, ContextStore):
+        return context
+    return ContextStore(context or [])
@@ -0,0 +1,372 @@
+"""
+Compact relationship graph.
+
+Object IDs and relationship types are interned to integer codes and edges are
+stored in typed arrays, so large generated graphs cost a few bytes per edge
+instead of one dictionary each. Relationship dictionaries are only built when
+the graph is handed to the bundler.
+"""
+
+from array import array
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Tuple
+
+from ..utils.ids import relationship_stix_id
+
+# Description templates for rules-based relationships, by relationship type
+DESCRIPTION_TEMPLATES = {
+    "uses": [
+        "{source_name} utilizes {target_name} in their operations",
+        "{source_name} has been observed using {target_name}",
+        "{source_name} leverages {target_name} for their activities"
+    ],
+    "targets": [
+        "{source_name} specifically targets {target_name}",
+        "{source_name} has been known to target {target_name}",
+        "{source_name} focuses attacks on {target_name}"
+    ],
+    "indicates": [
+        "{source_name} provides evidence of {target_name}",
+        "{source_name} has been associated with {target_name}",
+        "{source_name} suggests the presence of {target_name}"
+    ],
+    "mitigates": [
+        "{source_name} helps prevent {target_name}",
+        "{source_name} is effective against {target_name}",
+        "{source_name} can be used to counter {target_name}"
+    ],
+    "attributed-to": [
+        "{source_name} is attributed to {target_name}",
+        "{source_name} is believed to be operated by {target_name}",
+        "{source_name} is connected to {target_name}"
+    ],
+    "exploits": [
+        "{source_name} exploits {target_name} to gain unauthorized access",
+        "{source_name} takes advantage of {target_name}",
+        "{source_name} leverages {target_name} as an attack vector"
+    ]
+}
+DEFAULT_DESCRIPTION_TEMPLATES = ["{source_name} {relationship_type} {target_name}"]
+
+# Description code of edges carrying explicit text rather than a template
+EXPLICIT_DESCRIPTION = -1
+
+def get_description_templates(relationship_type: str) -> List[str]:
+    """
+    Get the description templates for a relationship type.
+
+    Args:
+        relationship_type: Type of relationship
+
+    Returns:
+        List of format strings
+    """
+    return DESCRIPTION_TEMPLATES.get(relationship_type, DEFAULT_DESCRIPTION_TEMPLATES)
+
+class RelationshipGraph:
+    """
+    Directed multigraph of STIX relationships with interned nodes and edges in arrays.
+
+    Each edge is unique by (source, target, relationship type); adding a
+    duplicate is a no-op.
+    """
+
+    def __init__(self):
+        """Initialize an empty graph."""
+        # Nodes
+        self.ids: List[str] = []
+        self._node_index: Dict[str, int] = {}
+        self._node_types = array('H')
+        self._node_names: List[Optional[str]] = []
+        self._type_names: List[str] = []
+        self._type_codes: Dict[str, int] = {}
+
+        # Edges
+        self.sources = array('l')
+        self.targets = array('l')
+        self.rel_codes = array('H')
+        self._description_codes = array('b')
+        self._descriptions: Dict[int, str] = {}
+        self._edge_ids: Dict[int, str] = {}
+        # (source, target, relationship type) of every edge, packed into one int
+        self._edge_keys = set()
+        self._rel_types: List[str] = []
+        self._rel_codes: Dict[str, int] = {}
+
+    def _intern_type(self, obj_type: str) -> int:
+        """Get the code of an object type, assigning one if new."""
+        code = self._type_codes.get(obj_type)
+        if code is None:
+            code = self._type_codes[obj_type] = len(self._type_names)
+            self._type_names.append(obj_type)
+        return code
+
+    def _intern_rel_type(self, relationship_type: str) -> int:
+        """Get the code of a relationship type, assigning one if new."""
+        code = self._rel_codes.get(relationship_type)
+        if code is None:
+            code = self._rel_codes[relationship_type] = len(self._rel_types)
+            self._rel_types.append(relationship_type)
+        return code
+
+    @staticmethod
+    def _edge_key(source: int, target: int, rel_code: int) -> int:
+        """Pack an edge's endpoints and relationship type code into a single int."""
+        return (source << 48) | (target << 16) | rel_code
+
+    def add_node(self, obj_id: str, obj_type: Optional[str] = None, name: Optional[str] = None) -> int:
+        """
+        Intern an object ID.
+
+        Args:
+            obj_id: STIX ID
+            obj_type: STIX object type (derived from the ID if omitted)
+            name: Display name used in description templates
+
+        Returns:
+            Integer index of the node
+        """
+        index = self._node_index.get(obj_id)
+        if index is not None:
+            return index
+
+        index = self._node_index[obj_id] = len(self.ids)
+        self.ids.append(obj_id)
+        self._node_types.append(self._intern_type(obj_type or obj_id.split('--', 1)[0]))
+        self._node_names.append(name)
+        return index
+
+    def add_objects(self, stix_objects: Iterable[Dict[str, Any]]) -> None:
+        """
+        Intern every object with an ID, skipping relationships.
+
+        Args:
+            stix_objects: STIX objects as dictionaries
+        """
+        for obj in stix_objects:
+            if 'id' in obj and obj.get('type') != 'relationship':
+                self.add_node(obj['id'], obj.get('type'), obj.get('name'))
+
+    def add_edge(
+        self,
+        source_ref: str,
+        target_ref: str,
+        relationship_type: str,
+        description: Optional[str] = None,
+        template: int = EXPLICIT_DESCRIPTION,
+        edge_id: Optional[str] = None
+    ) -> bool:
+        """
+        Add a relationship.
+
+        Args:
+            source_ref: Source object ID
+            target_ref: Target object ID
+            relationship_type: Type of relationship
+            description: Explicit description text
+            template: Index into the relationship type's description templates,
+                used when no explicit description is given
+            edge_id: Relationship ID (derived from the edge at export if omitted)
+
+        Returns:
+            True if the edge was added, False if it already existed
+        """
+        source = self.add_node(source_ref)
+        target = self.add_node(target_ref)
+        rel_code = self._intern_rel_type(relationship_type)
+
+        key = self._edge_key(source, target, rel_code)
+        if key in self._edge_keys:
+            return False
+        self._edge_keys.add(key)
+
+        edge = len(self.sources)
+        self.sources.append(source)
+        self.targets.append(target)
+        self.rel_codes.append(rel_code)
+        if description is not None or template == EXPLICIT_DESCRIPTION:
+            self._description_codes.append(EXPLICIT_DESCRIPTION)
+            if description:
+                self._descriptions[edge] = description
+        else:
+            self._description_codes.append(template)
+        if edge_id:
+            self._edge_ids[edge] = edge_id
+        return True
+
+    def has_edge(self, source_ref: str, target_ref: str, relationship_type: str) -> bool:
+        """
+        Check whether a relationship exists.
+
+        Args:
+            source_ref: Source object ID
+            target_ref: Target object ID
+            relationship_type: Type of relationship
+
+        Returns:
+            True if the edge exists
+        """
+        source = self._node_index.get(source_ref)
+        target = self._node_index.get(target_ref)
+        rel_code = self._rel_codes.get(relationship_type)
+        if source is None or target is None or rel_code is None:
+            return False
+        return self._edge_key(source, target, rel_code) in self._edge_keys
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    @property
+    def node_count(self) -> int:
+        """Number of interned objects."""
+        return len(self.ids)
+
+    def node_type(self, index: int) -> str:
+        """Get the object type of a node."""
+        return self._type_names[self._node_types[index]]
+
+    def relationship_type(self, edge: int) -> str:
+        """Get the relationship type of an edge."""
+        return self._rel_types[self.rel_codes[edge]]
+
+    def description(self, edge: int) -> str:
+        """
+        Get the description of an edge, rendering its template if it has one.
+
+        Args:
+            edge: Edge index
+
+        Returns:
+            Description text
+        """
+        template = self._description_codes[edge]
+        if template == EXPLICIT_DESCRIPTION:
+            return self._descriptions.get(edge, '')
+
+        relationship_type = self.relationship_type(edge)
+        source, target = self.sources[edge], self.targets[edge]
+        return get_description_templates(relationship_type)[template].format(
+            source_name=self._node_names[source] or self.node_type(source),
+            target_name=self._node_names[target] or self.node_type(target),
+            relationship_type=relationship_type
+        )
+
+    def edges(self) -> Iterator[Tuple[str, str, str]]:
+        """
+        Iterate over edges.
+
+        Yields:
+            (source_ref, target_ref, relationship_type) tuples
+        """
+        ids, rel_types = self.ids, self._rel_types
+        for source, target, rel_code in zip(self.sources, self.targets, self.rel_codes):
+            yield ids[source], ids[target], rel_types[rel_code]
+
+    def relationship_type_counts(self) -> Dict[str, int]:
+        """
+        Count edges by relationship type.
+
+        Returns:
+            Dictionary mapping relationship types to counts
+        """
+        counts = [0] * len(self._rel_types)
+        for rel_code in self.rel_codes:
+            counts[rel_code] += 1
+        return {rel_type: count for rel_type, count in zip(self._rel_types, counts) if count}
+
+    def degrees(self) -> Tuple[array, array]:
+        """
+        Compute node degrees.
+
+        Returns:
+            Tuple of (out-degree, in-degree) arrays indexed by node
+        """
+        out_degree = array('l', bytes(array('l').itemsize * len(self.ids)))
+        in_degree = array('l', out_degree)
+        for source in self.sources:
+            out_degree[source] += 1
+        for target in self.targets:
+            in_degree[target] += 1
+        return out_degree, in_degree
+
+    def components(self) -> List[int]:
+        """
+        Compute weakly connected component sizes.
+
+        Returns:
+            Component sizes, largest first
+        """
+        parent = array('l', range(len(self.ids)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for source, target in zip(self.sources, self.targets):
+            source_root, target_root = find(source), find(target)
+            if source_root != target_root:
+                parent[source_root] = target_root
+
+        sizes: Dict[int, int] = {}
+        for i in range(len(self.ids)):
+            root = find(i)
+            sizes[root] = sizes.get(root, 0) + 1
+        return sorted(sizes.values(), reverse=True)
+
+    def iter_dicts(self) -> Iterator[Dict[str, Any]]:
+        """
+        Export the edges as STIX relationship dictionaries, one at a time.
+
+        Edges without an explicit ID get one derived from their source, target
+        and relationship type, so the same edge has the same ID in every run
+        and different edges never share one.
+
+        Yields:
+            Relationship dictionaries
+        """
+        for edge, (source_ref, target_ref, relationship_type) in enumerate(self.edges()):
+            edge_id = self._edge_ids.get(edge) or relationship_stix_id(source_ref, relationship_type, target_ref)
+            yield {
+                "type": "relationship",
+                "spec_version": "2.1",
+                "id": edge_id,
+                "source_ref": source_ref,
+                "target_ref": target_ref,
+                "relationship_type": relationship_type,
+                "description": self.description(edge)
+            }
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Export the edges as STIX relationship dictionaries.
+
+        Returns:
+            List of relationship dictionaries
+        """
+        return list(self.iter_dicts())
+
+    @classmethod
+    def from_relationships(
+        cls, relationships: Iterable[Dict[str, Any]], stix_objects: Iterable[Dict[str, Any]] = ()
+    ) -> "RelationshipGraph":
+        """
+        Build a graph from relationship dictionaries.
+
+        Args:
+            relationships: STIX relationship dictionaries
+            stix_objects: Objects to intern as nodes first (so isolated objects are counted)
+
+        Returns:
+            RelationshipGraph
+        """
+        graph = cls()
+        graph.add_objects(stix_objects)
+        for rel in relationships:
+            source_ref, target_ref = rel.get('source_ref'), rel.get('target_ref')
+            if isinstance(source_ref, str) and isinstance(target_ref, str):
+                graph.add_edge(
+                    source_ref, target_ref, rel.get('relationship_type', 'unknown'),
+                    description=rel.get('description'), edge_id=rel.get('id')
+                )
+        return graph
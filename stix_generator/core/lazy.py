@@ -0,0 +1,138 @@
+"""
+STIX objects kept as dictionaries, with stix2 instances built on demand.
+
+In lazy construction mode the pipeline validates each object once and then
+carries it as a StixDict through bundling and serialization; a stix2
+instance is only created when a caller asks for one.
+"""
+
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from stix2 import parse
+from stix2.registry import class_for_type
+
+from ..utils.serialization import dumps
+from .validator import canonicalize_timestamps
+
+# Object type -> (stix2 property order, optional property defaults)
+_layouts: Dict[str, Tuple[Optional[Dict[str, None]], Dict[str, Any]]] = {}
+
+class StixDict(dict):
+    """
+    Validated STIX object stored as a plain dictionary.
+
+    Works anywhere a dictionary does (serialization, metrics, the generation
+    context) and also offers the parts of the stix2 object interface the
+    pipeline relies on: attribute access to properties, serialize() and,
+    through to_stix2(), the real stix2 instance.
+    """
+
+    __slots__ = ('_stix2',)
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._stix2 = None
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def serialize(self, pretty: bool = False) -> str:
+        """
+        Serialize the object to JSON.
+
+        Args:
+            pretty: Whether to format the JSON with indentation
+
+        Returns:
+            JSON string
+        """
+        return dumps(self, pretty)
+
+    def to_stix2(self) -> Any:
+        """
+        Get the stix2 instance of the object, building it on first use.
+
+        Returns:
+            stix2 object
+
+        Raises:
+            stix2 exceptions if the object does not validate
+        """
+        if self._stix2 is None:
+            self._stix2 = parse(dict(self), allow_custom=True)
+        return self._stix2
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+def _layout(obj_type: Any) -> Tuple[Optional[Dict[str, None]], Dict[str, Any]]:
+    """
+    Get the property order and optional property defaults stix2 uses for a type.
+
+    Args:
+        obj_type: STIX object type
+
+    Returns:
+        Ordered property names (None for types stix2 does not know) and the defaults
+        of optional properties that stix2 leaves out when serializing
+    """
+    layout = _layouts.get(obj_type)
+    if layout is None:
+        stix_class = class_for_type(obj_type, '2.1') if isinstance(obj_type, str) else None
+        if stix_class is None:
+            layout = (None, {})
+        else:
+            defaults = {}
+            for name, prop in stix_class._properties.items():
+                if prop.required or hasattr(prop, '_fixed_value') or not hasattr(prop, 'default'):
+                    continue
+                default = prop.default()
+                # Generated defaults (IDs, the current time) never match a value
+                if isinstance(default, (bool, int, float, str)) and default == prop.default():
+                    defaults[name] = default
+            layout = (dict.fromkeys(stix_class._properties), defaults)
+        _layouts[obj_type] = layout
+    return layout
+
+def canonical_stix_dict(obj: Mapping[str, Any]) -> StixDict:
+    """
+    Build a StixDict laid out the way stix2 serializes the object.
+
+    Spec properties come first in stix2's order and custom properties after
+    them, sorted; empty values and optional properties holding their default
+    are dropped, and timestamps get stix2's precision, so the same object
+    serializes identically in both construction modes.
+
+    Args:
+        obj: Validated STIX object
+
+    Returns:
+        StixDict copy of the object
+    """
+    order, defaults = _layout(obj.get('type'))
+    if order is None:
+        lazy_obj = StixDict(obj)
+    else:
+        lazy_obj = StixDict(
+            (name, obj[name])
+            for name in (*order, *sorted(name for name in obj if name not in order))
+            if name in obj and obj[name] is not None and obj[name] != []
+            and not (name in defaults and obj[name] == defaults[name] and type(obj[name]) is type(defaults[name]))
+        )
+    canonicalize_timestamps(lazy_obj)
+    return lazy_obj
+
+def to_stix2(obj: Any) -> Any:
+    """
+    Get a stix2 instance for an object that may be a StixDict.
+
+    Args:
+        obj: StixDict or stix2 object
+
+    Returns:
+        stix2 object
+    """
+    return obj.to_stix2() if isinstance(obj, StixDict) else obj
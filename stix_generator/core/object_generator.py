@@ -3,38 +3,57 @@ STIX object generator module.
 """
 
 import os
-import json
-import uuid
-import random
 import asyncio
-from datetime import datetime
-from typing import Dict, List, Any, Optional, Union
-import re
+from collections import Counter
+from typing import Dict, List, Any, Optional, Union, Callable
 
 import stix2
 from stix2 import (
     AttackPattern, Campaign, CourseOfAction, Grouping, Identity, Indicator,
     Infrastructure, IntrusionSet, Location, Malware, MalwareAnalysis, Note,
     ObservedData, Opinion, Report, ThreatActor, Tool, Vulnerability, Incident,
-    Sighting, MarkingDefinition, LanguageContent
+    Sighting, MarkingDefinition, LanguageContent, IPv4Address, DomainName, File
 )
 
 from ..config import (
     OPENAI_API_KEY, LLM_MODEL, LLM_OBJECT_TEMPERATURE, 
-    DEFAULT_BATCH_SIZE, MAX_CONCURRENT_REQUESTS, CACHE_ENABLED, CACHE_DIR
+    DEFAULT_BATCH_SIZE, MAX_CONCURRENT_REQUESTS, CACHE_ENABLED, CACHE_DIR,
+    OBJECT_GENERATION_MODE, SYNTHETIC_TYPES, SYNTHETIC_FALLBACK, HYBRID_SEED_COUNT,
+    STIX2_CONSTRUCTION, LAZY_VALIDATION_SAMPLE_RATE
 )
 from ..utils.logging_utils import object_generator_logger as logger
+from ..utils.cache import get_object_cache
 from ..llm.client import get_llm_client
 from ..llm.prompts import get_object_generation_prompt_template, get_stix_output_parser, get_stix_object_prompt_template
 from ..models.schemas import get_schema_for_type
 from ..models.stix_templates import get_examples_for_type
+from .validator import normalize_stix_object, check_stix_object
+from .lazy import StixDict, canonical_stix_dict
+from .context import ContextStore, as_context_store
+from .synthesizer import StixObjectSynthesizer
+from ..utils.ids import IdProvider, TimestampProvider, get_reference_time, object_stix_id
+from ..utils.rng import derive_seed, spawn_rng
+from ..utils.event_loop import run_in_worker
+
+# Supported object generation modes
+GENERATION_MODES = ("llm", "synthetic", "hybrid")
 
 class StixObjectGenerator:
     """
     Generator for STIX objects using LLM.
     """
     
-    def __init__(self, api_key: str = OPENAI_API_KEY, seed: int = 42, use_cache: bool = True):
+    def __init__(
+        self,
+        api_key: str = OPENAI_API_KEY,
+        seed: int = 42,
+        use_cache: bool = True,
+        progress_callback: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None,
+        generation_mode: str = OBJECT_GENERATION_MODE,
+        synthetic_types: Optional[List[str]] = None,
+        synthetic_fallback: bool = SYNTHETIC_FALLBACK,
+        construction_mode: str = STIX2_CONSTRUCTION
+    ):
         """
         Initialize the STIX object generator.
         
@@ -42,10 +61,37 @@ class StixObjectGenerator:
             api_key: OpenAI API key
             seed: Random seed for reproducibility
             use_cache: Whether to use cached objects
+            progress_callback: Called with (object_type, objects) as each batch of objects is prepared
+                (the batches of a phase once its LLM requests complete, in a fixed order)
+            generation_mode: "llm", "synthetic" (template-based, no LLM calls) or
+                "hybrid" (a few LLM seed objects per type, expanded locally)
+            synthetic_types: Object types to always synthesize (defaults to SYNTHETIC_TYPES)
+            synthetic_fallback: Whether to synthesize objects the LLM failed to generate
+            construction_mode: "eager" (a stix2 instance per object) or "lazy"
+                (validated dictionaries, stix2 instances built on request)
         """
+        if generation_mode not in GENERATION_MODES:
+            raise ValueError(f"Unknown generation mode: {generation_mode}")
+        if construction_mode not in ("eager", "lazy"):
+            raise ValueError(f"Unknown construction mode: {construction_mode}")
+        
         self.api_key = api_key
         self.seed = seed
         self.use_cache = use_cache
+        self.progress_callback = progress_callback
+        self.generation_mode = generation_mode
+        self.synthetic_types = set(SYNTHETIC_TYPES if synthetic_types is None else synthetic_types)
+        self.synthetic_fallback = synthetic_fallback
+        self.construction_mode = construction_mode
+        self.synthesizer = StixObjectSynthesizer(seed)
+        
+        # One synthesizer (and so one random stream) per object type, so types
+        # generated concurrently never draw from a shared stream
+        self._synthesizers: Dict[str, StixObjectSynthesizer] = {}
+        
+        # Seeded bulk providers for fallback reference IDs and repaired timestamps
+        self.ids = IdProvider(derive_seed(seed, "ids"))
+        self.timestamps = TimestampProvider(get_reference_time())
         
         # Create cache directory if it doesn't exist and cache is enabled
         if CACHE_ENABLED and self.use_cache and not os.path.exists(CACHE_DIR):
@@ -54,12 +100,34 @@ class StixObjectGenerator:
         # Initialize LLM client
         self.llm_client = get_llm_client(api_key)
         
-        # Set random seed
-        random.seed(seed)
+        # Own random stream, so concurrent generators do not disturb each other
+        self.rng = spawn_rng(seed, "objects")
         
         logger.info(f"Initialized StixObjectGenerator with seed {seed} and cache usage set to {use_cache}")
         
-        self.context = []
+        # Objects generated so far, indexed by type for reference resolution
+        self.context = ContextStore()
+        
+        # Cyber-observables built for synthesized observed-data, by type
+        self.observables: Dict[str, List[Dict[str, Any]]] = {}
+        
+        # IDs of objects already normalized by _prepare_object, and what was repaired
+        self._normalized_ids = set()
+        self.repair_counts = Counter()
+        
+        # Semaphore bounding concurrent LLM requests (created lazily inside the running loop)
+        self._request_semaphore = None
+    
+    def _get_request_semaphore(self) -> asyncio.Semaphore:
+        """
+        Get the semaphore that limits concurrent LLM requests for this generator.
+        
+        Returns:
+            Semaphore sized to MAX_CONCURRENT_REQUESTS
+        """
+        if self._request_semaphore is None:
+            self._request_semaphore = asyncio.Semaphore(max(1, MAX_CONCURRENT_REQUESTS))
+        return self._request_semaphore
     
     async def _generate_stix_objects_batch(self, object_type: str, count: int, context: List[Any], batch_seed: int, special_instructions: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -69,16 +137,13 @@ class StixObjectGenerator:
             object_type: STIX object type
             count: Number of objects to generate
             context: Context for generation
-            batch_seed: Random seed for this batch
+            batch_seed: Seed passed to the LLM for this batch
             special_instructions: Special instructions for object generation
             
         Returns:
             List of generated STIX objects
         """
         try:
-            # Set seed for this batch
-            random.seed(batch_seed)
-            
             # Get LLM client and output parser
             llm = self.llm_client
             output_parser = get_stix_output_parser()
@@ -99,34 +164,18 @@ class StixObjectGenerator:
                 count=count
             )
             
-            # Generate objects
-            response = await llm.agenerate([prompt])
+            # Generate objects (served from the memo store when memoization is enabled)
+            result = await llm.agenerate_text(prompt, seed=batch_seed)
             
             # Parse response
             try:
-                result = response.generations[0][0].text
                 objects = output_parser.parse(result)
                 
                 # Ensure we have the right number of objects
                 if len(objects) < count:
                     logger.warning(f"Generated {len(objects)} {object_type} objects, but requested {count}")
                 
-                # Process each object
-                for obj in objects:
-                    # Add ID if missing
-                    if "id" not in obj:
-                        obj["id"] = f"{object_type}--{str(uuid.uuid4())}"
-                    
-                    # Add type if missing
-                    if "type" not in obj:
-                        obj["type"] = object_type
-                    
-                    # Add created/modified timestamps if missing
-                    if "created" not in obj:
-                        obj["created"] = datetime.now().strftime("%Y-%m-%dT%H:%M:%S.000Z")
-                    if "modified" not in obj:
-                        obj["modified"] = obj["created"]
-                
+                # Missing IDs, types and timestamps are filled in by _prepare_object
                 return objects[:count]  # Ensure we return exactly the requested count
                 
             except Exception as e:
@@ -137,6 +186,21 @@ class StixObjectGenerator:
             logger.error(f"Error generating {object_type} objects: {str(e)}")
             return []
     
+    def _report_progress(self, object_type: str, objects: List[Dict[str, Any]]) -> None:
+        """
+        Notify the progress callback that objects of a type are available.
+        
+        Args:
+            object_type: STIX object type
+            objects: Newly available (prepared) objects
+        """
+        if not self.progress_callback or not objects:
+            return
+        try:
+            self.progress_callback(object_type, objects)
+        except Exception as e:
+            logger.warning(f"Progress callback failed: {str(e)}")
+    
     # The rest of the methods remain the same as in the original file
     
     def get_stix_class(self, obj_type: str):
@@ -171,38 +235,26 @@ class StixObjectGenerator:
             'incident': Incident,
             'sighting': Sighting,
             'marking-definition': MarkingDefinition,
-            'language-content': LanguageContent
+            'language-content': LanguageContent,
+            'ipv4-addr': IPv4Address,
+            'domain-name': DomainName,
+            'file': File
         }
         return type_map.get(obj_type)
     
-    def _save_to_cache(self, obj: Dict[str, Any], obj_type: str) -> None:
+    def _save_to_cache(self, objects: List[Dict[str, Any]], obj_type: str) -> None:
         """
-        Save an object to cache.
+        Save a batch of objects to cache.
         
         Args:
-            obj: STIX object as dictionary
+            objects: STIX objects as dictionaries
             obj_type: STIX object type
         """
         if not CACHE_ENABLED or not self.use_cache:
             return
             
-        cache_path = os.path.join(CACHE_DIR, f"{obj_type}.json")
-        
         try:
-            # Load existing cache if it exists
-            if os.path.exists(cache_path):
-                with open(cache_path, 'r') as f:
-                    cache = json.load(f)
-            else:
-                cache = []
-            
-            # Add new object to cache
-            cache.append(obj)
-            
-            # Save updated cache
-            with open(cache_path, 'w') as f:
-                json.dump(cache, f, indent=2)
-                
+            get_object_cache(CACHE_DIR).save_many(obj_type, objects)
         except Exception as e:
             logger.error(f"Error saving to cache: {str(e)}")
     
@@ -220,19 +272,8 @@ class StixObjectGenerator:
         if not CACHE_ENABLED or not self.use_cache:
             return []
             
-        cache_path = os.path.join(CACHE_DIR, f"{obj_type}.json")
-        
-        if not os.path.exists(cache_path):
-            return []
-            
         try:
-            with open(cache_path, 'r') as f:
-                cache = json.load(f)
-                
-            if limit is not None:
-                return cache[:limit]
-            return cache
-                
+            return get_object_cache(CACHE_DIR).load(obj_type, limit)
         except Exception as e:
             logger.error(f"Error loading from cache: {str(e)}")
             return []
@@ -242,240 +283,119 @@ class StixObjectGenerator:
         Get a reference to an existing object of the specified type.
         
         Args:
-            context: List of existing STIX objects
+            context: ContextStore or list of existing STIX objects
             obj_type: STIX object type
             
         Returns:
             ID of a matching object or a newly generated ID
         """
-        matching_objects = []
-        
-        for obj in context:
-            if isinstance(obj, dict) and obj.get('type') == obj_type:
-                matching_objects.append(obj)
-            elif hasattr(obj, 'type') and obj.type == obj_type:
-                matching_objects.append(obj)
-        
-        if matching_objects:
-            selected = random.choice(matching_objects)
-            if isinstance(selected, dict):
-                return selected['id']
-            else:
-                return selected.id
+        selected = as_context_store(context).choice(obj_type, self.rng)
+        if selected:
+            return selected
         
         # Generate a fallback ID if no matching objects found
-        return f"{obj_type}--{uuid.uuid4()}"
+        return self.ids.stix_id(obj_type)
     
     def get_references(self, context: List[Any], obj_type: str, count: int) -> List[str]:
         """
         Get references to multiple existing objects of the specified type.
         
         Args:
-            context: List of existing STIX objects
+            context: ContextStore or list of existing STIX objects
             obj_type: STIX object type
             count: Number of references to get
             
         Returns:
             List of object IDs
         """
-        matching_objects = []
-        
-        for obj in context:
-            if isinstance(obj, dict) and obj.get('type') == obj_type:
-                matching_objects.append(obj)
-            elif hasattr(obj, 'type') and obj.type == obj_type:
-                matching_objects.append(obj)
-        
-        if not matching_objects:
-            return [f"{obj_type}--{uuid.uuid4()}" for _ in range(count)]
+        store = as_context_store(context)
+        if not store.count(obj_type):
+            return self.ids.stix_ids(obj_type, count)
         
-        sample_count = min(count, len(matching_objects))
-        selected = random.sample(matching_objects, sample_count)
-        
-        return [obj['id'] if isinstance(obj, dict) else obj.id for obj in selected]
+        return store.sample(obj_type, count, self.rng)
     
     def get_mixed_references(self, context: List[Any], count: int) -> List[str]:
         """
         Get references to multiple existing objects of any type.
         
         Args:
-            context: List of existing STIX objects
+            context: ContextStore or list of existing STIX objects
             count: Number of references to get
             
         Returns:
             List of object IDs
         """
-        valid_objects = []
-        
-        for obj in context:
-            if isinstance(obj, dict) and 'id' in obj:
-                valid_objects.append(obj)
-            elif hasattr(obj, 'id'):
-                valid_objects.append(obj)
-        
-        if not valid_objects:
+        store = as_context_store(context)
+        if not store.count():
             types = ["attack-pattern", "indicator", "malware", "threat-actor"]
-            return [f"{random.choice(types)}--{uuid.uuid4()}" for _ in range(count)]
+            return [self.ids.stix_id(self.rng.choice(types)) for _ in range(count)]
         
-        sample_count = min(count, len(valid_objects))
-        selected = random.sample(valid_objects, sample_count)
-        
-        return [obj['id'] if isinstance(obj, dict) else obj.id for obj in selected]
+        return store.sample(None, count, self.rng)
     
-    def _prepare_object(self, obj: Dict[str, Any], context: List[Any]) -> Dict[str, Any]:
+    def _prepare_object(self, obj: Dict[str, Any], context: List[Any], object_type: Optional[str] = None) -> Dict[str, Any]:
         """
         Prepare a STIX object by ensuring all fields are valid.
         
+        This is the only normalization pass an object goes through; the result
+        is handed to the stix2 constructor unchanged.
+        
         Args:
             obj: STIX object as dictionary
-            context: Context for generation
+            context: ContextStore or list of existing STIX objects
+            object_type: Expected STIX object type, used if the object has none
             
         Returns:
             Prepared STIX object
         """
-        # Ensure ID is in the correct format
-        if 'type' in obj and 'id' in obj:
-            obj_type = obj['type']
-            # Check if ID is in the correct format
-            if not re.match(r'^[a-z0-9-]+--[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', obj['id']):
-                # Replace with a properly formatted ID
-                obj['id'] = f"{obj_type}--{str(uuid.uuid4())}"
-        
-        # Process references to ensure they are valid
-        for key, value in list(obj.items()):
-            # Handle reference fields
-            if key.endswith('_ref') and isinstance(value, str):
-                # Check if the reference is valid
-                if not re.match(r'^[a-z0-9-]+--[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', value):
-                    # Try to find a valid reference in context
-                    ref_type = value.split('--')[0] if '--' in value else None
-                    if ref_type:
-                        # Find objects of this type in context
-                        matching_objects = [c for c in context if isinstance(c, dict) and c.get('type') == ref_type]
-                        if matching_objects:
-                            # Use a valid ID from context
-                            obj[key] = matching_objects[0]['id']
-                        else:
-                            # Remove invalid reference
-                            del obj[key]
-                    else:
-                        # Remove invalid reference
-                        del obj[key]
-            
-            # Handle reference lists
-            elif key.endswith('_refs') and isinstance(value, list):
-                valid_refs = []
-                for ref in value:
-                    if isinstance(ref, str):
-                        # Check if the reference is valid
-                        if re.match(r'^[a-z0-9-]+--[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', ref):
-                            valid_refs.append(ref)
-                        else:
-                            # Try to find a valid reference in context
-                            ref_type = ref.split('--')[0] if '--' in ref else None
-                            if ref_type:
-                                # Find objects of this type in context
-                                matching_objects = [c for c in context if isinstance(c, dict) and c.get('type') == ref_type]
-                                if matching_objects:
-                                    # Use a valid ID from context
-                                    valid_refs.append(matching_objects[0]['id'])
-                
-                # Update with valid references only
-                if valid_refs:
-                    obj[key] = valid_refs
-                else:
-                    # Remove empty reference list
-                    del obj[key]
-        
-        # Ensure created and modified timestamps are in the correct format
-        for timestamp_field in ['created', 'modified']:
-            if timestamp_field in obj:
-                try:
-                    # Try to parse the timestamp
-                    datetime.fromisoformat(obj[timestamp_field].replace('Z', '+00:00'))
-                except (ValueError, TypeError):
-                    # Replace with a valid timestamp
-                    obj[timestamp_field] = datetime.now().strftime("%Y-%m-%dT%H:%M:%S.000Z")
-        
-        # Special handling for specific object types
-        obj_type = obj.get('type')
-        
-        # Special handling for observed-data
-        if obj_type == 'observed-data':
-            self._sanitize_observed_data(obj)
-        
-        # Special handling for sighting
-        elif obj_type == 'sighting':
-            # Ensure sighting_of_ref is valid
-            if 'sighting_of_ref' in obj and not re.match(r'^[a-z0-9-]+--[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', obj['sighting_of_ref']):
-                # Try to find a valid indicator or other observable
-                for ref_type in ['indicator', 'malware', 'tool', 'attack-pattern']:
-                    matching_objects = [c for c in context if isinstance(c, dict) and c.get('type') == ref_type]
-                    if matching_objects:
-                        obj['sighting_of_ref'] = matching_objects[0]['id']
-                        break
-                else:
-                    # If no valid reference found, remove the field
-                    if 'sighting_of_ref' in obj:
-                        del obj['sighting_of_ref']
-        
-        # Special handling for marking-definition
-        elif obj_type == 'marking-definition':
-            # Ensure definition_type is valid
-            if 'definition_type' not in obj:
-                obj['definition_type'] = 'statement'
-            
-            # Ensure definition is present
-            if 'definition' not in obj:
-                obj['definition'] = {'statement': 'Copyright. All rights reserved.'}
-        
-        # Special handling for language-content
-        elif obj_type == 'language-content':
-            # Ensure object_ref is valid
-            if 'object_ref' in obj and not re.match(r'^[a-z0-9-]+--[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', obj['object_ref']):
-                # Try to find any valid object
-                if context:
-                    for c in context:
-                        if isinstance(c, dict) and 'id' in c:
-                            obj['object_ref'] = c['id']
-                            break
-                    else:
-                        # If no valid reference found, remove the field
-                        if 'object_ref' in obj:
-                            del obj['object_ref']
-            
-            # Ensure contents is present
-            if 'contents' not in obj:
-                obj['contents'] = {'en': {'name': 'English content'}}
-        
+        store = as_context_store(context)
+        fixes = normalize_stix_object(
+            obj,
+            default_type=object_type,
+            find_reference=store.first,
+            new_id=lambda obj_type: object_stix_id(obj_type, obj),
+            now=self.timestamps.now
+        )
+        
+        # The LLM may repeat IDs (and identical objects derive identical IDs),
+        # so never reuse the ID of a different object
+        salt = 0
+        existing = store.get(obj['id'])
+        while existing is not None and existing is not obj:
+            salt += 1
+            obj['id'] = object_stix_id(obj['type'], obj, salt)
+            existing = store.get(obj['id'])
+            fixes.append('id')
+        
+        if fixes:
+            self.repair_counts.update(fixes)
+            logger.debug(f"Repaired {obj.get('id')}: {', '.join(fixes)}")
+        
+        self._normalized_ids.add(obj['id'])
         return obj
     
-    def _sanitize_observed_data(self, obj: Dict[str, Any]) -> None:
+    def _normalized(self, obj: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Sanitize observed data to ensure it is valid.
+        Get an object in normalized form.
+        
+        Objects prepared by this generator are already clean; anything else is
+        normalized on a copy without context, with the same content-derived IDs
+        and reference time as prepared objects so conversion stays reproducible.
         
         Args:
-            obj: Observed data object to sanitize
-        """
-        if 'objects' not in obj:
-            return
+            obj: STIX object as dictionary
             
-        sanitized = {}
-        for key, value in obj['objects'].items():
-            if isinstance(value, dict):
-                if 'type' in value:
-                    if value['type'] == 'file':
-                        value.pop('created', None)
-                    elif value['type'] == 'process':
-                        value.pop('created', None)
-                    elif value['type'] == 'network-traffic':
-                        if 'src_ref' in value and not isinstance(value['src_ref'], str):
-                            value['src_ref'] = str(value['src_ref'])
-                        if 'dst_ref' in value and not isinstance(value['dst_ref'], str):
-                            value['dst_ref'] = str(value['dst_ref'])
-                sanitized[key] = value
-        
-        obj['objects'] = sanitized
+        Returns:
+            The object itself, or a normalized copy
+        """
+        if obj.get('id') in self._normalized_ids:
+            return obj
+        obj_copy = obj.copy()
+        normalize_stix_object(
+            obj_copy,
+            new_id=lambda obj_type: object_stix_id(obj_type, obj_copy),
+            now=self.timestamps.now
+        )
+        return obj_copy
     
     def convert_to_stix2_object(self, obj: Dict[str, Any]) -> Optional[Any]:
         """
@@ -499,58 +419,38 @@ class StixObjectGenerator:
                 logger.error(f"Unsupported STIX object type: {obj_type}")
                 return None
             
-            # Fix common issues before conversion
-            obj_copy = obj.copy()
-            
-            # Ensure ID is in the correct format
-            if 'id' in obj_copy:
-                if not re.match(r'^[a-z0-9-]+--[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', obj_copy['id']):
-                    obj_copy['id'] = f"{obj_type}--{str(uuid.uuid4())}"
-            
-            # Fix reference fields
-            for key, value in list(obj_copy.items()):
-                # Handle reference fields
-                if key.endswith('_ref') and isinstance(value, str):
-                    # Check if the reference is valid
-                    if not re.match(r'^[a-z0-9-]+--[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', value):
-                        # Remove invalid reference
-                        del obj_copy[key]
-                
-                # Handle reference lists
-                elif key.endswith('_refs') and isinstance(value, list):
-                    valid_refs = []
-                    for ref in value:
-                        if isinstance(ref, str) and re.match(r'^[a-z0-9-]+--[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', ref):
-                            valid_refs.append(ref)
-                    
-                    # Update with valid references only
-                    if valid_refs:
-                        obj_copy[key] = valid_refs
-                    else:
-                        # Remove empty reference list
-                        del obj_copy[key]
-            
-            # Ensure timestamps are in the correct format
-            for timestamp_field in ['created', 'modified']:
-                if timestamp_field in obj_copy:
-                    try:
-                        # Try to parse the timestamp
-                        datetime.fromisoformat(obj_copy[timestamp_field].replace('Z', '+00:00'))
-                    except (ValueError, TypeError):
-                        # Replace with a valid timestamp
-                        obj_copy[timestamp_field] = datetime.now().strftime("%Y-%m-%dT%H:%M:%S.000Z")
-            
-            # Special handling for observed-data
-            if obj_type == 'observed-data':
-                self._sanitize_observed_data(obj_copy)
-            
             # Convert to STIX2 object
-            return stix_class(**obj_copy)
+            return stix_class(**self._normalized(obj))
             
         except Exception as e:
             logger.error(f"Error converting to STIX2 object: {str(e)}")
             return None
     
+    def to_lazy_stix_object(self, obj: Dict[str, Any], full_validation: bool = False) -> Optional[StixDict]:
+        """
+        Validate a dictionary and keep it as a StixDict instead of a STIX2 object.
+        
+        Every object gets the schema check; with full_validation a stix2
+        instance is also built (and discarded) to run stix2's own validation.
+        The StixDict is laid out the way stix2 serializes the object, so both
+        construction modes produce identical output.
+        
+        Args:
+            obj: STIX object as dictionary
+            full_validation: Whether to validate with stix2 as well
+            
+        Returns:
+            StixDict or None if validation fails
+        """
+        obj = self._normalized(obj)
+        problems = check_stix_object(obj)
+        if problems:
+            logger.error(f"Invalid STIX object {obj.get('id', 'unknown')}: missing or invalid {', '.join(problems)}")
+            return None
+        if full_validation and self.convert_to_stix2_object(obj) is None:
+            return None
+        return canonical_stix_dict(obj)
+    
     async def generate_stix_objects(self, object_type: str, count: int, special_instructions: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Generate STIX objects of a specific type.
@@ -563,22 +463,51 @@ class StixObjectGenerator:
         Returns:
             List of generated STIX objects
         """
+        fetched = await self._fetch_objects(object_type, count, special_instructions)
+        return await run_in_worker(self._build_objects, fetched)
+    
+    async def _fetch_objects(self, object_type: str, count: int, special_instructions: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Collect the raw objects of a type from the cache and the LLM.
+        
+        Nothing here reads or extends the generation context, so the fetches
+        of several types can run concurrently; _build_objects turns the result
+        into prepared objects.
+        
+        Args:
+            object_type: STIX object type
+            count: Number of objects to generate
+            special_instructions: Special instructions for object generation
+            
+        Returns:
+            Dictionary with the request, the raw cached objects and the raw LLM batches
+        """
         logger.info(f"Generating {count} {object_type} objects")
+        if special_instructions:
+            logger.info(f"Using special instructions for {object_type}: {special_instructions}")
+        
+        fetched = {
+            "object_type": object_type,
+            "count": count,
+            "llm_count": 0,
+            "special_instructions": special_instructions,
+            "cached": [],
+            "batches": []
+        }
         
-        # Check if we can load from cache
-        cached_objects = self._load_from_cache(object_type, count)
-        if cached_objects and len(cached_objects) >= count and not special_instructions:
-            logger.info(f"Loaded {len(cached_objects[:count])} {object_type} objects from cache")
-            return cached_objects[:count]
+        # Synthesized types never touch the LLM or the cache
+        if self._should_synthesize(object_type):
+            return fetched
         
-        # Initialize result list
-        result = []
+        # Hybrid mode: a constant number of LLM seeds per type, expanded locally
+        if self.generation_mode == "hybrid" and count > HYBRID_SEED_COUNT:
+            count = HYBRID_SEED_COUNT
+        fetched["llm_count"] = count
         
-        # Add cached objects if available and no special instructions
-        if cached_objects and not special_instructions:
-            result.extend(cached_objects)
-            count -= len(cached_objects)
-            logger.info(f"Loaded {len(cached_objects)} {object_type} objects from cache, generating {count} more")
+        # Check if we can load from cache (cached objects are not used with special instructions)
+        if not special_instructions:
+            fetched["cached"] = await run_in_worker(self._load_from_cache, object_type, count)
+            count -= len(fetched["cached"])
         
         # If we still need to generate objects
         if count > 0:
@@ -588,38 +517,243 @@ class StixObjectGenerator:
             # Calculate number of batches
             num_batches = (count + batch_size - 1) // batch_size
             
-            # Generate objects in batches
-            for i in range(num_batches):
-                # Calculate batch count
-                batch_count = min(batch_size, count - i * batch_size)
-                
-                # Generate batch
-                batch_seed = self.seed + i
-                batch = await self._generate_stix_objects_batch(
-                    object_type, 
-                    batch_count, 
-                    self.context, 
-                    batch_seed,
-                    special_instructions
-                )
+            # Generate batches concurrently, bounded by MAX_CONCURRENT_REQUESTS
+            semaphore = self._get_request_semaphore()
+            
+            async def run_batch(batch_index: int, batch_count: int) -> List[Dict[str, Any]]:
+                async with semaphore:
+                    return await self._generate_stix_objects_batch(
+                        object_type, 
+                        batch_count, 
+                        self.context, 
+                        self.seed + batch_index,
+                        special_instructions
+                    )
+            
+            # gather preserves submission order, so batches are prepared in a fixed order
+            fetched["batches"] = await asyncio.gather(*[
+                run_batch(i, min(batch_size, count - i * batch_size))
+                for i in range(num_batches)
+            ])
+        
+        return fetched
+    
+    def _build_objects(self, fetched: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Turn the fetched objects of a type into prepared objects.
+        
+        Prepares the cached and LLM objects, tops up what the LLM did not
+        generate, and expands hybrid seeds or synthesizes synthetic types. This
+        is where the generation context is read and extended.
+        
+        Args:
+            fetched: Result of _fetch_objects
+            
+        Returns:
+            List of prepared STIX objects
+        """
+        object_type, count = fetched["object_type"], fetched["count"]
+        if self._should_synthesize(object_type):
+            return self._synthesize_objects(object_type, count)
+        
+        objects = self._prepare_llm_objects(fetched)
+        if fetched["llm_count"] < count:
+            return objects + self._expand_objects(object_type, objects, count - len(objects))
+        return objects
+    
+    def _prepare_llm_objects(self, fetched: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Prepare the cached objects and LLM batches of a type, in order.
+        
+        Args:
+            fetched: Result of _fetch_objects
+            
+        Returns:
+            List of prepared STIX objects
+        """
+        object_type = fetched["object_type"]
+        special_instructions = fetched["special_instructions"]
+        
+        # Initialize result list
+        result = []
+        
+        # Add cached objects if available
+        cached_objects = [
+            self._prepare_object(obj, self.context, object_type)
+            for obj in fetched["cached"]
+        ]
+        if cached_objects:
+            logger.info(f"Loaded {len(cached_objects)} {object_type} objects from cache")
+            result.extend(cached_objects)
+            self.context.extend(cached_objects)
+            self._report_progress(object_type, cached_objects)
+        
+        for batch in fetched["batches"]:
+            prepared = [self._prepare_object(obj, self.context, object_type) for obj in batch]
+            
+            # Add prepared objects to result
+            result.extend(prepared)
+            
+            # Save the whole batch to cache if no special instructions
+            if not special_instructions:
+                self._save_to_cache(prepared, object_type)
                 
-                # Process and add to result
-                for obj in batch:
-                    # Prepare object
-                    obj = self._prepare_object(obj, self.context)
-                    
-                    # Add to result
-                    result.append(obj)
-                    
-                    # Save to cache if no special instructions
-                    if not special_instructions:
-                        self._save_to_cache(obj, object_type)
-                    
-                # Add to context
-                self.context.extend(batch)
+            # Add to context
+            self.context.extend(prepared)
+            self._report_progress(object_type, prepared)
+        
+        # Top up whatever the LLM could not generate
+        missing = fetched["llm_count"] - len(result)
+        if missing > 0 and self.synthetic_fallback and self.synthesizer.supports(object_type):
+            logger.info(f"Synthesizing {missing} {object_type} objects the LLM did not generate")
+            result.extend(self._synthesize_objects(object_type, missing))
         
         return result
     
+    def _expand_objects(self, object_type: str, seeds: List[Dict[str, Any]], count: int) -> List[Dict[str, Any]]:
+        """
+        Expand seed objects to more objects of the same type by local recombination.
+        
+        Falls back to template synthesis if there are no seeds and synthetic
+        fallback is enabled.
+        
+        Args:
+            object_type: STIX object type
+            seeds: Prepared seed objects
+            count: Number of additional objects to build
+            
+        Returns:
+            List of prepared STIX objects
+        """
+        if not seeds:
+            if self.synthetic_fallback and self.synthesizer.supports(object_type):
+                return self._synthesize_objects(object_type, count)
+            logger.warning(f"No {object_type} seed objects to expand")
+            return []
+        
+        logger.info(f"Expanding {len(seeds)} {object_type} seed objects to {len(seeds) + count}")
+        synthesizer = self._get_synthesizer(object_type)
+        objects = [
+            self._prepare_object(obj, self.context, object_type)
+            for obj in synthesizer.expand(object_type, seeds, count, self.context)
+        ]
+        self._add_observables(synthesizer.take_observables())
+        self.context.extend(objects)
+        self._report_progress(object_type, objects)
+        return objects
+    
+    def _add_observables(self, observables: List[Dict[str, Any]]) -> None:
+        """
+        Keep the cyber-observables a synthesizer built for observed-data objects.
+        
+        They are already valid, so they skip normalization, and the same
+        observable (same deterministic ID) is only kept once.
+        
+        Args:
+            observables: Cyber-observable objects as dictionaries
+        """
+        added = {}
+        for obj in observables:
+            if self.context.append(obj):
+                self._normalized_ids.add(obj['id'])
+                added.setdefault(obj['type'], []).append(obj)
+        for sco_type, objects in added.items():
+            self.observables.setdefault(sco_type, []).extend(objects)
+            self._report_progress(sco_type, objects)
+    
+    def _get_synthesizer(self, object_type: str) -> StixObjectSynthesizer:
+        """
+        Get the synthesizer of an object type, seeded from the run seed and the type.
+        
+        Args:
+            object_type: STIX object type
+            
+        Returns:
+            StixObjectSynthesizer
+        """
+        synthesizer = self._synthesizers.get(object_type)
+        if synthesizer is None:
+            synthesizer = self._synthesizers[object_type] = StixObjectSynthesizer(derive_seed(self.seed, object_type))
+        return synthesizer
+    
+    def _should_synthesize(self, object_type: str) -> bool:
+        """
+        Check whether objects of a type are synthesized instead of generated by the LLM.
+        
+        Args:
+            object_type: STIX object type
+            
+        Returns:
+            True if the type should be synthesized
+        """
+        if not self.synthesizer.supports(object_type):
+            return False
+        return self.generation_mode == "synthetic" or object_type in self.synthetic_types
+    
+    def _synthesize_objects(self, object_type: str, count: int) -> List[Dict[str, Any]]:
+        """
+        Build objects locally with the template synthesizer.
+        
+        Args:
+            object_type: STIX object type
+            count: Number of objects to build
+            
+        Returns:
+            List of prepared STIX objects
+        """
+        synthesizer = self._get_synthesizer(object_type)
+        objects = [
+            self._prepare_object(obj, self.context, object_type)
+            for obj in synthesizer.generate(object_type, count, self.context)
+        ]
+        if len(objects) < count:
+            logger.warning(f"Synthesized {len(objects)} of {count} {object_type} objects: nothing to reference yet")
+        self._add_observables(synthesizer.take_observables())
+        self.context.extend(objects)
+        self._report_progress(object_type, objects)
+        return objects
+    
+    async def _generate_types(
+        self,
+        object_types: List[str],
+        object_counts: Dict[str, int],
+        special_instructions: Dict[str, str]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Generate objects of several independent types for a dataset.
+        
+        The LLM requests of all types run concurrently and share the request
+        semaphore. Each type is built as soon as its own fetch and those of the
+        types before it are done, one type at a time in the given order, so
+        references resolve against the same context and progress is reported
+        in the same order whichever request finishes first.
+        
+        Args:
+            object_types: STIX object types to generate
+            object_counts: Dictionary mapping object types to counts
+            special_instructions: Dictionary mapping object types to special instructions
+            
+        Returns:
+            Lists of generated STIX objects, in the order of object_types
+        """
+        tasks = [
+            asyncio.ensure_future(
+                self._fetch_objects(obj_type, object_counts[obj_type], special_instructions.get(obj_type))
+            )
+            for obj_type in object_types
+        ]
+        
+        # Building is CPU-bound, so it runs off the event loop (one type at a
+        # time); objects come back already normalized by _prepare_object
+        results = []
+        try:
+            for task in tasks:
+                results.append(await run_in_worker(self._build_objects, await task))
+        finally:
+            for task in tasks:
+                task.cancel()
+        return results
+    
     async def generate_dataset(self, object_counts: Dict[str, int], special_instructions: Optional[Dict[str, str]] = None) -> Dict[str, List[Dict[str, Any]]]:
         """
         Generate a dataset of STIX objects in a phased approach to ensure proper references.
@@ -682,109 +816,77 @@ class StixObjectGenerator:
         # All supported STIX object types
         all_stix_types = phase1_types + phase2_types + phase3_types + phase4_types
         
-        # Process each phase
+        # Process each phase; types within a phase are independent, so their
+        # LLM requests run concurrently
         for phase_num, phase_types in enumerate([phase1_types, phase2_types, phase3_types, phase4_types], 1):
             logger.info(f"Starting generation phase {phase_num} with object types: {phase_types}")
-            phase_objects = {}
             
-            # Generate objects for each type in this phase
-            for obj_type in phase_types:
-                if obj_type in object_counts and object_counts[obj_type] > 0:
-                    # Get special instructions for this object type if available
-                    obj_instructions = special_instructions.get(obj_type, None)
-                    if obj_instructions:
-                        logger.info(f"Using special instructions for {obj_type}: {obj_instructions}")
-                    
-                    # Generate objects
-                    objects = await self.generate_stix_objects(obj_type, object_counts[obj_type], obj_instructions)
-                    
-                    # Process generated objects to ensure valid IDs
-                    processed_objects = []
-                    for obj in objects:
-                        # Ensure ID is a valid UUID format
-                        if 'id' in obj:
-                            # Check if ID is in the correct format
-                            if not re.match(r'^[a-z0-9-]+--[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', obj['id']):
-                                # Replace with a properly formatted ID
-                                obj['id'] = f"{obj_type}--{str(uuid.uuid4())}"
-                        else:
-                            obj['id'] = f"{obj_type}--{str(uuid.uuid4())}"
-                        
-                        # Add to processed objects
-                        processed_objects.append(obj)
-                    
-                    # Add to phase objects
-                    phase_objects[obj_type] = processed_objects
-                    
-                    # Add to result
-                    result[obj_type] = processed_objects
-                    
-                    logger.info(f"Generated {len(processed_objects)} {obj_type} objects in phase {phase_num}")
+            requested_types = [obj_type for obj_type in phase_types
+                               if obj_type in object_counts and object_counts[obj_type] > 0]
+            phase_results = await self._generate_types(requested_types, object_counts, special_instructions)
             
-            # Add all objects from this phase to context before moving to next phase
-            for obj_list in phase_objects.values():
-                self.context.extend(obj_list)
+            for obj_type, processed_objects in zip(requested_types, phase_results):
+                # Add to result
+                result[obj_type] = processed_objects
+                
+                logger.info(f"Generated {len(processed_objects)} {obj_type} objects in phase {phase_num}")
             
             logger.info(f"Completed generation phase {phase_num}")
         
         # Process any remaining object types not covered in the phases
         remaining_types = [obj_type for obj_type in object_counts.keys() 
-                          if obj_type not in all_stix_types]
+                          if obj_type not in all_stix_types and object_counts[obj_type] > 0]
         
         if remaining_types:
             logger.info(f"Processing remaining object types: {remaining_types}")
             
-            for obj_type in remaining_types:
-                if object_counts[obj_type] > 0:
-                    # Get special instructions for this object type if available
-                    obj_instructions = special_instructions.get(obj_type, None)
-                    if obj_instructions:
-                        logger.info(f"Using special instructions for {obj_type}: {obj_instructions}")
-                    
-                    # Generate objects
-                    objects = await self.generate_stix_objects(obj_type, object_counts[obj_type], obj_instructions)
-                    
-                    # Process generated objects to ensure valid IDs
-                    processed_objects = []
-                    for obj in objects:
-                        # Ensure ID is a valid UUID format
-                        if 'id' in obj:
-                            # Check if ID is in the correct format
-                            if not re.match(r'^[a-z0-9-]+--[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', obj['id']):
-                                # Replace with a properly formatted ID
-                                obj['id'] = f"{obj_type}--{str(uuid.uuid4())}"
-                        else:
-                            obj['id'] = f"{obj_type}--{str(uuid.uuid4())}"
-                        
-                        # Add to processed objects
-                        processed_objects.append(obj)
-                    
-                    # Add to result
-                    result[obj_type] = processed_objects
-                    
-                    # Add to context
-                    self.context.extend(processed_objects)
-                    
-                    logger.info(f"Generated {len(processed_objects)} {obj_type} objects (custom type)")
+            remaining_results = await self._generate_types(remaining_types, object_counts, special_instructions)
+            
+            for obj_type, processed_objects in zip(remaining_types, remaining_results):
+                # Add to result
+                result[obj_type] = processed_objects
+                
+                logger.info(f"Generated {len(processed_objects)} {obj_type} objects (custom type)")
+        
+        # Cyber-observables referenced by synthesized observed-data
+        for sco_type, observables in self.observables.items():
+            result.setdefault(sco_type, []).extend(
+                obj for obj in observables if obj not in result.get(sco_type, ())
+            )
         
+        if self.repair_counts:
+            logger.info(f"Normalization repairs by field: {dict(self.repair_counts)}")
         logger.info(f"Dataset generation complete with {sum(len(objs) for objs in result.values())} total objects")
         return result
     
-    async def create_stix2_objects(self, all_objects: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    def create_stix2_objects(self, all_objects: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
         """
         Convert all generated objects to STIX2 objects.
         
+        This is CPU-bound work and runs in the calling thread, not on an
+        event loop.
+        
+        In lazy construction mode objects are validated and returned as
+        StixDicts instead; LAZY_VALIDATION_SAMPLE_RATE of them are also
+        validated with stix2.
+        
         Args:
             all_objects: Dictionary mapping object types to lists of objects
             
         Returns:
-            Dictionary mapping object IDs to STIX2 objects
+            Dictionary mapping object IDs to STIX2 objects (or StixDicts)
         """
         logger.info(f"Converting {sum(len(objs) for objs in all_objects.values())} objects to STIX2 format")
         
         # Initialize result dictionary
         result = {}
         
+        if self.construction_mode == "lazy":
+            sample = spawn_rng(self.seed, "validation-sample")
+            convert = lambda obj: self.to_lazy_stix_object(obj, sample.random() < LAZY_VALIDATION_SAMPLE_RATE)
+        else:
+            convert = self.convert_to_stix2_object
+        
         # Define conversion order to ensure proper references
         # Phase 1: Independent objects
         phase1_types = [
@@ -839,7 +941,7 @@ class StixObjectGenerator:
                     
                     # Convert each object
                     for obj in objects:
-                        stix2_obj = self.convert_to_stix2_object(obj)
+                        stix2_obj = convert(obj)
                         if stix2_obj:
                             result[obj['id']] = stix2_obj
                         else:
@@ -859,7 +961,7 @@ class StixObjectGenerator:
                     
                     # Convert each object
                     for obj in objects:
-                        stix2_obj = self.convert_to_stix2_object(obj)
+                        stix2_obj = convert(obj)
                         if stix2_obj:
                             result[obj['id']] = stix2_obj
                         else:
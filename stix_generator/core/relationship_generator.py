@@ -2,221 +2,409 @@
 STIX relationship generator module.
 """
 
-import uuid
 import json
+import bisect
+import asyncio
 import random
-from typing import List, Dict, Any, Optional, Union
+from array import array
+from typing import List, Dict, Any, Optional, Union, Tuple, Iterator, Iterable
 
 from stix2 import Relationship
 
 from ..config import (
     OPENAI_API_KEY, LLM_MODEL, LLM_RELATIONSHIP_TEMPERATURE, 
-    RELATIONSHIP_MAP
+    RELATIONSHIP_MAP, RELATIONSHIP_CHUNK_SIZE, RELATIONSHIP_MAX_CHUNKS,
+    MAX_CONCURRENT_REQUESTS, RELATIONSHIP_DEGREE_DISTRIBUTION, RELATIONSHIP_MAX_OUT_DEGREE,
+    RELATIONSHIP_POWER_LAW_EXPONENT, RELATIONSHIP_MAX_IN_DEGREE, RELATIONSHIP_TYPE_MAX_IN_DEGREE,
+    RELATIONSHIP_ENSURE_CONNECTED, STIX2_CONSTRUCTION
 )
 from ..utils.logging_utils import relationship_generator_logger as logger
 from ..llm.client import get_llm_client
 from ..llm.prompts import get_relationship_generation_prompt_template, get_relationship_output_parser
+from .validator import RelationshipValidator
+from .graph import RelationshipGraph, get_description_templates
+from .lazy import StixDict
+from ..utils.ids import TimestampProvider, get_reference_time, relationship_stix_id
+from ..utils.rng import spawn_rng
+from ..utils.event_loop import run_in_worker
+from ..utils.serialization import to_dict
 
-class RelationshipGenerator:
-    """STIX relationship generator class."""
+class CandidateSpace:
+    """
+    Virtual list of the (target_obj, rel_type) candidates for one source type.
+
+    Candidates are ordered as if enumerated target type by target type, target
+    object by target object, relationship type by relationship type, but they
+    are never materialized: sampling draws indices and maps them back to pairs.
+    """
     
-    def __init__(self, api_key: str = OPENAI_API_KEY, seed: int = 42):
+    def __init__(self, target_types: Dict[str, List[str]], objects_by_type: Dict[str, List[Dict[str, Any]]]):
         """
-        Initialize the relationship generator.
+        Initialize the candidate space.
         
         Args:
-            api_key: OpenAI API key
-            seed: Random seed for reproducibility
+            target_types: Mapping of allowed target types to relationship types
+            objects_by_type: Objects grouped by type
         """
-        self.api_key = api_key
-        self.seed = seed
-        random.seed(seed)
+        self._segments = []
+        self._offsets = []
+        total = 0
+        for target_type, rel_types in target_types.items():
+            targets = objects_by_type.get(target_type)
+            if not targets or not rel_types:
+                continue
+            self._offsets.append(total)
+            self._segments.append((targets, rel_types))
+            total += len(targets) * len(rel_types)
+        self._total = total
+    
+    def __len__(self) -> int:
+        return self._total
+    
+    def __getitem__(self, index: int) -> Tuple[Dict[str, Any], str]:
+        segment = bisect.bisect_right(self._offsets, index) - 1
+        targets, rel_types = self._segments[segment]
+        target_index, rel_index = divmod(index - self._offsets[segment], len(rel_types))
+        return targets[target_index], rel_types[rel_index]
     
-    def _validate_relationship(
-        self, relationship: Dict[str, Any], stix_objects: List[Dict[str, Any]]
-    ) -> bool:
+    def sample(self, count: int, rng: Any = random) -> List[Tuple[Dict[str, Any], str]]:
         """
-        Validate a relationship.
+        Draw distinct candidates uniformly at random.
+        
+        Draws the same indices rng.sample would on the materialized list, so
+        results for a given seed are unchanged.
         
         Args:
-            relationship: Relationship to validate
-            stix_objects: List of STIX objects
+            count: Number of candidates to draw
+            rng: Random number generator to draw from
             
         Returns:
-            True if the relationship is valid, False otherwise
+            List of (target_obj, rel_type) pairs
         """
-        try:
-            source_ref = relationship.get('source_ref', '')
-            target_ref = relationship.get('target_ref', '')
-            
-            if not source_ref or not target_ref:
-                return False
-                
-            # Extract types from references
-            source_type = source_ref.split('--')[0]
-            target_type = target_ref.split('--')[0]
-            relationship_type = relationship.get('relationship_type', '')
-            
-            # Check if relationship type is valid for these object types
-            if source_type not in RELATIONSHIP_MAP:
-                return False
-            if target_type not in RELATIONSHIP_MAP.get(source_type, {}):
-                return False
-            if relationship_type not in RELATIONSHIP_MAP.get(source_type, {}).get(target_type, []):
-                return False
-            
-            # Check if referenced objects exist
-            object_ids = {obj['id'] for obj in stix_objects}
-            if source_ref not in object_ids:
-                return False
-            if target_ref not in object_ids:
-                return False
-            
-            return True
-        except Exception as e:
-            logger.error(f"Error validating relationship: {str(e)}")
-            return False
+        return [self[index] for index in rng.sample(range(self._total), count)]
+
+class RelationshipGraphBuilder:
+    """
+    Builds the rules-based relationship graph.
     
-    def _generate_relationship_description(
-        self, source_obj: Dict[str, Any], target_obj: Dict[str, Any], relationship_type: str
-    ) -> str:
+    Out-degrees follow a configurable distribution, target in-degrees can be
+    capped per type, and a final pass bridges disconnected components wherever
+    RELATIONSHIP_MAP allows an edge between them. Degrees and component links
+    are kept in integer arrays indexed by object position, so building the
+    graph is linear in the number of objects and edges.
+    """
+    
+    def __init__(
+        self,
+        stix_objects: List[Dict[str, Any]],
+        distribution: str = RELATIONSHIP_DEGREE_DISTRIBUTION,
+        max_out_degree: int = RELATIONSHIP_MAX_OUT_DEGREE,
+        exponent: float = RELATIONSHIP_POWER_LAW_EXPONENT,
+        max_in_degree: int = RELATIONSHIP_MAX_IN_DEGREE,
+        type_max_in_degree: Optional[Dict[str, int]] = None,
+        ensure_connected: bool = RELATIONSHIP_ENSURE_CONNECTED,
+        rng: Any = random
+    ):
         """
-        Generate a meaningful description for a relationship.
+        Initialize the graph builder.
         
         Args:
-            source_obj: Source object
-            target_obj: Target object
-            relationship_type: Type of relationship
+            stix_objects: List of STIX objects
+            distribution: Out-degree distribution, "uniform" or "power-law"
+            max_out_degree: Largest out-degree drawn for a source object
+            exponent: Exponent of the power-law distribution
+            max_in_degree: Default cap on relationships targeting one object (0 for none)
+            type_max_in_degree: Per-type in-degree caps overriding max_in_degree
+            ensure_connected: Whether to bridge disconnected components
+            rng: Random number generator to draw from
+        """
+        if distribution not in ("uniform", "power-law"):
+            raise ValueError(f"Unknown degree distribution: {distribution}")
+        
+        self.stix_objects = stix_objects
+        self.distribution = distribution
+        self.max_out_degree = max_out_degree
+        self.exponent = exponent
+        self.ensure_connected = ensure_connected
+        self.rng = rng
+        
+        self._index = {obj['id']: i for i, obj in enumerate(stix_objects)}
+        self._objects_by_type = {}
+        for obj in stix_objects:
+            self._objects_by_type.setdefault(obj['type'], []).append(obj)
+        
+        type_caps = RELATIONSHIP_TYPE_MAX_IN_DEGREE if type_max_in_degree is None else type_max_in_degree
+        self._in_cap = array('l', (type_caps.get(obj['type'], max_in_degree) for obj in stix_objects))
+        self._capped = any(self._in_cap)
+        self._in_degree = array('l', bytes(array('l').itemsize * len(stix_objects)))
+        self._parent = array('l', range(len(stix_objects)))
+        self._candidate_spaces = {}
+        self._power_law_cdf = {}
+    
+    def _candidates(self, source_type: str) -> CandidateSpace:
+        """Get the (cached) candidate space for a source type."""
+        if source_type not in self._candidate_spaces:
+            self._candidate_spaces[source_type] = CandidateSpace(
+                RELATIONSHIP_MAP.get(source_type, {}), self._objects_by_type
+            )
+        return self._candidate_spaces[source_type]
+    
+    def _find(self, i: int) -> int:
+        """Find the component root of an object index (with path halving)."""
+        parent = self._parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    def _has_capacity(self, target_obj: Dict[str, Any]) -> bool:
+        """Check whether an object can take another incoming relationship."""
+        i = self._index[target_obj['id']]
+        return not self._in_cap[i] or self._in_degree[i] < self._in_cap[i]
+    
+    def _add_edge(self, source_obj: Dict[str, Any], target_obj: Dict[str, Any]) -> None:
+        """Record an edge in the degree and component arrays."""
+        source, target = self._index[source_obj['id']], self._index[target_obj['id']]
+        self._in_degree[target] += 1
+        source_root, target_root = self._find(source), self._find(target)
+        if source_root != target_root:
+            self._parent[source_root] = target_root
+    
+    def sample_out_degree(self, min_degree: int) -> int:
+        """
+        Draw an out-degree for a source object.
+        
+        Args:
+            min_degree: Smallest allowed out-degree
             
         Returns:
-            Description of the relationship
-        """
-        templates = {
-            "uses": [
-                "{source_name} utilizes {target_name} in their operations",
-                "{source_name} has been observed using {target_name}",
-                "{source_name} leverages {target_name} for their activities"
-            ],
-            "targets": [
-                "{source_name} specifically targets {target_name}",
-                "{source_name} has been known to target {target_name}",
-                "{source_name} focuses attacks on {target_name}"
-            ],
-            "indicates": [
-                "{source_name} provides evidence of {target_name}",
-                "{source_name} has been associated with {target_name}",
-                "{source_name} suggests the presence of {target_name}"
-            ],
-            "mitigates": [
-                "{source_name} helps prevent {target_name}",
-                "{source_name} is effective against {target_name}",
-                "{source_name} can be used to counter {target_name}"
-            ],
-            "attributed-to": [
-                "{source_name} is attributed to {target_name}",
-                "{source_name} is believed to be operated by {target_name}",
-                "{source_name} is connected to {target_name}"
-            ],
-            "exploits": [
-                "{source_name} exploits {target_name} to gain unauthorized access",
-                "{source_name} takes advantage of {target_name}",
-                "{source_name} leverages {target_name} as an attack vector"
-            ]
-        }
-        
-        template_list = templates.get(relationship_type, ["{source_name} {relationship_type} {target_name}"])
-        template = random.choice(template_list)
-        
-        return template.format(
-            source_name=source_obj.get('name', source_obj['type']),
-            target_name=target_obj.get('name', target_obj['type']),
-            relationship_type=relationship_type
-        )
+            Out-degree
+        """
+        max_degree = max(min_degree, self.max_out_degree)
+        if self.distribution == "uniform":
+            return self.rng.randint(min_degree, max_degree)
+        
+        # Discrete power law P(k) ~ k^-exponent on [min_degree, max_degree]
+        key = (min_degree, max_degree)
+        if key not in self._power_law_cdf:
+            weights = [max(k, 1) ** -self.exponent for k in range(min_degree, max_degree + 1)]
+            total = sum(weights)
+            cdf, running = [], 0.0
+            for weight in weights:
+                running += weight / total
+                cdf.append(running)
+            self._power_law_cdf[key] = cdf
+        cdf = self._power_law_cdf[key]
+        return min_degree + min(bisect.bisect_left(cdf, self.rng.random()), len(cdf) - 1)
     
-    def _generate_rules_based_relationships(
-        self, stix_objects: List[Dict[str, Any]], min_relationships_per_object: int = 1
-    ) -> List[Dict[str, Any]]:
+    def _sample_targets(self, candidates: CandidateSpace, count: int) -> List[Tuple[Dict[str, Any], str]]:
         """
-        Generate relationships based on predefined rules.
+        Draw up to count distinct candidates whose targets still have capacity.
         
         Args:
-            stix_objects: List of STIX objects
-            min_relationships_per_object: Minimum number of relationships per object
+            candidates: Candidate space of the source type
+            count: Number of candidates wanted
             
         Returns:
-            List of generated relationships
+            List of (target_obj, rel_type) pairs
         """
-        # Group objects by type for efficient access
-        objects_by_type = {}
-        for obj in stix_objects:
-            obj_type = obj['type']
-            if obj_type not in objects_by_type:
-                objects_by_type[obj_type] = []
-            objects_by_type[obj_type].append(obj)
+        if not self._capped:
+            return candidates.sample(count, self.rng)
+        
+        # Rejection sampling against the in-degree caps, with a bounded number of draws
+        selected, seen = [], set()
+        for _ in range(count * 4):
+            index = self.rng.randrange(len(candidates))
+            if index in seen:
+                continue
+            seen.add(index)
+            target_obj, rel_type = candidates[index]
+            if self._has_capacity(target_obj):
+                selected.append((target_obj, rel_type))
+                if len(selected) == count:
+                    break
+        return selected
+    
+    def build(self, min_relationships_per_object: int = 1) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any], str]]:
+        """
+        Generate the graph's edges.
         
-        relationships = []
+        Edges are yielded source by source as they are drawn, followed by any
+        bridging edges, so callers can consume them in a single pass.
         
-        # Try to create at least one relationship for each object
-        for source_obj in stix_objects:
-            source_type = source_obj['type']
+        Args:
+            min_relationships_per_object: Minimum number of relationships per object
             
+        Yields:
+            (source_obj, target_obj, rel_type) triples
+        """
+        for source_obj in self.stix_objects:
             # Skip relationship objects
-            if source_type == 'relationship':
+            if source_obj['type'] == 'relationship':
                 continue
-                
-            # Get allowed target types for this source type
-            target_types = RELATIONSHIP_MAP.get(source_type, {})
-            if not target_types:
+            
+            candidates = self._candidates(source_obj['type'])
+            if not len(candidates):
                 continue
             
-            potential_relationships = []
+            # Decide how many relationships to create
+            num_relationships = min(self.sample_out_degree(min_relationships_per_object), len(candidates))
             
-            # Find all potential relationships
-            for target_type, rel_types in target_types.items():
-                if target_type not in objects_by_type:
-                    continue
-                    
-                for target_obj in objects_by_type[target_type]:
-                    for rel_type in rel_types:
-                        potential_relationships.append((target_obj, rel_type))
+            for target_obj, rel_type in self._sample_targets(candidates, num_relationships):
+                self._add_edge(source_obj, target_obj)
+                yield source_obj, target_obj, rel_type
+        
+        if self.ensure_connected:
+            yield from self._bridge_components()
+    
+    def _bridge_components(self) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any], str]]:
+        """
+        Connect every component to the largest one where the relationship map allows.
+        
+        Objects whose type has no allowed relationship with any type in the
+        main component stay disconnected.
+        
+        Yields:
+            (source_obj, target_obj, rel_type) bridging triples
+        """
+        components = {}
+        for i, obj in enumerate(self.stix_objects):
+            if obj['type'] != 'relationship':
+                components.setdefault(self._find(i), []).append(i)
+        if len(components) < 2:
+            return
+        
+        main_root = max(components, key=lambda root: len(components[root]))
+        main_by_type = {}
+        for i in components.pop(main_root):
+            main_by_type.setdefault(self.stix_objects[i]['type'], []).append(self.stix_objects[i])
+        
+        bridged = 0
+        for members in components.values():
+            bridge = self._find_bridge(members, main_by_type)
+            if not bridge:
+                continue
+            source_obj, target_obj, rel_type = bridge
+            self._add_edge(source_obj, target_obj)
+            bridged += 1
+            yield bridge
             
-            # If there are potential relationships, create at least one
-            if potential_relationships:
-                # Decide how many relationships to create
-                num_relationships = min(
-                    random.randint(min_relationships_per_object, 3),
-                    len(potential_relationships)
-                )
-                
-                selected_relationships = random.sample(potential_relationships, num_relationships)
-                
-                for target_obj, rel_type in selected_relationships:
-                    relationship = {
-                        "type": "relationship",
-                        "spec_version": "2.1",
-                        "id": f"relationship--{uuid.uuid4()}",
-                        "source_ref": source_obj['id'],
-                        "target_ref": target_obj['id'],
-                        "relationship_type": rel_type,
-                        "description": self._generate_relationship_description(
-                            source_obj, target_obj, rel_type
-                        )
-                    }
-                    
-                    if self._validate_relationship(relationship, stix_objects):
-                        relationships.append(relationship)
+            # The component now belongs to the main one
+            for i in members:
+                obj = self.stix_objects[i]
+                main_by_type.setdefault(obj['type'], []).append(obj)
+        
+        if bridged:
+            logger.info(f"Added {bridged} relationships to connect the graph")
+    
+    def _find_bridge(
+        self, members: List[int], main_by_type: Dict[str, List[Dict[str, Any]]]
+    ) -> Optional[Tuple[Dict[str, Any], Dict[str, Any], str]]:
+        """Find an allowed edge between a component and the main component, in either direction."""
+        for i in members:
+            obj = self.stix_objects[i]
+            
+            # Component member as source
+            for target_type, rel_types in RELATIONSHIP_MAP.get(obj['type'], {}).items():
+                targets = main_by_type.get(target_type)
+                if targets:
+                    target_obj = self.rng.choice(targets)
+                    if self._has_capacity(target_obj):
+                        return obj, target_obj, self.rng.choice(rel_types)
+            
+            # Component member as target
+            if not self._has_capacity(obj):
+                continue
+            for source_type, source_objs in main_by_type.items():
+                rel_types = RELATIONSHIP_MAP.get(source_type, {}).get(obj['type'])
+                if rel_types:
+                    return self.rng.choice(source_objs), obj, self.rng.choice(rel_types)
+        return None
+
+class RelationshipGenerator:
+    """STIX relationship generator class."""
+    
+    def __init__(self, api_key: str = OPENAI_API_KEY, seed: int = 42, construction_mode: str = STIX2_CONSTRUCTION):
+        """
+        Initialize the relationship generator.
+        
+        Args:
+            api_key: OpenAI API key
+            seed: Random seed for reproducibility
+            construction_mode: "eager" (stix2 Relationship objects) or "lazy" (StixDicts)
+        """
+        if construction_mode not in ("eager", "lazy"):
+            raise ValueError(f"Unknown construction mode: {construction_mode}")
+        
+        self.api_key = api_key
+        self.seed = seed
+        self.construction_mode = construction_mode
+        
+        # Timestamps of relationships built without stix2 (lazy construction)
+        self.timestamps = TimestampProvider(get_reference_time())
+    
+    def _choose_description_template(self, relationship_type: str, rng: Any = random) -> int:
+        """
+        Choose a description template for a relationship.
+        
+        The description itself is rendered from the source and target names
+        when the graph is exported.
         
-        return relationships
+        Args:
+            relationship_type: Type of relationship
+            rng: Random number generator to draw from
+            
+        Returns:
+            Index into the relationship type's description templates
+        """
+        return rng.randrange(len(get_description_templates(relationship_type)))
+    
+    def _generate_rules_based_relationships(
+        self,
+        stix_objects: List[Dict[str, Any]],
+        min_relationships_per_object: int = 1,
+        validator: Optional[RelationshipValidator] = None,
+        graph: Optional[RelationshipGraph] = None
+    ) -> RelationshipGraph:
+        """
+        Generate relationships based on predefined rules.
+        
+        Args:
+            stix_objects: List of STIX objects
+            min_relationships_per_object: Minimum number of relationships per object
+            validator: Validator for the objects (built from stix_objects if omitted)
+            graph: Graph to add the relationships to (created if omitted)
+            
+        Returns:
+            Graph holding the generated relationships
+        """
+        if validator is None:
+            validator = RelationshipValidator(stix_objects)
+        if graph is None:
+            graph = RelationshipGraph()
+            graph.add_objects(stix_objects)
+        
+        # A fresh stream per call, so the graph depends only on the seed and the objects
+        rng = spawn_rng(self.seed, "rules-based-relationships")
+        builder = RelationshipGraphBuilder(stix_objects, rng=rng)
+        
+        # Edges arrive source by source, then any edges bridging disconnected components
+        for source_obj, target_obj, rel_type in builder.build(min_relationships_per_object):
+            template = self._choose_description_template(rel_type, rng)
+            if validator.is_valid_edge(source_obj['id'], target_obj['id'], rel_type):
+                graph.add_edge(source_obj['id'], target_obj['id'], rel_type, template=template)
+        
+        return graph
     
     def _generate_threat_scenario(
-        self, objects: List[Dict[str, Any]], relationships: List[Dict[str, Any]]
+        self, objects: List[Dict[str, Any]], graph: RelationshipGraph
     ) -> str:
         """
         Generate a comprehensive threat scenario narrative.
         
         Args:
             objects: List of STIX objects
-            relationships: List of relationships
+            graph: Generated relationships
             
         Returns:
             Narrative describing the threat scenario
@@ -286,13 +474,13 @@ class RelationshipGenerator:
         return scenario
     
     def _evaluate_relationships(
-        self, relationships: List[Dict[str, Any]], objects: List[Dict[str, Any]]
+        self, graph: RelationshipGraph, objects: List[Dict[str, Any]]
     ) -> str:
         """
         Evaluate the quality and consistency of generated relationships.
         
         Args:
-            relationships: List of relationships
+            graph: Generated relationships
             objects: List of STIX objects
             
         Returns:
@@ -300,7 +488,7 @@ class RelationshipGenerator:
         """
         from collections import Counter
         
-        if not relationships:
+        if not len(graph):
             return "No relationships were generated."
         
         # Count objects by type (excluding relationships)
@@ -309,11 +497,11 @@ class RelationshipGenerator:
         )
         
         # Count relationship types
-        relationship_types = Counter(r['relationship_type'] for r in relationships)
+        relationship_types = Counter(graph.relationship_type_counts())
         
         # Check relationship distribution
         non_relationship_count = sum(object_types.values())
-        relationship_count = len(relationships)
+        relationship_count = len(graph)
         
         relationship_ratio = relationship_count / non_relationship_count if non_relationship_count > 0 else 0
         
@@ -342,114 +530,227 @@ class RelationshipGenerator:
         
         return " ".join(evaluation_points)
     
+    def _partition_objects(
+        self, stix_objects: List[Dict[str, Any]], chunk_size: int = RELATIONSHIP_CHUNK_SIZE
+    ) -> List[Tuple[List[Dict[str, Any]], Dict[str, Dict[str, List[str]]]]]:
+        """
+        Split objects into chunks for chunked LLM prompts.
+        
+        Every object goes into exactly one chunk, so the number of prompts
+        grows with len(stix_objects) / chunk_size. The objects of each type are
+        spread evenly over the chunks, so every chunk holds a mix of types in
+        the proportions of the whole set and gets the part of RELATIONSHIP_MAP
+        that applies to the types it holds.
+        
+        Args:
+            stix_objects: List of STIX objects
+            chunk_size: Maximum number of objects per chunk
+            
+        Returns:
+            List of (objects, relationship_map) chunks
+        """
+        # Small sets still go out as a single prompt with the full map
+        if len(stix_objects) <= chunk_size:
+            return [(stix_objects, RELATIONSHIP_MAP)]
+        
+        objects_by_type = {}
+        for obj in stix_objects:
+            objects_by_type.setdefault(obj['type'], []).append(obj)
+        
+        # Interleave the types by each object's relative position within its type
+        interleaved = sorted(
+            (
+                ((i + 0.5) / len(objects), type_index, obj)
+                for type_index, objects in enumerate(objects_by_type.values())
+                for i, obj in enumerate(objects)
+            ),
+            key=lambda item: item[:2]
+        )
+        ordered = [obj for _, _, obj in interleaved]
+        
+        chunks = []
+        for start in range(0, len(ordered), chunk_size):
+            chunk = ordered[start:start + chunk_size]
+            present = {obj['type'] for obj in chunk}
+            relationship_map = {}
+            for source_type in present:
+                target_types = {
+                    target_type: rel_types
+                    for target_type, rel_types in RELATIONSHIP_MAP.get(source_type, {}).items()
+                    if target_type in present
+                }
+                if target_types:
+                    relationship_map[source_type] = target_types
+            if relationship_map:
+                chunks.append((chunk, relationship_map))
+        
+        return chunks
+    
+    async def _generate_llm_relationships(
+        self, object_dicts: List[Dict[str, Any]], validator: RelationshipValidator, graph: RelationshipGraph
+    ) -> Tuple[int, List[str], List[str]]:
+        """
+        Generate relationships with the LLM, one prompt per object chunk.
+        
+        Chunks are sent concurrently, bounded by MAX_CONCURRENT_REQUESTS, and
+        their relationships are validated and added to the graph in chunk
+        order; relationships already in the graph are skipped.
+        
+        Args:
+            object_dicts: List of STIX objects
+            validator: Validator for the objects
+            graph: Graph to add the relationships to
+            
+        Returns:
+            Tuple of (number of relationships added, chunk scenarios, evaluations)
+        """
+        # Get LLM client, output parser and prompt template
+        llm = get_llm_client(temperature=LLM_RELATIONSHIP_TEMPERATURE)
+        output_parser = get_relationship_output_parser()
+        prompt_template = get_relationship_generation_prompt_template()
+        
+        # Create chain
+        chain = llm.create_chain(prompt_template, output_parser)
+        format_instructions = output_parser.get_format_instructions()
+        
+        # The semaphore bounds how many chunks are in flight
+        chunks = self._partition_objects(object_dicts)
+        if RELATIONSHIP_MAX_CHUNKS and len(chunks) > RELATIONSHIP_MAX_CHUNKS:
+            skipped = sum(len(chunk) for chunk, _ in chunks[RELATIONSHIP_MAX_CHUNKS:])
+            logger.warning(
+                f"Limiting LLM relationship generation to {RELATIONSHIP_MAX_CHUNKS} of {len(chunks)} chunks; "
+                f"{skipped} objects get rules-based relationships only"
+            )
+            chunks = chunks[:RELATIONSHIP_MAX_CHUNKS]
+        logger.info(f"Generating LLM relationships in {len(chunks)} chunks")
+        
+        semaphore = asyncio.Semaphore(max(1, MAX_CONCURRENT_REQUESTS))
+        
+        async def run_chunk(chunk_index: int, chunk: List[Dict[str, Any]], relationship_map: Dict[str, Any]) -> Any:
+            # Prepare simplified object representations for LLM
+            simplified_objects = [
+                {
+                    "id": obj['id'],
+                    "type": obj['type'],
+                    "name": obj.get('name', obj['type']),
+                    "description": obj.get('description', 'No description provided')
+                }
+                for obj in chunk
+            ]
+            
+            chain_input = {
+                "stix_objects": json.dumps(simplified_objects, indent=2),
+                "relationship_map": json.dumps(relationship_map, indent=2),
+                "format_instructions": format_instructions
+            }
+            
+            async with semaphore:
+                try:
+                    return await llm.ainvoke_chain(chain, chain_input, seed=self.seed + chunk_index)
+                except Exception as e:
+                    logger.error(f"Error in LLM relationship chunk {chunk_index}: {str(e)}")
+                    return None
+        
+        results = await asyncio.gather(*[
+            run_chunk(i, chunk, relationship_map)
+            for i, (chunk, relationship_map) in enumerate(chunks)
+        ])
+        
+        added = 0
+        scenarios = []
+        evaluations = []
+        for result in results:
+            if not isinstance(result, dict) or 'relationships' not in result:
+                continue
+            
+            for rel in result['relationships']:
+                if validator.is_valid(rel) and graph.add_edge(
+                    rel['source_ref'], rel['target_ref'], rel['relationship_type'],
+                    description=rel.get('description', '')
+                ):
+                    added += 1
+            
+            if result.get('scenario'):
+                scenarios.append(result['scenario'])
+            if result.get('evaluation'):
+                evaluations.append(result['evaluation'])
+        
+        # A chunk's evaluation only covers its own objects, so it is only kept
+        # when a single prompt saw the whole set
+        if len(chunks) > 1:
+            evaluations = []
+        
+        return added, scenarios, evaluations
+    
+    def _build_rules_based_graph(
+        self, stix_objects: List[Any]
+    ) -> Tuple[List[Dict[str, Any]], RelationshipValidator, RelationshipGraph]:
+        """
+        Build the graph of rules-based relationships.
+        
+        Args:
+            stix_objects: List of STIX objects
+            
+        Returns:
+            Tuple of (objects as dictionaries, validator, graph)
+        """
+        # Convert objects to dictionaries for consistent handling
+        object_dicts = [to_dict(obj) for obj in stix_objects]
+        
+        # Build the validator once for the whole run
+        validator = RelationshipValidator(object_dicts)
+        
+        # Generate rules-based relationships into a compact graph
+        graph = RelationshipGraph()
+        graph.add_objects(object_dicts)
+        self._generate_rules_based_relationships(object_dicts, validator=validator, graph=graph)
+        return object_dicts, validator, graph
+    
     async def generate_relationships(self, stix_objects: List[Any]) -> Dict[str, Any]:
         """
         Generate relationships between STIX objects.
         
+        Only the LLM requests run on the event loop; the rules-based graph,
+        scenario and evaluation are built in a worker thread.
+        
         Args:
             stix_objects: List of STIX objects
             
         Returns:
-            Dictionary containing relationships, scenario, and evaluation
+            Dictionary containing the relationships (as a RelationshipGraph;
+            dictionaries are built from it at bundle time), scenario, and evaluation
         """
         try:
-            # Convert objects to dictionaries for consistent handling
-            object_dicts = []
-            for obj in stix_objects:
-                if hasattr(obj, 'serialize'):
-                    obj_dict = json.loads(obj.serialize())
-                else:
-                    obj_dict = obj
-                object_dicts.append(obj_dict)
-            
-            # Generate rules-based relationships
-            relationships = self._generate_rules_based_relationships(object_dicts)
+            object_dicts, validator, graph = await run_in_worker(self._build_rules_based_graph, stix_objects)
             
             # For larger datasets or more complex scenarios, use LLM-based generation
+            scenario = evaluation = None
             if len(object_dicts) >= 10 and self.api_key:
                 try:
-                    # Get LLM client
-                    llm = get_llm_client(temperature=LLM_RELATIONSHIP_TEMPERATURE)
-                    
-                    # Get output parser
-                    output_parser = get_relationship_output_parser()
-                    
-                    # Get prompt template
-                    prompt_template = get_relationship_generation_prompt_template()
+                    # LLM relationships duplicating existing ones are skipped by the graph
+                    _, scenarios, evaluations = await self._generate_llm_relationships(
+                        object_dicts, validator, graph
+                    )
                     
-                    # Create chain
-                    chain = llm.create_chain(prompt_template, output_parser)
-                    
-                    # Prepare simplified object representations for LLM
-                    simplified_objects = []
-                    for obj in object_dicts:
-                        simplified = {
-                            "id": obj['id'],
-                            "type": obj['type'],
-                            "name": obj.get('name', obj['type']),
-                            "description": obj.get('description', 'No description provided')
-                        }
-                        simplified_objects.append(simplified)
-                    
-                    # Create chain input
-                    chain_input = {
-                        "stix_objects": json.dumps(simplified_objects, indent=2),
-                        "relationship_map": json.dumps(RELATIONSHIP_MAP, indent=2),
-                        "format_instructions": output_parser.get_format_instructions()
-                    }
-                    
-                    # Generate using LLM
-                    result = await llm.ainvoke_chain(chain, chain_input)
-                    
-                    # Extract LLM-generated relationships and merge with rules-based
-                    if result and 'relationships' in result:
-                        llm_relationships = []
-                        for rel in result['relationships']:
-                            relationship = {
-                                "type": "relationship",
-                                "spec_version": "2.1",
-                                "id": f"relationship--{uuid.uuid4()}",
-                                "source_ref": rel['source_ref'],
-                                "target_ref": rel['target_ref'],
-                                "relationship_type": rel['relationship_type'],
-                                "description": rel['description']
-                            }
-                            
-                            if self._validate_relationship(relationship, object_dicts):
-                                llm_relationships.append(relationship)
-                        
-                        # Combine relationships, avoiding duplicates
-                        existing_relations = set(
-                            (r['source_ref'], r['target_ref'], r['relationship_type'])
-                            for r in relationships
-                        )
-                        
-                        for rel in llm_relationships:
-                            relation_key = (rel['source_ref'], rel['target_ref'], rel['relationship_type'])
-                            if relation_key not in existing_relations:
-                                relationships.append(rel)
-                                existing_relations.add(relation_key)
-                        
-                        # Use LLM-generated scenario if provided
-                        scenario = result.get('scenario')
-                        evaluation = result.get('evaluation')
-                    else:
-                        scenario = self._generate_threat_scenario(object_dicts, relationships)
-                        evaluation = self._evaluate_relationships(relationships, object_dicts)
+                    # Use LLM-generated scenario and evaluation if provided
+                    if scenarios:
+                        scenario = " ".join(scenarios)
+                    if evaluations:
+                        evaluation = evaluations[0]
                         
                 except Exception as e:
                     logger.error(f"Error in LLM relationship generation: {str(e)}")
-                    scenario = self._generate_threat_scenario(object_dicts, relationships)
-                    evaluation = self._evaluate_relationships(relationships, object_dicts)
-            else:
-                # Generate scenario and evaluation using rule-based methods
-                scenario = self._generate_threat_scenario(object_dicts, relationships)
-                evaluation = self._evaluate_relationships(relationships, object_dicts)
             
-            logger.info(f"Generated {len(relationships)} relationships between {len(object_dicts)} objects")
+            # Generate scenario and evaluation using rule-based methods where the LLM did not
+            if not scenario:
+                scenario = await run_in_worker(self._generate_threat_scenario, object_dicts, graph)
+            if not evaluation:
+                evaluation = await run_in_worker(self._evaluate_relationships, graph, object_dicts)
+            
+            logger.info(f"Generated {len(graph)} relationships between {len(object_dicts)} objects")
             
             return {
-                "relationships": relationships,
+                "graph": graph,
                 "scenario": scenario,
                 "evaluation": evaluation
             }
@@ -457,23 +758,51 @@ class RelationshipGenerator:
         except Exception as e:
             logger.error(f"Error generating relationships: {str(e)}")
             return {
-                "relationships": [],
+                "graph": RelationshipGraph(),
                 "scenario": "Error generating scenario",
                 "evaluation": "Error evaluating relationships"
             }
     
-    def create_stix2_relationships(self, relationships: List[Dict[str, Any]]) -> List[Relationship]:
+    def create_stix2_relationships(self, relationships: Iterable[Dict[str, Any]]) -> List[Any]:
         """
         Convert relationship dictionaries to STIX2 Relationship objects.
         
+        In lazy construction mode StixDicts are returned instead; their
+        properties are built here, in stix2's order, so no stix2 validation
+        is needed and both modes serialize identically.
+        
         Args:
-            relationships: List of relationship dictionaries
+            relationships: Relationship dictionaries (e.g. RelationshipGraph.iter_dicts())
             
         Returns:
-            List of STIX2 Relationship objects
+            List of STIX2 Relationship objects (or StixDicts)
         """
         stix2_relationships = []
         
+        # Both modes take their timestamps from the provider, so a fixed
+        # reference time gives the same relationships on every run
+        now = self.timestamps.now()
+        if self.construction_mode == "lazy":
+            for rel in relationships:
+                if not (isinstance(rel.get('source_ref'), str) and '--' in rel['source_ref']):
+                    continue
+                if not (isinstance(rel.get('target_ref'), str) and '--' in rel['target_ref']):
+                    continue
+                if not rel.get('relationship_type'):
+                    continue
+                stix2_relationships.append(StixDict(
+                    type='relationship',
+                    spec_version='2.1',
+                    id=rel.get('id') or relationship_stix_id(rel['source_ref'], rel['relationship_type'], rel['target_ref']),
+                    created=now,
+                    modified=now,
+                    relationship_type=rel['relationship_type'],
+                    description=rel.get('description', ''),
+                    source_ref=rel['source_ref'],
+                    target_ref=rel['target_ref']
+                ))
+            return stix2_relationships
+        
         for rel in relationships:
             try:
                 # Ensure source_ref and target_ref are valid STIX IDs
@@ -483,7 +812,9 @@ class RelationshipGenerator:
                     continue
                     
                 stix2_rel = Relationship(
-                    id=rel.get('id', f"relationship--{uuid.uuid4()}"),
+                    id=rel.get('id') or relationship_stix_id(rel['source_ref'], rel['relationship_type'], rel['target_ref']),
+                    created=now,
+                    modified=now,
                     relationship_type=rel['relationship_type'],
                     source_ref=rel['source_ref'],
                     target_ref=rel['target_ref'],
@@ -0,0 +1,264 @@
+"""
+Referentially-closed sharding of STIX datasets.
+
+Splits objects and relationships into size-bounded shards such that every
+relationship ships in the same shard as its source and target objects, so
+shards can be ingested independently and in parallel without dangling refs.
+
+Connected components that fit in a shard are packed whole. Larger components
+are cut by walking them breadth-first and filling shards object by object,
+which keeps neighbouring objects together; a relationship goes with the
+later of its endpoints, and the earlier one is copied in if it lives in
+another shard. Everything runs in time linear in the number of objects and
+relationships (plus a sort of the component sizes).
+"""
+
+from collections import deque
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+# Smallest shard that can hold a relationship together with both endpoints
+MIN_SHARD_SIZE = 3
+
+class ShardPlan:
+    """
+    Assignment of objects and relationships to shards, by index.
+
+    shard_objects[i] and shard_relationships[i] list the indexes (into the
+    planned objects and relationships) that make up shard i.
+    """
+
+    def __init__(self, object_count: int, relationship_count: int):
+        """
+        Initialize an empty plan.
+
+        Args:
+            object_count: Number of planned objects
+            relationship_count: Number of planned relationships
+        """
+        self.object_count = object_count
+        self.relationship_count = relationship_count
+        self.shard_objects: List[List[int]] = []
+        self.shard_relationships: List[List[int]] = []
+        self.dangling_relationships = 0
+
+    def new_shard(self) -> int:
+        """Open a new empty shard and return its index."""
+        self.shard_objects.append([])
+        self.shard_relationships.append([])
+        return len(self.shard_objects) - 1
+
+    def __len__(self) -> int:
+        return len(self.shard_objects)
+
+    @property
+    def shipped_objects(self) -> int:
+        """Number of objects across all shards, counting copies."""
+        return sum(len(objects) for objects in self.shard_objects)
+
+    @property
+    def duplicated_objects(self) -> int:
+        """Number of extra object copies needed to close the shards."""
+        return self.shipped_objects - self.object_count
+
+    @property
+    def duplication_overhead(self) -> float:
+        """Extra object copies as a fraction of the distinct objects."""
+        return self.duplicated_objects / self.object_count if self.object_count else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Summarize the plan.
+
+        Returns:
+            Dictionary with shard count, sizes and duplication overhead
+        """
+        sizes = [
+            len(objects) + len(relationships)
+            for objects, relationships in zip(self.shard_objects, self.shard_relationships)
+        ]
+        return {
+            "shard_count": len(self),
+            "largest_shard": max(sizes, default=0),
+            "objects": self.object_count,
+            "relationships": self.relationship_count,
+            "duplicated_objects": self.duplicated_objects,
+            "duplication_overhead": round(self.duplication_overhead, 4),
+            "dangling_relationships": self.dangling_relationships
+        }
+
+def plan_shards(
+    object_ids: List[str],
+    relationship_refs: Iterable[Tuple[Optional[str], Optional[str]]],
+    max_shard_size: int
+) -> ShardPlan:
+    """
+    Partition objects and relationships into referentially-closed shards.
+
+    Shard size counts objects (including copies) plus relationships. A
+    relationship whose source or target is not among the objects cannot be
+    closed; it is still shipped (with whichever endpoint exists) and counted
+    as dangling.
+
+    Args:
+        object_ids: IDs of the objects, in dataset order
+        relationship_refs: (source_ref, target_ref) of each relationship, in dataset order
+        max_shard_size: Maximum objects plus relationships per shard
+
+    Returns:
+        ShardPlan
+    """
+    if max_shard_size < MIN_SHARD_SIZE:
+        raise ValueError(f"Shards must hold at least {MIN_SHARD_SIZE} items, got {max_shard_size}")
+
+    index = {obj_id: i for i, obj_id in enumerate(object_ids)}
+    endpoints = [(index.get(source_ref), index.get(target_ref)) for source_ref, target_ref in relationship_refs]
+    plan = ShardPlan(len(object_ids), len(endpoints))
+
+    # Weakly connected components by union-find
+    parent = list(range(len(object_ids)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    adjacency: List[List[int]] = [[] for _ in object_ids]
+    component_edges: Dict[int, List[int]] = {}
+    for edge, (source, target) in enumerate(endpoints):
+        if source is None or target is None:
+            plan.dangling_relationships += 1
+            continue
+        adjacency[source].append(edge)
+        adjacency[target].append(edge)
+        source_root, target_root = find(source), find(target)
+        if source_root != target_root:
+            parent[source_root] = target_root
+
+    members: Dict[int, List[int]] = {}
+    for i in range(len(object_ids)):
+        members.setdefault(find(i), []).append(i)
+    for edge, (source, target) in enumerate(endpoints):
+        if source is not None and target is not None:
+            component_edges.setdefault(find(source), []).append(edge)
+
+    # Pack whole components, largest first, into shards (next-fit)
+    fitting, oversized = [], []
+    for root, nodes in members.items():
+        size = len(nodes) + len(component_edges.get(root, []))
+        (fitting if size <= max_shard_size else oversized).append((size, root))
+    fitting.sort(key=lambda item: item[0], reverse=True)
+
+    shard, shard_size = None, 0
+    for size, root in fitting:
+        if shard is None or shard_size + size > max_shard_size:
+            shard, shard_size = plan.new_shard(), 0
+        plan.shard_objects[shard].extend(members[root])
+        plan.shard_relationships[shard].extend(component_edges.get(root, []))
+        shard_size += size
+
+    # Cut oversized components along a breadth-first walk
+    for _, root in oversized:
+        _cut_component(plan, members[root], adjacency, endpoints, max_shard_size)
+
+    # Relationships with a missing endpoint go wherever their known endpoint is
+    # (or anywhere); they cannot be closed
+    if plan.dangling_relationships:
+        _place_dangling(plan, endpoints, max_shard_size)
+
+    return plan
+
+def _walk(nodes: List[int], adjacency: List[List[int]], endpoints: List[Tuple[Optional[int], Optional[int]]]):
+    """Yield the objects of a component in breadth-first order."""
+    visited = set()
+    for start in nodes:
+        if start in visited:
+            continue
+        visited.add(start)
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            yield node
+            for edge in adjacency[node]:
+                source, target = endpoints[edge]
+                neighbour = target if node == source else source
+                if neighbour not in visited:
+                    visited.add(neighbour)
+                    queue.append(neighbour)
+
+def _cut_component(
+    plan: ShardPlan,
+    nodes: List[int],
+    adjacency: List[List[int]],
+    endpoints: List[Tuple[Optional[int], Optional[int]]],
+    max_shard_size: int
+) -> None:
+    """
+    Split one component into shards along a breadth-first walk.
+
+    Each object is placed in the shard open when the walk reaches it, together
+    with its relationships to objects placed before it; those earlier objects
+    are copied in when they live in another shard.
+    """
+    shard, in_shard, shard_size = plan.new_shard(), set(), 0
+    placed = set()
+
+    def place(obj: int) -> None:
+        nonlocal shard_size
+        if obj not in in_shard:
+            in_shard.add(obj)
+            plan.shard_objects[shard].append(obj)
+            shard_size += 1
+
+    for node in _walk(nodes, adjacency, endpoints):
+        placed.add(node)
+        back_edges = []
+        # Self-loops appear twice in the adjacency list
+        for edge in dict.fromkeys(adjacency[node]):
+            source, target = endpoints[edge]
+            other = target if node == source else source
+            if other in placed:
+                back_edges.append((edge, other))
+
+        # Start a new shard when the object and its edges do not fit in the open one
+        cost = 1 + sum(1 + (other not in in_shard) for _, other in back_edges)
+        if shard_size and shard_size + cost > max_shard_size:
+            shard, in_shard, shard_size = plan.new_shard(), set(), 0
+        place(node)
+
+        for edge, other in back_edges:
+            # Objects with more edges than a shard holds are spread over several shards
+            if shard_size + 1 + (other not in in_shard) > max_shard_size:
+                shard, in_shard, shard_size = plan.new_shard(), set(), 0
+                place(node)
+            place(other)
+            plan.shard_relationships[shard].append(edge)
+            shard_size += 1
+
+def _place_dangling(
+    plan: ShardPlan,
+    endpoints: List[Tuple[Optional[int], Optional[int]]],
+    max_shard_size: int
+) -> None:
+    """Add relationships with unknown endpoints to shards with room, with their known endpoint."""
+    sizes = [
+        len(objects) + len(relationships)
+        for objects, relationships in zip(plan.shard_objects, plan.shard_relationships)
+    ]
+    shard = len(sizes) - 1
+    in_shard = set(plan.shard_objects[shard]) if shard >= 0 else set()
+    for edge, (source, target) in enumerate(endpoints):
+        if source is not None and target is not None:
+            continue
+        known = source if source is not None else target
+        cost = 1 + (known is not None and known not in in_shard)
+        if shard < 0 or sizes[shard] + cost > max_shard_size:
+            shard = plan.new_shard()
+            sizes.append(0)
+            in_shard = set()
+            cost = 1 + (known is not None)
+        if known is not None and known not in in_shard:
+            in_shard.add(known)
+            plan.shard_objects[shard].append(known)
+        plan.shard_relationships[shard].append(edge)
+        sizes[shard] += cost
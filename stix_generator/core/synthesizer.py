@@ -0,0 +1,621 @@
+"""
+Offline STIX object synthesizer.
+
+Builds valid STIX objects locally from the example templates and field
+vocabularies, without any LLM calls. Output is fully determined by the seed,
+so it can be used for reproducible load-test datasets of any size.
+
+References only ever point at objects in the context (or, for observed-data,
+at cyber-observables built alongside it), so synthesized datasets have no
+dangling references.
+"""
+
+import re
+import copy
+import json
+import uuid
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Union
+
+from ..models.stix_templates import get_examples_for_type
+from .context import ContextStore
+from ..utils.ids import IdProvider, TimestampProvider
+from ..utils.rng import derive_seed, spawn_rng
+
+# Timestamps are spread over this window
+SYNTHETIC_EPOCH = datetime(2020, 1, 1)
+SYNTHETIC_WINDOW_SECONDS = 5 * 365 * 24 * 3600
+SYNTHETIC_EPOCH_SECONDS = int((SYNTHETIC_EPOCH - datetime(1970, 1, 1)).total_seconds())
+
+# Name vocabularies
+ADJECTIVES = [
+    "Crimson", "Silent", "Shadow", "Iron", "Frozen", "Golden", "Hidden", "Rapid", "Velvet", "Storm",
+    "Scarlet", "Phantom", "Midnight", "Emerald", "Obsidian", "Cobalt", "Ashen", "Wandering", "Hollow", "Burning"
+]
+NOUNS = [
+    "Panda", "Falcon", "Kitten", "Spider", "Bear", "Viper", "Jackal", "Lynx", "Hydra", "Raven",
+    "Mantis", "Wolf", "Cobra", "Kraken", "Owl", "Scorpion", "Tiger", "Heron", "Badger", "Wasp"
+]
+MALWARE_STEMS = [
+    "Emo", "Trick", "Qak", "Dridex", "Ursn", "Zeus", "Lokib", "Agent", "Remc", "Neth",
+    "Ryuk", "Conti", "Black", "Dark", "Night", "Gh0st", "Plug", "Cobalt", "Sliver", "Hive"
+]
+MALWARE_SUFFIXES = ["tet", "bot", "Loader", "RAT", "Locker", "Stealer", "Dropper", "Kit", "Worm", "X"]
+TOOL_NAMES = [
+    "Mimikatz", "PsExec", "Nmap", "Cobalt Strike", "Rclone", "AdFind", "BloodHound", "Impacket",
+    "Metasploit", "ngrok", "AnyDesk", "PowerSploit", "LaZagne", "Chisel", "Responder"
+]
+TECHNIQUES = [
+    "Spearphishing Attachment", "Credential Dumping", "Process Injection", "Valid Accounts", "Command and Scripting Interpreter",
+    "Scheduled Task", "Exploit Public-Facing Application", "Data Encrypted for Impact", "Remote Services", "Ingress Tool Transfer",
+    "DLL Side-Loading", "Obfuscated Files or Information", "Phishing", "Brute Force", "Exfiltration Over C2 Channel"
+]
+ORGANIZATIONS = [
+    "Northwind Bank", "Contoso Energy", "Fabrikam Health", "Globex Logistics", "Initech Systems",
+    "Umbrella Telecom", "Stark Manufacturing", "Wayne Financial", "Acme Government Services", "Tyrell Research"
+]
+SECTORS = [
+    "financial-services", "energy", "healthcare", "government-national", "technology",
+    "telecommunications", "manufacturing", "education", "transportation", "defense"
+]
+MITIGATIONS = [
+    "Enable Multi-Factor Authentication", "Block Malicious IPs", "Patch Public-Facing Systems", "Restrict Macro Execution",
+    "Segment Critical Networks", "Disable Legacy Protocols", "Harden Remote Access", "Monitor Privileged Accounts"
+]
+LOCATIONS = [
+    ("Bangkok", "TH", "south-eastern-asia", 13.7563, 100.5018),
+    ("Berlin", "DE", "western-europe", 52.52, 13.405),
+    ("Sao Paulo", "BR", "south-america", -23.5505, -46.6333),
+    ("Lagos", "NG", "western-africa", 6.5244, 3.3792),
+    ("Toronto", "CA", "northern-america", 43.6532, -79.3832),
+    ("Seoul", "KR", "eastern-asia", 37.5665, 126.978),
+    ("Sydney", "AU", "australia-new-zealand", -33.8688, 151.2093),
+    ("Warsaw", "PL", "eastern-europe", 52.2297, 21.0122)
+]
+
+# Open vocabularies from the STIX 2.1 specification
+THREAT_ACTOR_TYPES = ["nation-state", "crime-syndicate", "hacker", "insider-disgruntled", "spy", "terrorist", "activist"]
+MALWARE_TYPES = ["trojan", "ransomware", "backdoor", "dropper", "downloader", "keylogger", "remote-access-trojan", "worm", "spyware"]
+TOOL_TYPES = ["remote-access", "credential-exploitation", "network-capture", "vulnerability-scanning", "exploitation", "information-gathering"]
+INDICATOR_TYPES = ["malicious-activity", "anomalous-activity", "attribution", "compromised"]
+INFRASTRUCTURE_TYPES = ["command-and-control", "botnet", "hosting-malware", "phishing", "staging", "exfiltration"]
+REPORT_TYPES = ["threat-actor", "campaign", "attack-pattern", "malware", "indicator", "vulnerability", "threat-report"]
+MOTIVATIONS = ["financial-gain", "espionage", "ideology", "dominance", "organizational-gain", "personal-gain", "revenge"]
+SOPHISTICATION = ["minimal", "intermediate", "advanced", "expert", "innovator", "strategic"]
+RESOURCE_LEVELS = ["individual", "club", "team", "organization", "government"]
+KILL_CHAIN_PHASES = [
+    "reconnaissance", "weaponization", "delivery", "exploitation", "installation", "command-and-control", "actions-on-objectives"
+]
+OPINIONS = ["strongly-disagree", "disagree", "neutral", "agree", "strongly-agree"]
+VARIANT_SUFFIXES = ["v2", "NG", "Lite", "Reloaded", "Mk II", "2.0", "X", "Beta"]
+
+# Fields swapped between seed objects during expansion
+RECOMBINABLE_FIELDS = [
+    "description", "kill_chain_phases", "malware_types", "tool_types", "threat_actor_types", "indicator_types",
+    "infrastructure_types", "report_types", "roles", "goals", "sophistication", "resource_level",
+    "primary_motivation", "secondary_motivations", "capabilities", "sectors", "objective"
+]
+
+# (start, end) field pairs regenerated as fresh time windows during expansion
+TIME_WINDOWS = [("first_seen", "last_seen"), ("valid_from", "valid_until"), ("first_observed", "last_observed")]
+
+IPV4_PATTERN = re.compile(r'\b\d{1,3}(?:\.\d{1,3}){3}\b')
+SHA256_PATTERN = re.compile(r'\b[0-9a-fA-F]{64}\b')
+DOMAIN_PATTERN = re.compile(r"(?<=domain-name:value = ')[^']+")
+CVE_PATTERN = re.compile(r'CVE-\d{4}-\d{4,}')
+GROUPING_CONTEXTS = ["suspicious-activity", "malware-analysis", "unspecified"]
+
+# Meta objects, which object_ref(s) properties may not point at
+META_OBJECT_TYPES = ["language-content", "marking-definition"]
+
+# Types with a required reference, and the types it may point at (None for any
+# type but the meta objects); they are only built when the context holds such
+# an object
+REQUIRED_REFERENCE_TYPES = {
+    "grouping": None,
+    "language-content": None,
+    "note": None,
+    "opinion": None,
+    "report": None,
+    "sighting": ["indicator", "malware", "tool", "attack-pattern"]
+}
+
+# Cyber-observable types built for observed-data objects
+OBSERVABLE_TYPES = ["ipv4-addr", "domain-name", "file"]
+
+# STIX 2.1 namespace for deterministic cyber-observable IDs
+SCO_NAMESPACE = uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7")
+
+class StixObjectSynthesizer:
+    """
+    Seeded, template-driven STIX object builder.
+
+    Each object starts from a copy of the type's example template (if any) and
+    has its identifying and variable fields replaced, so objects keep the
+    shape of the examples while their content varies.
+    """
+
+    def __init__(self, seed: Union[int, str] = 42):
+        """
+        Initialize the synthesizer.
+
+        Args:
+            seed: Random seed; the same seed always yields the same objects
+        """
+        self.seed = seed
+        self.rng = spawn_rng(seed, "synthetic")
+        self.ids = IdProvider(derive_seed(seed, "synthetic-ids"))
+        self.timestamps = TimestampProvider()
+        
+        # Cyber-observables referenced by built observed-data, not yet taken
+        self._observables: List[Dict[str, Any]] = []
+        self._builders: Dict[str, Callable[[Dict[str, Any], ContextStore], None]] = {
+            "attack-pattern": self._build_attack_pattern,
+            "campaign": self._build_campaign,
+            "course-of-action": self._build_course_of_action,
+            "grouping": self._build_grouping,
+            "identity": self._build_identity,
+            "incident": self._build_incident,
+            "indicator": self._build_indicator,
+            "infrastructure": self._build_infrastructure,
+            "intrusion-set": self._build_intrusion_set,
+            "language-content": self._build_language_content,
+            "location": self._build_location,
+            "malware": self._build_malware,
+            "malware-analysis": self._build_malware_analysis,
+            "marking-definition": self._build_marking_definition,
+            "note": self._build_note,
+            "observed-data": self._build_observed_data,
+            "opinion": self._build_opinion,
+            "report": self._build_report,
+            "sighting": self._build_sighting,
+            "threat-actor": self._build_threat_actor,
+            "tool": self._build_tool,
+            "vulnerability": self._build_vulnerability
+        }
+
+    def can_build(self, object_type: str, context: ContextStore) -> bool:
+        """
+        Check whether the context holds the objects a type's required reference needs.
+
+        Args:
+            object_type: STIX object type
+            context: Existing objects that references may point to
+
+        Returns:
+            True if objects of the type can be built without a dangling reference
+        """
+        if object_type not in REQUIRED_REFERENCE_TYPES:
+            return True
+        targets = REQUIRED_REFERENCE_TYPES[object_type]
+        if targets is None:
+            return context.count() > sum(context.count(meta_type) for meta_type in META_OBJECT_TYPES)
+        return any(context.count(target) for target in targets)
+
+    def take_observables(self) -> List[Dict[str, Any]]:
+        """
+        Take the cyber-observables built for observed-data objects since the last call.
+
+        They have to be shipped with the observed-data objects that reference them.
+
+        Returns:
+            List of cyber-observable objects as dictionaries
+        """
+        observables, self._observables = self._observables, []
+        return observables
+
+    def supports(self, object_type: str) -> bool:
+        """
+        Check whether a type can be synthesized.
+
+        Args:
+            object_type: STIX object type
+
+        Returns:
+            True if the type is supported
+        """
+        return object_type in self._builders
+
+    def generate(self, object_type: str, count: int, context: Optional[ContextStore] = None) -> List[Dict[str, Any]]:
+        """
+        Synthesize objects of a type.
+
+        Args:
+            object_type: STIX object type
+            count: Number of objects to build
+            context: Existing objects that references may point to
+
+        Returns:
+            List of STIX objects as dictionaries (empty if the type has a
+            required reference and the context has nothing it could point at)
+        """
+        builder = self._builders.get(object_type)
+        if builder is None:
+            raise ValueError(f"Unsupported STIX object type for synthesis: {object_type}")
+
+        if context is None:
+            context = ContextStore()
+        if not self.can_build(object_type, context):
+            return []
+        examples = get_examples_for_type(object_type)
+
+        objects = []
+        for obj_id in self.ids.stix_ids(object_type, count):
+            obj = copy.deepcopy(self.rng.choice(examples)) if examples else {}
+            obj["type"] = object_type
+            obj["spec_version"] = "2.1"
+            obj["id"] = obj_id
+            created = self._random_seconds()
+            obj["created"] = self._format(created)
+            obj["modified"] = self._format(created + self.rng.randint(0, 90 * 24 * 3600))
+            builder(obj, context)
+            objects.append(obj)
+        return objects
+
+    def expand(
+        self,
+        object_type: str,
+        seeds: List[Dict[str, Any]],
+        count: int,
+        context: Optional[ContextStore] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Build new objects by recombining and mutating a set of seed objects.
+        
+        Each object starts from a copy of a random seed, takes some fields from
+        another seed, and gets a new ID, new timestamps and time windows,
+        varied names and aliases, fresh indicator observables and CVE IDs,
+        and references redrawn from the context.
+
+        Args:
+            object_type: STIX object type of the seeds
+            seeds: Seed objects (typically written by the LLM)
+            count: Number of objects to build
+            context: Existing objects that references may point to
+
+        Returns:
+            List of STIX objects as dictionaries
+        """
+        if not seeds:
+            return []
+        if context is None:
+            context = ContextStore()
+
+        objects = []
+        for obj_id in self.ids.stix_ids(object_type, count):
+            obj = copy.deepcopy(self.rng.choice(seeds))
+            donor = self.rng.choice(seeds)
+            for field in RECOMBINABLE_FIELDS:
+                if field in donor and self.rng.random() < 0.5:
+                    obj[field] = copy.deepcopy(donor[field])
+
+            obj["type"] = object_type
+            obj["id"] = obj_id
+            created = self._random_seconds()
+            obj["created"] = self._format(created)
+            if object_type != "marking-definition":
+                obj["modified"] = self._format(created + self.rng.randint(0, 90 * 24 * 3600))
+            if "published" in obj:
+                obj["published"] = obj.get("modified", obj["created"])
+            for first_field, last_field in TIME_WINDOWS:
+                if first_field in obj:
+                    self._window(obj, first_field, last_field)
+
+            self._mutate(obj, context)
+            if object_type == "observed-data":
+                obj["object_refs"] = self._observe()
+            objects.append(obj)
+        return objects
+
+    def _mutate(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        """Vary the identifying content of an expanded object in place."""
+        name = obj.get("name")
+        if isinstance(name, str):
+            if CVE_PATTERN.fullmatch(name):
+                obj["name"] = f"CVE-{self.rng.randint(2015, 2025)}-{self.rng.randint(1000, 99999)}"
+                for ref in obj.get("external_references", []):
+                    if isinstance(ref, dict) and ref.get("source_name") == "cve":
+                        ref["external_id"] = obj["name"]
+            else:
+                obj["name"] = f"{name} {self.rng.choice(VARIANT_SUFFIXES)}-{self._serial()}"
+
+        aliases = obj.get("aliases")
+        if isinstance(aliases, list) and aliases:
+            self.rng.shuffle(aliases)
+            if len(aliases) > 1 and self.rng.random() < 0.5:
+                aliases.pop()
+            aliases.append(f"{aliases[0]}-{self._serial()}")
+
+        pattern = obj.get("pattern")
+        if isinstance(pattern, str):
+            pattern = IPV4_PATTERN.sub(lambda m: self._ipv4(), pattern)
+            pattern = SHA256_PATTERN.sub(lambda m: self._sha256(), pattern)
+            obj["pattern"] = DOMAIN_PATTERN.sub(lambda m: self._domain(), pattern)
+
+        # Redraw references among existing objects of the same type
+        for key, value in obj.items():
+            if key.endswith("_ref") and isinstance(value, str) and "--" in value:
+                obj[key] = context.choice(value.split("--", 1)[0], self.rng) or value
+            elif key.endswith("_refs") and isinstance(value, list):
+                refs = [
+                    (context.choice(ref.split("--", 1)[0], self.rng) or ref) if isinstance(ref, str) and "--" in ref else ref
+                    for ref in value
+                ]
+                obj[key] = list(dict.fromkeys(refs))
+
+    # Primitive helpers
+
+    def new_id(self, object_type: str) -> str:
+        """Build a seeded STIX ID."""
+        return self.ids.stix_id(object_type)
+
+    def _random_seconds(self) -> int:
+        """Draw a time in the synthetic window, in seconds since the Unix epoch."""
+        return SYNTHETIC_EPOCH_SECONDS + self.rng.randrange(SYNTHETIC_WINDOW_SECONDS)
+
+    def _format(self, seconds: int) -> str:
+        return self.timestamps.format(seconds)
+
+    def _window(self, obj: Dict[str, Any], first_field: str, last_field: str) -> None:
+        """Set a first/last seen style window starting around the creation time."""
+        first = self._random_seconds()
+        obj[first_field] = self._format(first)
+        obj[last_field] = self._format(first + self.rng.randint(3600, 365 * 24 * 3600))
+
+    def _pick(self, values: List[Any], low: int = 1, high: int = 3) -> List[Any]:
+        return self.rng.sample(values, min(len(values), self.rng.randint(low, high)))
+
+    def _serial(self) -> int:
+        return self.rng.randint(1, 9999)
+
+    def _actor_name(self) -> str:
+        return f"{self.rng.choice(ADJECTIVES)} {self.rng.choice(NOUNS)}"
+
+    def _kill_chain(self) -> List[Dict[str, str]]:
+        return [
+            {"kill_chain_name": "lockheed-martin-cyber-kill-chain", "phase_name": phase}
+            for phase in self._pick(KILL_CHAIN_PHASES, 1, 2)
+        ]
+
+    def _refs(self, context: ContextStore, count: int, obj_type: Optional[str] = None) -> List[str]:
+        """Pick up to count existing object IDs, of any type but the meta objects when obj_type is None."""
+        if obj_type is not None:
+            return context.sample(obj_type, count, self.rng)
+        # Oversample by the number of meta objects, so dropping them still
+        # leaves count IDs whenever the context has that many candidates
+        meta_count = sum(context.count(meta_type) for meta_type in META_OBJECT_TYPES)
+        refs = [
+            obj_id for obj_id in context.sample(None, count + meta_count, self.rng)
+            if obj_id.split("--", 1)[0] not in META_OBJECT_TYPES
+        ]
+        return refs[:count]
+
+    def _ref(self, context: ContextStore, obj_types: List[str]) -> Optional[str]:
+        """Pick an existing object ID of the first type the context has."""
+        for obj_type in obj_types:
+            ref = context.choice(obj_type, self.rng)
+            if ref:
+                return ref
+        return None
+
+    def _observable(self, sco_type: str) -> Dict[str, Any]:
+        """Build a cyber-observable with a deterministic (version 5) ID."""
+        if sco_type == "ipv4-addr":
+            properties = {"value": self._ipv4()}
+        elif sco_type == "domain-name":
+            properties = {"value": self._domain()}
+        else:
+            properties = {
+                "hashes": {"SHA-256": self._sha256()},
+                "name": f"{self.rng.choice(MALWARE_STEMS).lower()}{self._serial()}.exe"
+            }
+        # All the properties set here are ID contributing properties of their type
+        contributing = json.dumps(properties, sort_keys=True, separators=(',', ':'))
+        return {
+            "type": sco_type,
+            "spec_version": "2.1",
+            "id": f"{sco_type}--{uuid.uuid5(SCO_NAMESPACE, contributing)}",
+            **properties
+        }
+
+    def _observe(self) -> List[str]:
+        """Build the cyber-observables of an observed-data object and return their IDs."""
+        observables = [self._observable(sco_type) for sco_type in self._pick(OBSERVABLE_TYPES, 1, 3)]
+        self._observables.extend(observables)
+        return [observable["id"] for observable in observables]
+
+    def _ipv4(self) -> str:
+        return f"{self.rng.randint(1, 223)}.{self.rng.randint(0, 255)}.{self.rng.randint(0, 255)}.{self.rng.randint(1, 254)}"
+
+    def _sha256(self) -> str:
+        return f"{self.rng.getrandbits(256):064x}"
+
+    def _domain(self) -> str:
+        return f"{self.rng.choice(ADJECTIVES).lower()}-{self.rng.choice(NOUNS).lower()}{self._serial()}.example.com"
+
+    # Per-type builders
+
+    def _build_attack_pattern(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        technique = self.rng.choice(TECHNIQUES)
+        obj["name"] = f"{technique} ({self._serial()})"
+        obj["description"] = f"Adversaries may use {technique.lower()} to further their objectives."
+        obj["aliases"] = [technique]
+        obj["kill_chain_phases"] = self._kill_chain()
+
+    def _build_campaign(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        name = f"Operation {self._actor_name()}"
+        obj["name"] = name
+        obj["description"] = f"{name} is a series of intrusions against the {self.rng.choice(SECTORS)} sector."
+        obj["aliases"] = [name.replace(" ", "")]
+        obj["objective"] = f"{self.rng.choice(MOTIVATIONS).replace('-', ' ').capitalize()} through targeted intrusions"
+        self._window(obj, "first_seen", "last_seen")
+
+    def _build_course_of_action(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        mitigation = self.rng.choice(MITIGATIONS)
+        obj["name"] = f"{mitigation} ({self._serial()})"
+        obj["description"] = f"{mitigation} to reduce exposure to known adversary techniques."
+
+    def _build_grouping(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        obj["name"] = f"{self._actor_name()} activity cluster"
+        obj["context"] = self.rng.choice(GROUPING_CONTEXTS)
+        obj["object_refs"] = self._refs(context, self.rng.randint(2, 5))
+
+    def _build_identity(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        organization = self.rng.choice(ORGANIZATIONS)
+        sector = self.rng.choice(SECTORS)
+        obj["name"] = f"{organization} {self._serial()}"
+        obj["description"] = f"{organization} operates in the {sector} sector."
+        obj["identity_class"] = "organization"
+        obj["sectors"] = [sector]
+        obj["roles"] = ["target"]
+        obj["contact_information"] = f"security@{organization.split()[0].lower()}.example.com"
+
+    def _build_incident(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        obj["name"] = f"Incident {self._serial()} at {self.rng.choice(ORGANIZATIONS)}"
+        obj["description"] = f"Intrusion involving {self.rng.choice(TECHNIQUES).lower()}."
+
+    def _build_indicator(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        kind = self.rng.randrange(3)
+        if kind == 0:
+            value = self._ipv4()
+            obj["pattern"] = f"[ipv4-addr:value = '{value}']"
+        elif kind == 1:
+            value = self._domain()
+            obj["pattern"] = f"[domain-name:value = '{value}']"
+        else:
+            value = self._sha256()
+            obj["pattern"] = f"[file:hashes.'SHA-256' = '{value}']"
+        obj["name"] = f"Malicious {('IP', 'domain', 'file')[kind]} {value[:16]}"
+        obj["description"] = f"Observable associated with {self._actor_name()} activity."
+        obj["indicator_types"] = self._pick(INDICATOR_TYPES, 1, 2)
+        obj["pattern_type"] = "stix"
+        obj["pattern_version"] = "2.1"
+        self._window(obj, "valid_from", "valid_until")
+        obj["kill_chain_phases"] = self._kill_chain()
+
+    def _build_infrastructure(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        infrastructure_type = self.rng.choice(INFRASTRUCTURE_TYPES)
+        obj["name"] = f"{self._actor_name()} {infrastructure_type.replace('-', ' ')} server"
+        obj["description"] = f"Infrastructure at {self._domain()} used for {infrastructure_type.replace('-', ' ')}."
+        obj["infrastructure_types"] = [infrastructure_type]
+        obj["aliases"] = [f"INF-{self._serial()}"]
+        self._window(obj, "first_seen", "last_seen")
+
+    def _build_intrusion_set(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        name = f"{self._actor_name()} Group"
+        obj["name"] = name
+        obj["description"] = f"{name} is an intrusion set targeting the {self.rng.choice(SECTORS)} sector."
+        obj["aliases"] = [f"G{self._serial():04d}"]
+        obj["goals"] = self._pick(MOTIVATIONS, 1, 2)
+        obj["resource_level"] = self.rng.choice(RESOURCE_LEVELS)
+        obj["primary_motivation"] = self.rng.choice(MOTIVATIONS)
+        obj["secondary_motivations"] = self._pick(MOTIVATIONS, 1, 2)
+        self._window(obj, "first_seen", "last_seen")
+
+    def _build_language_content(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        obj["object_ref"] = self._refs(context, 1)[0]
+        obj["object_modified"] = obj["modified"]
+        obj["contents"] = {"de": {"name": f"Inhalt {self._serial()}"}}
+
+    def _build_location(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        city, country, region, latitude, longitude = self.rng.choice(LOCATIONS)
+        obj["name"] = f"{city}, {country}"
+        obj["description"] = f"Location in {city}"
+        obj["latitude"] = round(latitude + self.rng.uniform(-0.5, 0.5), 4)
+        obj["longitude"] = round(longitude + self.rng.uniform(-0.5, 0.5), 4)
+        obj["precision"] = 1000.0
+        obj["region"] = region
+        obj["country"] = country
+        obj["administrative_area"] = city
+        obj["city"] = city
+        obj.pop("postal_code", None)
+
+    def _build_malware(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        name = f"{self.rng.choice(MALWARE_STEMS)}{self.rng.choice(MALWARE_SUFFIXES)}"
+        malware_types = self._pick(MALWARE_TYPES, 1, 2)
+        obj["name"] = f"{name} {self._serial()}"
+        obj["description"] = f"{name} is a {' and '.join(malware_types)} family."
+        obj["malware_types"] = malware_types
+        obj["is_family"] = True
+        obj["aliases"] = [name.upper()]
+        obj["kill_chain_phases"] = self._kill_chain()
+        obj["capabilities"] = self._pick(["persists-after-system-reboot", "exfiltrates-data", "steals-authentication-credentials", "communicates-with-c2"], 1, 3)
+
+    def _build_malware_analysis(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        obj["product"] = self.rng.choice(["sandbox-pro", "cuckoo", "vmray", "any-run"])
+        obj["version"] = f"{self.rng.randint(1, 9)}.{self.rng.randint(0, 20)}"
+        obj["result"] = self.rng.choice(["malicious", "suspicious", "benign", "unknown"])
+        obj["result_name"] = f"{self.rng.choice(MALWARE_STEMS)}{self.rng.choice(MALWARE_SUFFIXES)}"
+        sample = context.choice("file", self.rng)
+        if sample:
+            obj["sample_ref"] = sample
+        else:
+            obj.pop("sample_ref", None)
+
+    def _build_marking_definition(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        # Marking definitions are not versioned
+        obj.pop("modified", None)
+        obj["name"] = f"Distribution statement {self._serial()}"
+        obj["definition_type"] = "statement"
+        obj["definition"] = {"statement": f"Copyright {obj['created'][:4]} Example Threat Intelligence. All rights reserved."}
+
+    def _build_note(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        obj["abstract"] = f"Analyst note {self._serial()}"
+        obj["content"] = f"Activity consistent with {self._actor_name()} was observed using {self.rng.choice(TECHNIQUES).lower()}."
+        obj["authors"] = [f"analyst-{self.rng.randint(1, 50)}"]
+        obj["object_refs"] = self._refs(context, self.rng.randint(1, 3))
+
+    def _build_observed_data(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        self._window(obj, "first_observed", "last_observed")
+        obj["number_observed"] = self.rng.randint(1, 500)
+        obj["object_refs"] = self._observe()
+
+    def _build_opinion(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        obj["opinion"] = self.rng.choice(OPINIONS)
+        obj["explanation"] = f"Assessment based on {self.rng.randint(2, 40)} corroborating reports."
+        obj["authors"] = [f"analyst-{self.rng.randint(1, 50)}"]
+        obj["object_refs"] = self._refs(context, self.rng.randint(1, 3))
+
+    def _build_report(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        subject = self._actor_name()
+        obj["name"] = f"{subject}: Tactics, Techniques, and Procedures"
+        obj["description"] = f"Overview of {subject} activity against the {self.rng.choice(SECTORS)} sector."
+        obj["report_types"] = self._pick(REPORT_TYPES, 1, 2)
+        obj["published"] = obj["modified"]
+        obj["object_refs"] = self._refs(context, self.rng.randint(2, 6))
+
+    def _build_sighting(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        obj["sighting_of_ref"] = self._ref(context, ["indicator", "malware", "tool", "attack-pattern"])
+        obj["count"] = self.rng.randint(1, 100)
+        self._window(obj, "first_seen", "last_seen")
+        where = context.sample("identity", 1, self.rng)
+        if where:
+            obj["where_sighted_refs"] = where
+
+    def _build_threat_actor(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        name = self._actor_name()
+        obj["name"] = name
+        obj["description"] = f"{name} is a threat actor focused on the {self.rng.choice(SECTORS)} sector."
+        obj["aliases"] = [f"TA{self._serial()}", name.replace(" ", "")]
+        obj["threat_actor_types"] = self._pick(THREAT_ACTOR_TYPES, 1, 2)
+        obj["roles"] = self._pick(["agent", "director", "infrastructure-operator", "malware-author", "sponsor"], 1, 2)
+        obj["goals"] = self._pick(MOTIVATIONS, 1, 2)
+        obj["sophistication"] = self.rng.choice(SOPHISTICATION)
+        obj["resource_level"] = self.rng.choice(RESOURCE_LEVELS)
+        obj["primary_motivation"] = self.rng.choice(MOTIVATIONS)
+        obj["secondary_motivations"] = self._pick(MOTIVATIONS, 1, 2)
+
+    def _build_tool(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        name = self.rng.choice(TOOL_NAMES)
+        obj["name"] = f"{name} {self._serial()}"
+        obj["description"] = f"{name} build observed in adversary operations."
+        obj["tool_types"] = self._pick(TOOL_TYPES, 1, 2)
+        obj["aliases"] = [name.replace(" ", "").lower()]
+        obj["kill_chain_phases"] = self._kill_chain()
+        obj["tool_version"] = f"{self.rng.randint(1, 5)}.{self.rng.randint(0, 9)}.{self.rng.randint(0, 20)}"
+
+    def _build_vulnerability(self, obj: Dict[str, Any], context: ContextStore) -> None:
+        cve = f"CVE-{self.rng.randint(2015, 2025)}-{self.rng.randint(1000, 99999)}"
+        obj["name"] = cve
+        obj["description"] = f"A vulnerability in {self.rng.choice(ORGANIZATIONS)} software allows {self.rng.choice(['remote code execution', 'privilege escalation', 'information disclosure', 'authentication bypass'])}."
+        obj["external_references"] = [{"source_name": "cve", "external_id": cve}]
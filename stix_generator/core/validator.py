@@ -0,0 +1,456 @@
+"""
+STIX object normalization and validation.
+
+All ID, reference and timestamp repairs happen here in a single pass per object,
+using precompiled patterns, so objects reach the stix2 constructors already clean.
+"""
+
+import re
+import uuid
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Iterable, Tuple, FrozenSet
+
+from ..config import RELATIONSHIP_MAP
+
+# Precompiled validators
+STIX_ID_PATTERN = re.compile(r'^[a-z0-9-]+--[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$')
+STIX_TIMESTAMP_PATTERN = re.compile(r'^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(\.\d+)?Z$')
+
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.000Z"
+
+# Top-level timestamp properties, serialized the way stix2 does: created and
+# modified keep at least millisecond precision, the others only their
+# significant fractional digits
+MILLISECOND_TIMESTAMP_PROPERTIES = frozenset(('created', 'modified'))
+TIMESTAMP_PROPERTIES = MILLISECOND_TIMESTAMP_PROPERTIES | frozenset((
+    'first_seen', 'last_seen', 'valid_from', 'valid_until', 'first_observed',
+    'last_observed', 'published', 'start_time', 'stop_time', 'analysis_started',
+    'analysis_ended', 'submitted'
+))
+
+# Reference types tried, in order, when a sighting's sighting_of_ref is invalid
+SIGHTING_REF_TYPES = ['indicator', 'malware', 'tool', 'attack-pattern']
+
+# Properties the stix2 classes require beyond type, id and timestamps; a tuple
+# means at least one of its properties must be present
+REQUIRED_PROPERTIES = {
+    'attack-pattern': ['name'],
+    'campaign': ['name'],
+    'course-of-action': ['name'],
+    'domain-name': ['value'],
+    'file': [('hashes', 'name')],
+    'grouping': ['context', 'object_refs'],
+    'identity': ['name'],
+    'incident': ['name'],
+    'indicator': ['pattern', 'pattern_type', 'valid_from'],
+    'infrastructure': ['name'],
+    'intrusion-set': ['name'],
+    'ipv4-addr': ['value'],
+    'language-content': ['object_ref', 'contents'],
+    'location': [('region', 'country', 'latitude')],
+    'malware': ['is_family'],
+    'malware-analysis': ['product', ('result', 'analysis_sco_refs')],
+    'marking-definition': ['definition_type', 'definition'],
+    'note': ['content', 'object_refs'],
+    'observed-data': ['first_observed', 'last_observed', 'number_observed'],
+    'opinion': ['opinion', 'object_refs'],
+    'relationship': ['relationship_type', 'source_ref', 'target_ref'],
+    'report': ['name', 'published', 'object_refs'],
+    'sighting': ['sighting_of_ref'],
+    'threat-actor': ['name'],
+    'tool': ['name'],
+    'vulnerability': ['name']
+}
+
+def build_allowed_relationships(relationship_map: Dict[str, Dict[str, List[str]]]) -> FrozenSet[Tuple[str, str, str]]:
+    """
+    Flatten a relationship map into a set of allowed triples.
+
+    Args:
+        relationship_map: Mapping of source type to target type to relationship types
+
+    Returns:
+        Set of (source_type, target_type, relationship_type) triples
+    """
+    return frozenset(
+        (source_type, target_type, rel_type)
+        for source_type, targets in relationship_map.items()
+        for target_type, rel_types in targets.items()
+        for rel_type in rel_types
+    )
+
+ALLOWED_RELATIONSHIPS = build_allowed_relationships(RELATIONSHIP_MAP)
+
+def is_valid_stix_id(value: Any) -> bool:
+    """
+    Check whether a value is a well-formed STIX identifier.
+
+    Args:
+        value: Value to check
+
+    Returns:
+        True if the value is a valid STIX ID
+    """
+    return isinstance(value, str) and STIX_ID_PATTERN.match(value) is not None
+
+def is_valid_timestamp(value: Any) -> bool:
+    """
+    Check whether a value is a parseable STIX timestamp.
+
+    Args:
+        value: Value to check
+
+    Returns:
+        True if the value is a valid timestamp
+    """
+    if not isinstance(value, str):
+        return False
+    match = STIX_TIMESTAMP_PATTERN.match(value)
+    try:
+        if match:
+            # The pattern only checks the shape; the date itself must exist
+            datetime.strptime(match.group(1), "%Y-%m-%dT%H:%M:%S")
+            return True
+        datetime.fromisoformat(value.replace('Z', '+00:00'))
+        return True
+    except ValueError:
+        return False
+
+def check_stix_object(obj: Dict[str, Any]) -> List[str]:
+    """
+    Check a normalized object against the schema without building a stix2 instance.
+
+    Covers the object's type, ID, timestamps and required properties; the
+    full stix2 property validation is not repeated.
+
+    Args:
+        obj: STIX object as dictionary
+
+    Returns:
+        List of the missing or invalid fields (empty if the object is valid)
+    """
+    obj_type = obj.get('type')
+    required = REQUIRED_PROPERTIES.get(obj_type)
+    if required is None:
+        return ['type']
+
+    problems = []
+    obj_id = obj.get('id')
+    if not is_valid_stix_id(obj_id) or not obj_id.startswith(f"{obj_type}--"):
+        problems.append('id')
+    for timestamp_field in ('created', 'modified'):
+        if timestamp_field in obj and not is_valid_timestamp(obj[timestamp_field]):
+            problems.append(timestamp_field)
+    for prop in required:
+        if isinstance(prop, tuple):
+            if not any(obj.get(alternative) is not None for alternative in prop):
+                problems.append('/'.join(prop))
+        elif obj.get(prop) is None:
+            problems.append(prop)
+    return problems
+
+def canonical_timestamp(value: str, millisecond: bool = False) -> str:
+    """
+    Format a STIX timestamp the way stix2 serializes it.
+
+    Trailing zeros of the fractional seconds are dropped; millisecond
+    timestamps are padded back to three digits, others lose an empty fraction.
+
+    Args:
+        value: STIX timestamp
+        millisecond: Whether to keep at least millisecond precision
+
+    Returns:
+        Canonical timestamp (the value itself if it is not a STIX timestamp)
+    """
+    match = STIX_TIMESTAMP_PATTERN.match(value) if isinstance(value, str) else None
+    if not match:
+        return value
+    fraction = (match.group(2) or '.').rstrip('0')
+    if millisecond:
+        fraction = fraction.ljust(4, '0')
+    elif fraction == '.':
+        fraction = ''
+    return f"{match.group(1)}{fraction}Z"
+
+def canonicalize_timestamps(obj: Dict[str, Any]) -> None:
+    """
+    Bring an object's timestamps, in place, to the precision stix2 serializes.
+
+    Args:
+        obj: STIX object as dictionary
+    """
+    for key in TIMESTAMP_PROPERTIES.intersection(obj):
+        obj[key] = canonical_timestamp(obj[key], key in MILLISECOND_TIMESTAMP_PROPERTIES)
+
+def new_stix_id(obj_type: str) -> str:
+    """
+    Generate a fresh STIX identifier.
+
+    Args:
+        obj_type: STIX object type
+
+    Returns:
+        STIX ID
+    """
+    return f"{obj_type}--{uuid.uuid4()}"
+
+def current_timestamp() -> str:
+    """
+    Get the current time as a STIX timestamp.
+
+    Returns:
+        Timestamp string
+    """
+    return datetime.now().strftime(TIMESTAMP_FORMAT)
+
+def normalize_stix_object(
+    obj: Dict[str, Any],
+    default_type: Optional[str] = None,
+    find_reference: Optional[Callable[[Optional[str]], Optional[str]]] = None,
+    new_id: Callable[[str], str] = new_stix_id,
+    now: Callable[[], str] = current_timestamp
+) -> List[str]:
+    """
+    Repair an object in place so it can be handed directly to a stix2 constructor.
+
+    Args:
+        obj: STIX object as dictionary
+        default_type: Type to assign if the object has none
+        find_reference: Returns the ID of an existing object of the given type
+            (or of any type when passed None), or None if there is none
+        new_id: Returns a fresh STIX ID for a type
+        now: Returns the timestamp used for missing or invalid times
+
+    Returns:
+        List of the fields that were repaired
+    """
+    fixes = []
+
+    # Ensure type is present
+    if 'type' not in obj and default_type:
+        obj['type'] = default_type
+        fixes.append('type')
+    obj_type = obj.get('type')
+
+    # Ensure ID is present and in the correct format
+    if obj_type and not is_valid_stix_id(obj.get('id')):
+        obj['id'] = new_id(obj_type)
+        fixes.append('id')
+
+    # Process references to ensure they are valid
+    for key, value in list(obj.items()):
+        # Handle reference fields
+        if key.endswith('_ref') and isinstance(value, str):
+            if not is_valid_stix_id(value):
+                # Try to find a valid reference of the same type
+                ref_type = value.split('--')[0] if '--' in value else None
+                replacement = find_reference(ref_type) if ref_type and find_reference else None
+                if replacement:
+                    obj[key] = replacement
+                else:
+                    del obj[key]
+                fixes.append(key)
+
+        # Handle reference lists
+        elif key.endswith('_refs') and isinstance(value, list):
+            valid_refs = []
+            changed = False
+            for ref in value:
+                if is_valid_stix_id(ref):
+                    valid_refs.append(ref)
+                    continue
+                changed = True
+                ref_type = ref.split('--')[0] if isinstance(ref, str) and '--' in ref else None
+                replacement = find_reference(ref_type) if ref_type and find_reference else None
+                if replacement:
+                    valid_refs.append(replacement)
+
+            # Update with valid references only, removing empty lists
+            if valid_refs:
+                if changed:
+                    obj[key] = valid_refs
+            else:
+                del obj[key]
+                changed = True
+            if changed:
+                fixes.append(key)
+
+    # Ensure created and modified timestamps are present and in the correct format
+    for timestamp_field in ('created', 'modified'):
+        if timestamp_field in obj and not is_valid_timestamp(obj[timestamp_field]):
+            obj[timestamp_field] = now()
+            fixes.append(timestamp_field)
+    if 'created' not in obj:
+        obj['created'] = now()
+        fixes.append('created')
+    if 'modified' not in obj and obj_type != 'marking-definition':
+        obj['modified'] = obj['created']
+        fixes.append('modified')
+
+    # Special handling for specific object types
+    if obj_type == 'observed-data':
+        if _sanitize_observed_data(obj):
+            fixes.append('objects')
+
+    elif obj_type == 'sighting':
+        # sighting_of_ref was dropped above if invalid and unresolvable by type
+        if 'sighting_of_ref' not in obj and 'sighting_of_ref' in fixes and find_reference:
+            for ref_type in SIGHTING_REF_TYPES:
+                replacement = find_reference(ref_type)
+                if replacement:
+                    obj['sighting_of_ref'] = replacement
+                    break
+
+    elif obj_type == 'marking-definition':
+        if 'definition_type' not in obj:
+            obj['definition_type'] = 'statement'
+            fixes.append('definition_type')
+        if 'definition' not in obj:
+            obj['definition'] = {'statement': 'Copyright. All rights reserved.'}
+            fixes.append('definition')
+
+    elif obj_type == 'language-content':
+        if 'object_ref' not in obj and 'object_ref' in fixes and find_reference:
+            replacement = find_reference(None)
+            if replacement:
+                obj['object_ref'] = replacement
+        if 'contents' not in obj:
+            obj['contents'] = {'en': {'name': 'English content'}}
+            fixes.append('contents')
+
+    return fixes
+
+def _sanitize_observed_data(obj: Dict[str, Any]) -> bool:
+    """
+    Sanitize the cyber observables of an observed-data object in place.
+
+    Observables that need changes are copied rather than edited, since the
+    nested dictionaries may be shared with a cache.
+
+    Args:
+        obj: Observed data object to sanitize
+
+    Returns:
+        True if anything was changed
+    """
+    if 'objects' not in obj or not isinstance(obj['objects'], dict):
+        return False
+
+    changed = False
+    sanitized = {}
+    for key, value in obj['objects'].items():
+        if not isinstance(value, dict):
+            changed = True
+            continue
+        observable_type = value.get('type')
+        if observable_type in ('file', 'process') and 'created' in value:
+            value = {field: item for field, item in value.items() if field != 'created'}
+            changed = True
+        elif observable_type == 'network-traffic':
+            for ref_field in ('src_ref', 'dst_ref'):
+                if ref_field in value and not isinstance(value[ref_field], str):
+                    value = {**value, ref_field: str(value[ref_field])}
+                    changed = True
+        sanitized[key] = value
+
+    if changed:
+        obj['objects'] = sanitized
+    return changed
+
+class RelationshipValidator:
+    """
+    Constant-time relationship checks against a fixed set of STIX objects.
+
+    Built once per generation run; holds the set of known object IDs and the
+    allowed (source_type, target_type, relationship_type) triples.
+    """
+
+    def __init__(
+        self,
+        stix_objects: Iterable[Dict[str, Any]] = (),
+        allowed: FrozenSet[Tuple[str, str, str]] = ALLOWED_RELATIONSHIPS
+    ):
+        """
+        Initialize the validator.
+
+        Args:
+            stix_objects: STIX objects that relationships may reference
+            allowed: Allowed (source_type, target_type, relationship_type) triples
+        """
+        self.allowed = allowed
+        self.object_ids = {obj['id'] for obj in stix_objects if 'id' in obj}
+
+    def add_objects(self, stix_objects: Iterable[Dict[str, Any]]) -> None:
+        """
+        Make more objects available as relationship endpoints.
+
+        Args:
+            stix_objects: STIX objects to add
+        """
+        self.object_ids.update(obj['id'] for obj in stix_objects if 'id' in obj)
+
+    def is_allowed(self, source_type: str, target_type: str, relationship_type: str) -> bool:
+        """
+        Check whether a relationship type is allowed between two object types.
+
+        Args:
+            source_type: Source object type
+            target_type: Target object type
+            relationship_type: Relationship type
+
+        Returns:
+            True if the triple is allowed
+        """
+        return (source_type, target_type, relationship_type) in self.allowed
+
+    def is_valid(self, relationship: Dict[str, Any]) -> bool:
+        """
+        Validate a relationship.
+
+        Args:
+            relationship: Relationship to validate
+
+        Returns:
+            True if the relationship type is allowed and both endpoints exist
+        """
+        return self.is_valid_edge(
+            relationship.get('source_ref'),
+            relationship.get('target_ref'),
+            relationship.get('relationship_type', '')
+        )
+
+    def is_valid_edge(self, source_ref: Any, target_ref: Any, relationship_type: str) -> bool:
+        """
+        Validate a relationship given as its endpoints and type.
+
+        Args:
+            source_ref: Source object ID
+            target_ref: Target object ID
+            relationship_type: Relationship type
+
+        Returns:
+            True if the relationship type is allowed and both endpoints exist
+        """
+        if not isinstance(source_ref, str) or not isinstance(target_ref, str):
+            return False
+        if source_ref not in self.object_ids or target_ref not in self.object_ids:
+            return False
+
+        return (
+            source_ref.split('--', 1)[0],
+            target_ref.split('--', 1)[0],
+            relationship_type
+        ) in self.allowed
+
+    def validate_many(self, relationships: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Keep only the valid relationships.
+
+        Args:
+            relationships: Relationships to validate
+
+        Returns:
+            List of valid relationships, in input order
+        """
+        return [rel for rel in relationships if self.is_valid(rel)]
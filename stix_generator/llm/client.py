@@ -4,6 +4,7 @@ LLM client wrapper.
 
 import os
 import json
+import threading
 from typing import Dict, Any, List, Optional, Union
 
 from langchain_openai import ChatOpenAI
@@ -12,9 +13,11 @@ from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.pydantic_v1 import BaseModel
 
 from ..config import (
-    OPENAI_API_KEY, LLM_MODEL, LLM_TEMPERATURE
+    OPENAI_API_KEY, LLM_MODEL, LLM_TEMPERATURE, LLM_MEMO_ENABLED
 )
 from ..utils.logging_utils import setup_logger
+from ..utils.event_loop import run_async, run_in_worker
+from .memo import get_memo_store, make_memo_key
 
 logger = setup_logger("stix_generator.llm.client")
 
@@ -25,7 +28,8 @@ class LLMClient:
         self, 
         api_key: str = OPENAI_API_KEY, 
         model: str = LLM_MODEL, 
-        temperature: float = LLM_TEMPERATURE
+        temperature: float = LLM_TEMPERATURE,
+        memoize: bool = LLM_MEMO_ENABLED
     ):
         """
         Initialize the LLM client.
@@ -34,10 +38,12 @@ class LLMClient:
             api_key: OpenAI API key
             model: LLM model to use
             temperature: Generation temperature
+            memoize: Whether to serve repeated prompts from the memo store
         """
         self.api_key = api_key
         self.model = model
         self.temperature = temperature
+        self.memoize = memoize
         
         if not api_key:
             logger.warning("No API key provided. LLM client will not be functional.")
@@ -78,13 +84,63 @@ class LLMClient:
             
         return chain
     
-    async def ainvoke_chain(self, chain, inputs: Dict[str, Any]) -> Dict[str, Any]:
+    def _memo_key(self, prompt: str, seed: Optional[int]) -> Optional[str]:
+        """
+        Get the memo key for a rendered prompt, or None if memoization is off.
+        
+        Args:
+            prompt: Fully rendered prompt text
+            seed: Random seed for the request
+            
+        Returns:
+            Memo key or None
+        """
+        if not self.memoize:
+            return None
+        return make_memo_key(self.model, self.temperature, prompt, seed)
+    
+    async def agenerate_text(self, prompt: str, seed: Optional[int] = None) -> str:
+        """
+        Generate a completion for a single prompt asynchronously.
+        
+        Args:
+            prompt: The prompt text
+            seed: Random seed for the request (part of the memo key)
+            
+        Returns:
+            The completion text, or an empty string on failure
+        """
+        if not self.llm:
+            logger.error("LLM client not initialized properly")
+            return ""
+        
+        # The memo store does blocking file I/O, so it runs off the shared loop
+        memo_key = self._memo_key(prompt, seed)
+        if memo_key:
+            cached = await run_in_worker(get_memo_store().get, memo_key)
+            if cached is not None:
+                logger.debug(f"Memo hit for prompt {memo_key[:12]}")
+                return cached
+        
+        try:
+            response = await self.llm.ainvoke(prompt)
+            text = response.content
+        except Exception as e:
+            logger.error(f"Error generating completion: {str(e)}")
+            return ""
+        
+        if memo_key and text:
+            await run_in_worker(get_memo_store().put, memo_key, text)
+        return text
+    
+    async def ainvoke_chain(self, chain, inputs: Dict[str, Any], seed: Optional[int] = None) -> Dict[str, Any]:
         """
         Invoke a LangChain chain asynchronously.
         
         Args:
             chain: The LangChain chain to invoke
             inputs: The inputs to the chain
+            seed: Random seed for the request (part of the memo key)
             
         Returns:
             The output of the chain
@@ -92,32 +148,102 @@ class LLMClient:
         if not chain:
             logger.error("Chain not initialized properly")
             return {}
+        
+        memo_key = None
+        if self.memoize:
+            try:
+                # The first step of chains built by create_chain is the prompt template
+                memo_key = self._memo_key(chain.first.format(**inputs), seed)
+            except Exception as e:
+                logger.debug(f"Chain prompt could not be rendered for memoization: {str(e)}")
+        
+        if memo_key:
+            cached = await run_in_worker(get_memo_store().get, memo_key)
+            if cached is not None:
+                logger.debug(f"Memo hit for chain {memo_key[:12]}")
+                return cached
             
         try:
             result = await chain.ainvoke(inputs)
-            return result
         except Exception as e:
             logger.error(f"Error invoking chain: {str(e)}")
             return {}
+        
+        # Only parsed (JSON-serializable) chain outputs can be memoized
+        if memo_key and result and isinstance(result, (dict, list, str)):
+            await run_in_worker(get_memo_store().put, memo_key, result)
+        return result
+
+    def close(self) -> None:
+        """Close the underlying HTTP clients and release their connection pools."""
+        if not self.llm:
+            return
+        
+        sync_client = getattr(self.llm, 'root_client', None)
+        if sync_client is not None and hasattr(sync_client, 'close'):
+            try:
+                sync_client.close()
+            except Exception as e:
+                logger.warning(f"Error closing LLM HTTP client: {str(e)}")
+        
+        async_client = getattr(self.llm, 'root_async_client', None)
+        if async_client is not None and hasattr(async_client, 'close'):
+            try:
+                # Async connections belong to the shared background loop
+                run_async(async_client.close(), timeout=5)
+            except Exception as e:
+                logger.warning(f"Error closing async LLM HTTP client: {str(e)}")
+        
+        self.llm = None
+
+# Pooled clients keyed by (api_key, model, temperature, memoize)
+_client_pool: Dict[tuple, LLMClient] = {}
+_client_pool_lock = threading.Lock()
 
 def get_llm_client(
     api_key: str = OPENAI_API_KEY, 
     model: str = LLM_MODEL, 
-    temperature: float = LLM_TEMPERATURE
+    temperature: float = LLM_TEMPERATURE,
+    memoize: bool = LLM_MEMO_ENABLED
 ) -> LLMClient:
     """
-    Get an LLM client instance.
+    Get a pooled LLM client instance.
+    
+    Clients are shared across generators and requests so the underlying
+    HTTP connection pools (and keep-alive connections) are reused.
     
     Args:
         api_key: OpenAI API key
         model: LLM model to use
         temperature: Generation temperature
+        memoize: Whether to serve repeated prompts from the memo store
         
     Returns:
         LLM client instance
     """
-    return LLMClient(
-        api_key=api_key,
-        model=model,
-        temperature=temperature
-    )
\ No newline at end of file
+    key = (api_key, model, float(temperature), memoize)
+    with _client_pool_lock:
+        client = _client_pool.get(key)
+        # Don't pool clients that failed to initialize so a later call can retry
+        if client is None or client.llm is None:
+            client = LLMClient(
+                api_key=api_key,
+                model=model,
+                temperature=temperature,
+                memoize=memoize
+            )
+            if client.llm is not None:
+                _client_pool[key] = client
+        return client
+
+def close_llm_clients() -> None:
+    """Close and discard all pooled LLM clients."""
+    with _client_pool_lock:
+        clients = list(_client_pool.values())
+        _client_pool.clear()
+    
+    for client in clients:
+        client.close()
+    
+    if clients:
+        logger.info(f"Closed {len(clients)} pooled LLM clients")
\ No newline at end of file
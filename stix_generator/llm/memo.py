@@ -0,0 +1,204 @@
+"""
+Content-addressed memo store for LLM completions.
+
+Each completion is stored under ``<memo_dir>/<hh>/<sha256>.json`` where the
+hash covers the model, temperature, rendered prompt and seed, so identical
+requests across runs are answered without a network call.
+
+The store does blocking file I/O; async callers run it in a worker thread
+(see utils.event_loop.run_in_worker).
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from ..config import LLM_MEMO_DIR, LLM_MEMO_TTL, LLM_MEMO_MAX_ENTRIES
+from ..utils.logging_utils import setup_logger
+
+logger = setup_logger("stix_generator.llm.memo")
+
+def make_memo_key(model: str, temperature: float, prompt: str, seed: Optional[int] = None) -> str:
+    """
+    Build the content address for an LLM request.
+
+    Args:
+        model: LLM model name
+        temperature: Generation temperature
+        prompt: Fully rendered prompt text
+        seed: Random seed for the request
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = json.dumps(
+        {"model": model, "temperature": temperature, "prompt": prompt, "seed": seed},
+        sort_keys=True,
+        separators=(',', ':')
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class MemoStore:
+    """
+    On-disk store of LLM completions with TTL and entry-count eviction.
+
+    The entries are tracked in an in-memory LRU index, built from a single
+    directory scan on first use, so eviction never rescans the directory.
+    Entries written by other processes after that scan are not counted.
+    """
+
+    def __init__(
+        self,
+        memo_dir: str = LLM_MEMO_DIR,
+        ttl: int = LLM_MEMO_TTL,
+        max_entries: int = LLM_MEMO_MAX_ENTRIES
+    ):
+        """
+        Initialize the memo store.
+
+        Args:
+            memo_dir: Directory holding memoized completions
+            ttl: Seconds an entry stays valid (0 disables expiry)
+            max_entries: Maximum number of stored entries
+        """
+        self.memo_dir = memo_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # Memo key -> last use time, least recently used first
+        self._index: Optional["OrderedDict[str, float]"] = None
+
+    def _path(self, key: str) -> str:
+        """Get the file path for a memo key."""
+        return os.path.join(self.memo_dir, key[:2], f"{key}.json")
+
+    def _iter_entries(self):
+        """Yield (key, mtime) for every stored entry."""
+        if not os.path.isdir(self.memo_dir):
+            return
+        for shard in os.listdir(self.memo_dir):
+            shard_dir = os.path.join(self.memo_dir, shard)
+            if not os.path.isdir(shard_dir):
+                continue
+            for name in os.listdir(shard_dir):
+                if name.endswith('.json'):
+                    path = os.path.join(shard_dir, name)
+                    try:
+                        yield name[:-len('.json')], os.path.getmtime(path)
+                    except FileNotFoundError:
+                        continue
+
+    def _get_index(self) -> "OrderedDict[str, float]":
+        """Get the LRU index, scanning the directory the first time. Call with the lock held."""
+        if self._index is None:
+            self._index = OrderedDict(sorted(self._iter_entries(), key=lambda entry: entry[1]))
+        return self._index
+
+    def _touch(self, key: str) -> None:
+        """Mark an entry as most recently used. Call with the lock held."""
+        index = self._get_index()
+        index[key] = time.time()
+        index.move_to_end(key)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a memoized completion.
+
+        Args:
+            key: Memo key from make_memo_key
+
+        Returns:
+            Stored value, or None if there is no valid entry
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Discarding unreadable memo entry {key}: {str(e)}")
+            self._remove(key)
+            return None
+
+        if self.ttl and time.time() - entry.get('created', 0) > self.ttl:
+            self._remove(key)
+            return None
+
+        with self._lock:
+            self._touch(key)
+        return entry.get('value')
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store a completion, evicting the oldest entries if the store is full.
+
+        Args:
+            key: Memo key from make_memo_key
+            value: JSON-serializable completion
+        """
+        if value is None:
+            return
+
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({"created": time.time(), "value": value}, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Error writing memo entry {key}: {str(e)}")
+            return
+
+        with self._lock:
+            self._touch(key)
+            if self.max_entries and len(self._index) > self.max_entries:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries down to 90% of capacity. Call with the lock held."""
+        target = int(self.max_entries * 0.9)
+        evicted = 0
+        while len(self._index) > target:
+            key, _ = self._index.popitem(last=False)
+            self._unlink(key)
+            evicted += 1
+        logger.info(f"Evicted {evicted} memoized LLM completions")
+
+    def _remove(self, key: str) -> None:
+        """Delete an entry and drop it from the index."""
+        with self._lock:
+            if self._index is not None:
+                self._index.pop(key, None)
+        self._unlink(key)
+
+    def _unlink(self, key: str) -> None:
+        """Delete an entry file, ignoring races with other writers."""
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+_stores: Dict[str, MemoStore] = {}
+_stores_lock = threading.Lock()
+
+def get_memo_store(memo_dir: str = LLM_MEMO_DIR) -> MemoStore:
+    """
+    Get the shared memo store for a directory.
+
+    Args:
+        memo_dir: Memo directory
+
+    Returns:
+        Memo store instance
+    """
+    key = os.path.abspath(memo_dir)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = MemoStore(memo_dir)
+        return _stores[key]
@@ -0,0 +1,366 @@
+"""
+Append-only object cache for generated STIX objects.
+
+Objects are stored one per line in ``<cache_dir>/<type>.jsonl``. Each batch is
+appended with a single write, and a per-type index of line offsets lets readers
+count objects and fetch the first N without parsing the whole file.
+
+Parsed objects are additionally kept in a process-wide LRU keyed by type and
+invalidated when the log file's mtime/size changes, so repeated generations
+for the same types never touch disk or the JSON parser.
+"""
+
+import os
+import copy
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+from ..config import CACHE_DIR, OBJECT_CACHE_MAX_TYPES, OBJECT_CACHE_MAX_OBJECTS
+from ..utils.logging_utils import setup_logger
+from ..utils.serialization import dumps, loads
+
+logger = setup_logger("stix_generator.cache")
+
+class _TypeIndex:
+    """Byte offsets of the records in a single type's log file."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.offsets: List[int] = []
+        self.size = 0
+        self.inode = None
+
+class ObjectCache:
+    """Append-only, indexed store of cached STIX objects keyed by type."""
+
+    def __init__(
+        self,
+        cache_dir: str = CACHE_DIR,
+        max_types: int = OBJECT_CACHE_MAX_TYPES,
+        max_objects: int = OBJECT_CACHE_MAX_OBJECTS
+    ):
+        """
+        Initialize the object cache.
+
+        Args:
+            cache_dir: Directory holding the per-type log files
+            max_types: Maximum number of types kept parsed in memory
+            max_objects: Maximum number of parsed objects kept in memory
+        """
+        self.cache_dir = cache_dir
+        self.max_types = max_types
+        self.max_objects = max_objects
+        self._indexes: Dict[str, _TypeIndex] = {}
+        self._lock = threading.RLock()
+
+        # type -> (file signature, parsed objects), least recently used first
+        self._memory: "OrderedDict[str, Tuple[Tuple[int, int, int], List[Dict[str, Any]]]]" = OrderedDict()
+        self._memory_objects = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def _signature(self, obj_type: str) -> Optional[Tuple[int, int, int]]:
+        """Get the (mtime, size, inode) signature of a type's log file."""
+        try:
+            stat = os.stat(self._log_path(obj_type))
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _memory_get(self, obj_type: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the parsed objects for a type if the in-memory copy is current.
+
+        Args:
+            obj_type: STIX object type
+
+        Returns:
+            Parsed objects, or None on a miss
+        """
+        entry = self._memory.get(obj_type)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+
+        if entry[0] != self._signature(obj_type):
+            self._memory_drop(obj_type)
+            self._stats["invalidations"] += 1
+            self._stats["misses"] += 1
+            return None
+
+        self._memory.move_to_end(obj_type)
+        self._stats["hits"] += 1
+        return entry[1]
+
+    def _memory_put(self, obj_type: str, signature: Optional[Tuple[int, int, int]], objects: List[Dict[str, Any]]) -> None:
+        """
+        Store parsed objects for a type, evicting least recently used types.
+
+        Args:
+            obj_type: STIX object type
+            signature: Signature of the log file the objects were read from
+            objects: Parsed objects
+        """
+        self._memory_drop(obj_type)
+        if signature is None or len(objects) > self.max_objects or self.max_types <= 0:
+            return
+
+        self._memory[obj_type] = (signature, objects)
+        self._memory_objects += len(objects)
+
+        while len(self._memory) > self.max_types or self._memory_objects > self.max_objects:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_objects -= len(evicted)
+            self._stats["evictions"] += 1
+
+    def _memory_drop(self, obj_type: str) -> None:
+        """Remove a type from the in-memory cache."""
+        entry = self._memory.pop(obj_type, None)
+        if entry is not None:
+            self._memory_objects -= len(entry[1])
+
+    def _log_path(self, obj_type: str) -> str:
+        """Get the path of the JSON Lines log for a type."""
+        return os.path.join(self.cache_dir, f"{obj_type}.jsonl")
+
+    def _legacy_path(self, obj_type: str) -> str:
+        """Get the path of the pre-JSON Lines cache file for a type."""
+        return os.path.join(self.cache_dir, f"{obj_type}.json")
+
+    def _migrate_legacy(self, obj_type: str) -> None:
+        """
+        Convert a legacy ``<type>.json`` array into the JSON Lines log.
+
+        The log is written to a temporary file and renamed into place so a
+        crash never leaves a partially migrated log behind.
+
+        Args:
+            obj_type: STIX object type
+        """
+        legacy_path = self._legacy_path(obj_type)
+        log_path = self._log_path(obj_type)
+        if os.path.exists(log_path) or not os.path.exists(legacy_path):
+            return
+
+        try:
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                objects = json.load(f)
+            if not isinstance(objects, list):
+                return
+
+            tmp_path = f"{log_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for obj in objects:
+                    f.write(dumps(obj))
+                    f.write('\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, log_path)
+            logger.info(f"Migrated {len(objects)} cached {obj_type} objects to {log_path}")
+
+        except Exception as e:
+            logger.error(f"Error migrating legacy cache for {obj_type}: {str(e)}")
+
+    def _refresh_index(self, obj_type: str) -> _TypeIndex:
+        """
+        Bring the in-memory index for a type up to date with its log file.
+
+        Only bytes appended since the last refresh are scanned; if the file was
+        replaced or truncated the index is rebuilt from scratch.
+
+        Args:
+            obj_type: STIX object type
+
+        Returns:
+            Index for the type
+        """
+        index = self._indexes.get(obj_type)
+        if index is None:
+            self._migrate_legacy(obj_type)
+            index = self._indexes[obj_type] = _TypeIndex()
+
+        log_path = self._log_path(obj_type)
+        try:
+            stat = os.stat(log_path)
+        except FileNotFoundError:
+            index.offsets, index.size, index.inode = [], 0, None
+            return index
+
+        if stat.st_ino != index.inode or stat.st_size < index.size:
+            index.offsets, index.size, index.inode = [], 0, stat.st_ino
+
+        if stat.st_size > index.size:
+            with open(log_path, 'rb') as f:
+                f.seek(index.size)
+                position = index.size
+                for line in f:
+                    # Ignore a trailing record that is still being written
+                    if not line.endswith(b'\n'):
+                        break
+                    if line.strip():
+                        index.offsets.append(position)
+                    position += len(line)
+            index.size = position
+
+        return index
+
+    def count(self, obj_type: str) -> int:
+        """
+        Get the number of cached objects of a type.
+
+        Args:
+            obj_type: STIX object type
+
+        Returns:
+            Number of cached objects
+        """
+        with self._lock:
+            return len(self._refresh_index(obj_type).offsets)
+
+    def load(self, obj_type: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Load cached objects of a type in insertion order.
+
+        Objects are returned as deep copies, so callers may modify them freely
+        without affecting the in-memory cache.
+
+        Args:
+            obj_type: STIX object type
+            limit: Maximum number of objects to load
+
+        Returns:
+            List of cached STIX objects
+        """
+        with self._lock:
+            objects = self._memory_get(obj_type)
+            if objects is None:
+                index = self._refresh_index(obj_type)
+                signature = self._signature(obj_type)
+                # Parse everything when it fits in memory so later calls are free
+                if len(index.offsets) <= self.max_objects:
+                    objects = self._read_records(obj_type, index, None)
+                    self._memory_put(obj_type, signature, objects)
+                else:
+                    objects = self._read_records(obj_type, index, limit)
+
+            selected = objects if limit is None else objects[:max(0, limit)]
+            return copy.deepcopy(selected)
+
+    def _read_records(self, obj_type: str, index: _TypeIndex, limit: Optional[int]) -> List[Dict[str, Any]]:
+        """
+        Read and parse records from a type's log file.
+
+        Args:
+            obj_type: STIX object type
+            index: Current index for the type
+            limit: Maximum number of records to read
+
+        Returns:
+            Parsed objects
+        """
+        offsets = index.offsets if limit is None else index.offsets[:max(0, limit)]
+        if not offsets:
+            return []
+        end = index.offsets[len(offsets)] if len(offsets) < len(index.offsets) else index.size
+
+        with open(self._log_path(obj_type), 'rb') as f:
+            f.seek(offsets[0])
+            data = f.read(end - offsets[0])
+
+        objects = []
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            try:
+                objects.append(loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping corrupt cache record for {obj_type}")
+        return objects
+
+    def save_many(self, obj_type: str, objects: List[Dict[str, Any]]) -> None:
+        """
+        Append a batch of objects to the cache for a type.
+
+        The batch is encoded up front and written with a single append so
+        concurrent writers never interleave partial records.
+
+        Args:
+            obj_type: STIX object type
+            objects: STIX objects as dictionaries
+        """
+        if not objects:
+            return
+
+        payload = ''.join(
+            dumps(obj) + '\n' for obj in objects
+        ).encode('utf-8')
+
+        with self._lock:
+            # Make sure a legacy file is migrated before the log is created
+            self._refresh_index(obj_type)
+            before = self._signature(obj_type)
+            entry = self._memory.get(obj_type)
+
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd = os.open(self._log_path(obj_type), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                written = 0
+                while written < len(payload):
+                    written += os.write(fd, payload[written:])
+            finally:
+                os.close(fd)
+
+            # Extend the in-memory copy if nobody else touched the file; the
+            # records are parsed back from the payload so they share nothing
+            # with the caller's objects
+            after = self._signature(obj_type)
+            if entry is not None and entry[0] == before and after is not None \
+                    and before is not None and after[1] == before[1] + len(payload):
+                self._memory_put(obj_type, after, entry[1] + [loads(line) for line in payload.splitlines()])
+            else:
+                self._memory_drop(obj_type)
+
+    def clear(self) -> None:
+        """Drop all in-memory indexes and parsed objects so they are rebuilt from disk."""
+        with self._lock:
+            self._indexes.clear()
+            self._memory.clear()
+            self._memory_objects = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get in-memory cache counters for monitoring.
+
+        Returns:
+            Dictionary of hit/miss counters and current occupancy
+        """
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+                "types": len(self._memory),
+                "objects": self._memory_objects,
+                "max_types": self.max_types,
+                "max_objects": self.max_objects
+            }
+
+_caches: Dict[str, ObjectCache] = {}
+_caches_lock = threading.Lock()
+
+def get_object_cache(cache_dir: str = CACHE_DIR) -> ObjectCache:
+    """
+    Get the shared object cache for a directory.
+
+    Args:
+        cache_dir: Cache directory
+
+    Returns:
+        Object cache instance
+    """
+    key = os.path.abspath(cache_dir)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = ObjectCache(cache_dir)
+        return _caches[key]
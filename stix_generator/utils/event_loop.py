@@ -0,0 +1,137 @@
+"""
+Long-lived background event loop for running generation coroutines.
+
+Flask views are synchronous, so instead of creating (and tearing down) an event
+loop per request they submit coroutines to one loop running in a daemon thread.
+Concurrent requests interleave their LLM waits on that loop, and pooled async
+HTTP clients stay bound to a single loop for the life of the process.
+
+Only I/O belongs on the loop: CPU-bound steps inside coroutines go through
+run_in_worker, and CPU-bound pipeline stages run in the request's own thread,
+so one large job does not stall the LLM waits of every other request.
+"""
+
+import asyncio
+import functools
+import threading
+from typing import Any, Callable, Coroutine, Optional
+
+from ..utils.logging_utils import setup_logger
+
+logger = setup_logger("stix_generator.event_loop")
+
+class BackgroundEventLoop:
+    """An asyncio event loop running forever in a daemon thread."""
+
+    def __init__(self, name: str = "stix-generator-loop"):
+        """
+        Initialize the background loop (started lazily on first use).
+
+        Args:
+            name: Name of the loop thread
+        """
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _run_forever(self, loop: asyncio.AbstractEventLoop, started: threading.Event) -> None:
+        """Thread target: run the loop until stopped."""
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        loop.run_forever()
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Get the running background loop, starting it if necessary.
+
+        Returns:
+            The background event loop
+        """
+        with self._lock:
+            if self._loop is None or self._loop.is_closed() or not self._thread.is_alive():
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run_forever, args=(loop, started), name=self.name, daemon=True
+                )
+                self._thread.start()
+                started.wait()
+                self._loop = loop
+                logger.info("Started background event loop")
+            return self._loop
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the background loop and wait for its result.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait before cancelling (None waits forever)
+
+        Returns:
+            The coroutine's result
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.get_loop())
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def stop(self) -> None:
+        """Cancel outstanding tasks, stop the loop and join its thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+
+        if loop is None or loop.is_closed():
+            return
+
+        async def _cancel_tasks():
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(_cancel_tasks(), loop).result(5)
+        except Exception as e:
+            logger.warning(f"Error cancelling background tasks: {str(e)}")
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        loop.close()
+        logger.info("Stopped background event loop")
+
+_background_loop = BackgroundEventLoop()
+
+def run_async(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine on the shared background event loop.
+
+    Args:
+        coro: Coroutine to run
+        timeout: Seconds to wait before cancelling (None waits forever)
+
+    Returns:
+        The coroutine's result
+    """
+    return _background_loop.run(coro, timeout)
+
+async def run_in_worker(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a blocking (CPU-bound) function in the loop's default executor.
+
+    Args:
+        func: Function to run
+        args: Positional arguments for func
+
+    Returns:
+        The function's result
+    """
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args))
+
+def shutdown_event_loop() -> None:
+    """Stop the shared background event loop."""
+    _background_loop.stop()
@@ -0,0 +1,257 @@
+"""
+Bulk providers for STIX identifiers and timestamps.
+
+IDs and timestamps are produced many at a time: UUIDs are cut from a single
+block of random bytes and timestamps are formatted from cached date strings,
+instead of calling uuid.uuid4() and strftime() once per object. Seeded
+providers yield the same sequence on every run.
+
+IDs that stand for content rather than for a draw (relationships, repaired
+objects) are derived from that content instead, so they are stable without
+repeating across runs that share a seed.
+"""
+
+import os
+import json
+import uuid
+import random
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from ..config import GENERATION_REFERENCE_TIME
+
+# Number of IDs generated per refill of a provider's buffer
+ID_BUFFER_SIZE = 1024
+
+# Namespace of content-derived (version 5) UUIDs
+CONTENT_ID_NAMESPACE = uuid.UUID("6f1c2bd0-8c53-4c1e-9a0e-3f4f1c7a5d21")
+
+_EPOCH = datetime(1970, 1, 1)
+_SECONDS_PER_DAY = 86400
+
+class IdProvider:
+    """Produces random (version 4) UUIDs and STIX IDs in bulk."""
+
+    def __init__(self, seed: Optional[Union[int, str]] = None):
+        """
+        Initialize the provider.
+
+        Args:
+            seed: Seed for a reproducible ID sequence (None for OS randomness)
+        """
+        self.seed = seed
+        self._rng = random.Random(seed) if seed is not None else None
+        self._buffer: List[str] = []
+
+    def _random_bytes(self, count: int) -> bytes:
+        if self._rng is None:
+            return os.urandom(count)
+        return self._rng.getrandbits(count * 8).to_bytes(count, 'big')
+
+    def uuids(self, count: int) -> List[str]:
+        """
+        Generate UUIDs.
+
+        Args:
+            count: Number of UUIDs
+
+        Returns:
+            List of UUID strings
+        """
+        if count <= 0:
+            return []
+
+        raw = bytearray(self._random_bytes(16 * count))
+        # Set the version (4) and variant (RFC 4122) bits of every UUID at once
+        raw[6::16] = bytes((b & 0x0F) | 0x40 for b in raw[6::16])
+        raw[8::16] = bytes((b & 0x3F) | 0x80 for b in raw[8::16])
+
+        text = raw.hex()
+        return [
+            f"{text[i:i + 8]}-{text[i + 8:i + 12]}-{text[i + 12:i + 16]}-{text[i + 16:i + 20]}-{text[i + 20:i + 32]}"
+            for i in range(0, 32 * count, 32)
+        ]
+
+    def stix_ids(self, obj_type: str, count: int) -> List[str]:
+        """
+        Generate STIX IDs of one type.
+
+        Args:
+            obj_type: STIX object type
+            count: Number of IDs
+
+        Returns:
+            List of STIX IDs
+        """
+        prefix = f"{obj_type}--"
+        return [prefix + value for value in self.uuids(count)]
+
+    def uuid(self) -> str:
+        """
+        Get a single UUID from the provider's buffer, refilling it in bulk.
+
+        Returns:
+            UUID string
+        """
+        if not self._buffer:
+            self._buffer = self.uuids(ID_BUFFER_SIZE)
+            self._buffer.reverse()
+        return self._buffer.pop()
+
+    def stix_id(self, obj_type: str) -> str:
+        """
+        Get a single STIX ID.
+
+        Args:
+            obj_type: STIX object type
+
+        Returns:
+            STIX ID
+        """
+        return f"{obj_type}--{self.uuid()}"
+
+def content_stix_id(obj_type: str, *parts: Any) -> str:
+    """
+    Derive a STIX ID from content.
+
+    Args:
+        obj_type: STIX object type
+        parts: Values identifying the object
+
+    Returns:
+        STIX ID, the same for the same type and parts on every run
+    """
+    name = "\x1f".join(str(part) for part in (obj_type, *parts))
+    return f"{obj_type}--{uuid.uuid5(CONTENT_ID_NAMESPACE, name)}"
+
+def relationship_stix_id(source_ref: str, relationship_type: str, target_ref: str) -> str:
+    """
+    Derive the ID of a relationship from its endpoints and type.
+
+    Args:
+        source_ref: Source object ID
+        relationship_type: Type of relationship
+        target_ref: Target object ID
+
+    Returns:
+        Relationship ID
+    """
+    return content_stix_id("relationship", source_ref, relationship_type, target_ref)
+
+def object_stix_id(obj_type: str, obj: Dict[str, Any], salt: int = 0) -> str:
+    """
+    Derive the ID of an object from its properties (other than its ID).
+
+    Args:
+        obj_type: STIX object type
+        obj: STIX object as dictionary
+        salt: Varies the ID of objects whose properties are identical
+
+    Returns:
+        STIX ID
+    """
+    content = json.dumps({key: value for key, value in obj.items() if key != 'id'}, sort_keys=True, default=str)
+    return content_stix_id(obj_type, content, salt)
+
+def bundle_stix_id(seed: Optional[Union[int, str]], object_ids: Iterable[str]) -> str:
+    """
+    Derive the ID of a bundle from the run seed and the IDs of its objects.
+
+    Args:
+        seed: Seed of the generation run
+        object_ids: IDs of the bundled objects, in bundle order
+
+    Returns:
+        Bundle ID, the same for the same seed and objects on every run
+    """
+    return content_stix_id("bundle", seed, *object_ids)
+
+class TimestampProvider:
+    """Formats STIX timestamps in bulk, optionally against a fixed reference time."""
+
+    def __init__(self, reference_time: Optional[datetime] = None):
+        """
+        Initialize the provider.
+
+        Args:
+            reference_time: Time returned by now() (None for the wall clock)
+        """
+        self.reference_time = reference_time
+        self._dates = {}
+
+    def _date(self, day: int) -> str:
+        date = self._dates.get(day)
+        if date is None:
+            date = self._dates[day] = datetime.fromtimestamp(day * _SECONDS_PER_DAY, tz=timezone.utc).strftime("%Y-%m-%d")
+        return date
+
+    def format(self, seconds: int) -> str:
+        """
+        Format seconds since the Unix epoch as a STIX timestamp.
+
+        Args:
+            seconds: Seconds since the epoch (UTC)
+
+        Returns:
+            Timestamp string
+        """
+        day, second = divmod(int(seconds), _SECONDS_PER_DAY)
+        hour, second = divmod(second, 3600)
+        minute, second = divmod(second, 60)
+        return f"{self._date(day)}T{hour:02d}:{minute:02d}:{second:02d}.000Z"
+
+    def format_many(self, seconds: List[int]) -> List[str]:
+        """
+        Format many epoch offsets as STIX timestamps.
+
+        Args:
+            seconds: Seconds since the epoch (UTC)
+
+        Returns:
+            List of timestamp strings
+        """
+        return [self.format(value) for value in seconds]
+
+    def random(self, rng: random.Random, count: int, start: datetime, end: datetime) -> List[str]:
+        """
+        Draw timestamps uniformly from a window.
+
+        Args:
+            rng: Random number generator to draw from
+            count: Number of timestamps
+            start: Start of the window (naive UTC)
+            end: End of the window (naive UTC)
+
+        Returns:
+            List of timestamp strings
+        """
+        low = int((start - _EPOCH).total_seconds())
+        span = max(1, int((end - start).total_seconds()))
+        return self.format_many([low + rng.randrange(span) for _ in range(count)])
+
+    def now(self) -> str:
+        """
+        Get the current (or reference) time as a STIX timestamp.
+
+        Returns:
+            Timestamp string
+        """
+        if self.reference_time is not None:
+            moment = self.reference_time
+        else:
+            moment = datetime.now(timezone.utc).replace(tzinfo=None)
+        return self.format(int((moment - _EPOCH).total_seconds()))
+
+def get_reference_time() -> Optional[datetime]:
+    """
+    Get the configured reference time for generated timestamps.
+
+    Returns:
+        GENERATION_REFERENCE_TIME as a naive UTC datetime, or None if unset
+    """
+    if not GENERATION_REFERENCE_TIME:
+        return None
+    moment = datetime.fromisoformat(GENERATION_REFERENCE_TIME.replace('Z', '+00:00'))
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
@@ -2,26 +2,33 @@
 STIX quality metrics calculation module.
 """
 
-import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 
 from ..utils.logging_utils import setup_logger
+from ..core.graph import RelationshipGraph
+from .serialization import loads
 
 logger = setup_logger("stix_generator.metrics")
 
-def analyze_stix_bundle(stix_bundle: str) -> Dict[str, Any]:
+def analyze_stix_bundle(
+    stix_bundle: Union[str, Dict[str, Any]], graph: Optional[RelationshipGraph] = None
+) -> Dict[str, Any]:
     """
     Analyze a STIX bundle and calculate quality metrics.
     
     Args:
-        stix_bundle: STIX bundle in JSON string format
+        stix_bundle: STIX bundle in JSON string format, or as a dictionary whose
+            objects are dictionaries or stix2 objects (so no JSON is needed)
+        graph: Relationship graph holding exactly the bundle's relationships, if
+            the caller already has one (otherwise it is built from the bundle's
+            relationship objects)
         
     Returns:
         Dictionary of metrics
     """
     try:
         # Parse the STIX bundle
-        bundle_data = json.loads(stix_bundle)
+        bundle_data = loads(stix_bundle) if isinstance(stix_bundle, str) else stix_bundle
         objects = bundle_data.get('objects', [])
         
         if not objects:
@@ -44,7 +51,8 @@ def analyze_stix_bundle(stix_bundle: str) -> Dict[str, Any]:
                 "advanced_metrics": {
                     "object_connectivity": 0.0,
                     "relationship_diversity": 0.0,
-                    "narrative_coherence": 0.0
+                    "narrative_coherence": 0.0,
+                    "largest_component": 0.0
                 },
                 "recommendations": []
             }
@@ -52,8 +60,6 @@ def analyze_stix_bundle(stix_bundle: str) -> Dict[str, Any]:
         # Basic metrics
         total_objects = len(objects)
         object_types = {}
-        relationship_types = {}
-        relationship_count = 0
         domain_objects = 0
         
         # Analyze objects
@@ -63,14 +69,17 @@ def analyze_stix_bundle(stix_bundle: str) -> Dict[str, Any]:
             # Track object types
             object_types[obj_type] = object_types.get(obj_type, 0) + 1
             
-            # Count relationships
-            if obj_type == 'relationship':
-                relationship_count += 1
-                rel_type = obj.get('relationship_type', 'unknown')
-                relationship_types[rel_type] = relationship_types.get(rel_type, 0) + 1
-            else:
+            if obj_type != 'relationship':
                 domain_objects += 1
         
+        # Relationship statistics come from the compact graph
+        if graph is None:
+            graph = RelationshipGraph.from_relationships(
+                (obj for obj in objects if obj.get('type') == 'relationship'), objects
+            )
+        relationship_count = len(graph)
+        relationship_types = graph.relationship_type_counts()
+        
         # Calculate relationship density (relationships per domain object)
         relationship_density = relationship_count / domain_objects if domain_objects > 0 else 0
         
@@ -94,23 +103,15 @@ def analyze_stix_bundle(stix_bundle: str) -> Dict[str, Any]:
         completeness_score = (complete_objects / total_objects * 100) if total_objects > 0 else 0
         
         # Calculate consistency score based on reference validity
-        valid_references = 0
-        total_references = 0
-        
         all_ids = set(obj.get('id', '') for obj in objects)
         
-        for obj in objects:
-            if obj.get('type') == 'relationship':
-                total_references += 2  # source_ref and target_ref
-                
-                source_ref = obj.get('source_ref', '')
-                target_ref = obj.get('target_ref', '')
-                
-                if source_ref in all_ids:
-                    valid_references += 1
-                    
-                if target_ref in all_ids:
-                    valid_references += 1
+        # Check each distinct endpoint once, then count references by node index
+        known_nodes = [node_id in all_ids for node_id in graph.ids]
+        total_references = 2 * relationship_count  # source_ref and target_ref
+        valid_references = (
+            sum(known_nodes[source] for source in graph.sources) +
+            sum(known_nodes[target] for target in graph.targets)
+        )
         
         consistency_score = (valid_references / total_references * 100) if total_references > 0 else 100
         
@@ -118,6 +119,10 @@ def analyze_stix_bundle(stix_bundle: str) -> Dict[str, Any]:
         relationship_diversity = len(relationship_types) / len(object_types) if object_types else 0
         relationship_score = min(100, (relationship_density * 10 + relationship_diversity * 5) * 10)
         
+        # Share of domain objects in the largest connected component
+        components = graph.components()
+        largest_component = (components[0] / graph.node_count * 100) if components else 0
+        
         # Overall quality score
         quality_score = (completeness_score * 0.4 + consistency_score * 0.3 + relationship_score * 0.3)
         
@@ -154,7 +159,8 @@ def analyze_stix_bundle(stix_bundle: str) -> Dict[str, Any]:
             "advanced_metrics": {
                 "object_connectivity": round(relationship_density * 100, 1),
                 "relationship_diversity": round(relationship_diversity * 100, 1),
-                "narrative_coherence": round(consistency_score * 0.8, 1)  # Simplified estimate
+                "narrative_coherence": round(consistency_score * 0.8, 1),  # Simplified estimate
+                "largest_component": round(largest_component, 1)
             },
             "recommendations": recommendations
         }
@@ -179,7 +185,8 @@ def analyze_stix_bundle(stix_bundle: str) -> Dict[str, Any]:
             "advanced_metrics": {
                 "object_connectivity": 0.0,
                 "relationship_diversity": 0.0,
-                "narrative_coherence": 0.0
+                "narrative_coherence": 0.0,
+                "largest_component": 0.0
             },
             "recommendations": ["Error analyzing STIX bundle"]
         }
\ No newline at end of file
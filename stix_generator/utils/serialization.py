@@ -0,0 +1,118 @@
+"""
+Fast JSON serialization for bulk output.
+
+Objects are serialized straight from their properties instead of through
+stix2's per-object serialize(), and with orjson when it is installed (it is
+an optional dependency; the standard json module is used otherwise). stix2
+objects and plain dictionaries can be mixed freely.
+"""
+
+import json
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Dict
+
+from stix2.utils import format_datetime
+
+from ..config import FAST_SERIALIZATION
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Indentation of pretty-printed output. orjson only indents by two spaces, so
+# the json module fallback uses two spaces as well (and leaves non-ASCII
+# characters unescaped, like orjson) to give the same output either way
+INDENT = 2
+
+def _stix_default(value: Any) -> Any:
+    """Convert values the JSON encoders do not handle natively."""
+    if isinstance(value, datetime):
+        return format_datetime(value)
+    if isinstance(value, Mapping):
+        # stix2 objects: leave out optional properties that were only defaulted,
+        # as stix2's own serialization does
+        defaulted = getattr(value, '_defaulted_optional_properties', ())
+        return {key: item for key, item in value.items() if key not in defaulted}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(obj: Any, pretty: bool = False) -> str:
+    """
+    Serialize a STIX object, dictionary or list to JSON.
+
+    Args:
+        obj: Value to serialize (may contain stix2 objects and datetimes)
+        pretty: Whether to format the JSON with indentation
+
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        option = orjson.OPT_PASSTHROUGH_DATETIME
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_stix_default, option=option).decode('utf-8')
+    if pretty:
+        return json.dumps(obj, default=_stix_default, indent=INDENT, ensure_ascii=False)
+    return json.dumps(obj, default=_stix_default, separators=(',', ':'), ensure_ascii=False)
+
+def loads(text: Any) -> Any:
+    """
+    Parse JSON.
+
+    Args:
+        text: JSON string or bytes
+
+    Returns:
+        Parsed value
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, Mapping):
+        return {key: _plain(item) for key, item in _stix_default(value).items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return _stix_default(value)
+
+def to_dict(obj: Any) -> Dict[str, Any]:
+    """
+    Convert a STIX object to a plain dictionary.
+
+    Equivalent to json.loads(obj.serialize()) for stix2 objects, but without
+    producing and parsing JSON. Dictionaries are returned unchanged.
+
+    Args:
+        obj: stix2 object or dictionary
+
+    Returns:
+        Dictionary with JSON-compatible values
+    """
+    if isinstance(obj, dict):
+        return obj
+    if not FAST_SERIALIZATION:
+        return json.loads(obj.serialize())
+    return _plain(obj)
+
+def serialize_object(obj: Any, pretty: bool = False) -> str:
+    """
+    Serialize one STIX object (stix2 object or dictionary) to JSON.
+
+    Uses the fast path unless FAST_SERIALIZATION is disabled, in which case
+    stix2 objects serialize themselves.
+
+    Args:
+        obj: stix2 object or dictionary
+        pretty: Whether to format the JSON with indentation
+
+    Returns:
+        JSON string
+    """
+    if not FAST_SERIALIZATION and hasattr(obj, 'serialize'):
+        return obj.serialize(pretty=pretty)
+    return dumps(obj, pretty)
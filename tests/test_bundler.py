@@ -0,0 +1,96 @@
+import io
+import json
+
+import pytest
+
+from stix_generator.core.bundler import _read_bundle_stream, merge_bundle_files
+
+OBJECTS = [
+    {"type": "indicator", "id": "indicator--1", "pattern": "[file:name = 'a]}b.exe']", "modified": "2024-01-01T00:00:00Z"},
+    {"type": "note", "id": "note--1", "content": "braces { } and brackets [ ] inside \"strings\"", "object_refs": ["indicator--1"]},
+    {"type": "malware", "id": "malware--1", "name": "マルウェア", "is_family": False},
+]
+
+
+def _bundle(objects, pretty=False, bundle_id="bundle--1"):
+    bundle = {"type": "bundle", "id": bundle_id, "objects": objects}
+    return json.dumps(bundle, indent=4 if pretty else None)
+
+
+@pytest.mark.parametrize("pretty", [False, True])
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 16, 61, 4096])
+def test_stream_reader_decodes_objects_split_across_chunks(pretty, chunk_size):
+    stream = io.StringIO(_bundle(OBJECTS, pretty))
+
+    assert list(_read_bundle_stream(stream, chunk_size)) == OBJECTS
+
+
+def test_stream_reader_finds_objects_after_other_envelope_fields():
+    text = '{"id": "bundle--1", "spec_version": "2.1", "type": "bundle", "objects": [' + json.dumps(OBJECTS[0]) + ']}'
+
+    assert list(_read_bundle_stream(io.StringIO(text), 5)) == OBJECTS[:1]
+
+
+def test_stream_reader_handles_an_empty_objects_array():
+    assert list(_read_bundle_stream(io.StringIO(_bundle([])), 3)) == []
+
+
+def test_stream_reader_rejects_a_truncated_bundle():
+    text = _bundle(OBJECTS)[:-10]
+
+    with pytest.raises(ValueError):
+        list(_read_bundle_stream(io.StringIO(text), 8))
+
+
+def _merge(*bundles):
+    output = io.StringIO()
+    stats = merge_bundle_files([io.StringIO(bundle) for bundle in bundles], output, pretty=False)
+    return stats, json.loads(output.getvalue())["objects"]
+
+
+def test_merge_keeps_the_latest_version_of_each_object():
+    old = {"type": "malware", "id": "malware--1", "name": "old", "modified": "2024-01-02T00:00:00.000Z"}
+    new = dict(old, name="new", modified="2024-03-01T00:00:00.000Z")
+
+    stats, merged = _merge(_bundle([new]), _bundle([old]))
+    assert merged == [new]
+    assert stats == {"inputs": 2, "objects_read": 2, "objects_written": 1}
+
+    _, merged = _merge(_bundle([old]), _bundle([new]))
+    assert merged == [new]
+
+
+def test_merge_compares_timestamps_of_different_precision():
+    coarse = {"type": "tool", "id": "tool--1", "name": "coarse", "modified": "2024-01-01T00:00:00.5Z"}
+    fine = dict(coarse, name="fine", modified="2024-01-01T00:00:00.123Z")
+
+    _, merged = _merge(_bundle([coarse]), _bundle([fine]))
+    assert merged == [coarse]
+
+
+def test_merge_keeps_the_position_where_an_id_was_first_seen():
+    first = [
+        {"type": "tool", "id": "tool--1", "name": "a", "modified": "2024-01-01T00:00:00Z"},
+        {"type": "tool", "id": "tool--2", "name": "b", "modified": "2024-01-01T00:00:00Z"},
+    ]
+    second = [
+        {"type": "tool", "id": "tool--3", "name": "c", "modified": "2024-01-01T00:00:00Z"},
+        dict(first[0], name="a2", modified="2024-02-01T00:00:00Z"),
+    ]
+
+    _, merged = _merge(_bundle(first), _bundle(second))
+    assert [obj["id"] for obj in merged] == ["tool--1", "tool--2", "tool--3"]
+    assert merged[0]["name"] == "a2"
+
+
+def test_merge_accepts_file_paths(tmp_path):
+    paths = []
+    for i, objects in enumerate([OBJECTS[:2], OBJECTS[1:]]):
+        path = tmp_path / f"bundle_{i}.json"
+        path.write_text(_bundle(objects, pretty=True), encoding="utf-8")
+        paths.append(str(path))
+    destination = tmp_path / "merged.json"
+
+    stats = merge_bundle_files(paths, str(destination))
+    assert stats["objects_written"] == len(OBJECTS)
+    assert json.loads(destination.read_text(encoding="utf-8"))["objects"] == OBJECTS
@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+
+import pytest
+
+from stix_generator.core.validator import normalize_stix_object
+from stix_generator.utils.cache import ObjectCache
+
+OBSERVED = {
+    "type": "observed-data",
+    "id": "observed-data--6b2e3b5c-0d8e-4a9a-9f1e-1c2d3e4f5a6b",
+    "objects": {"0": {"type": "file", "name": "a.exe", "created": "2024-01-01T00:00:00Z"}},
+}
+
+
+def test_loaded_objects_do_not_share_nested_values_with_the_cache(tmp_path):
+    cache = ObjectCache(str(tmp_path))
+    cache.save_many("observed-data", [OBSERVED])
+
+    loaded = cache.load("observed-data")[0]
+    loaded["objects"]["0"]["name"] = "changed.exe"
+
+    assert cache.load("observed-data")[0]["objects"]["0"]["name"] == "a.exe"
+
+
+def test_saved_objects_do_not_share_nested_values_with_the_cache(tmp_path):
+    cache = ObjectCache(str(tmp_path))
+    cache.load("observed-data")
+    saved = {**OBSERVED, "objects": {"0": dict(OBSERVED["objects"]["0"])}}
+    cache.save_many("observed-data", [saved])
+
+    saved["objects"]["0"]["name"] = "changed.exe"
+
+    assert cache.load("observed-data")[0]["objects"]["0"]["name"] == "a.exe"
+
+
+def test_normalizing_a_loaded_object_leaves_the_cache_intact(tmp_path):
+    cache = ObjectCache(str(tmp_path))
+    cache.save_many("observed-data", [OBSERVED])
+
+    loaded = cache.load("observed-data")[0]
+    assert "objects" in normalize_stix_object(loaded)
+    assert "created" not in loaded["objects"]["0"]
+
+    assert cache.load("observed-data")[0]["objects"]["0"]["created"] == "2024-01-01T00:00:00Z"
+
+
+def _objects(count, prefix="tool"):
+    return [{"type": "tool", "id": f"{prefix}--{i}", "name": f"{prefix} {i}"} for i in range(count)]
+
+
+def test_legacy_json_cache_is_migrated_to_the_log(tmp_path):
+    objects = _objects(3)
+    (tmp_path / "tool.json").write_text(json.dumps(objects), encoding="utf-8")
+    cache = ObjectCache(str(tmp_path))
+
+    assert cache.load("tool") == objects
+    assert (tmp_path / "tool.jsonl").read_text(encoding="utf-8").splitlines() == [
+        json.dumps(obj, separators=(",", ":")) for obj in objects
+    ]
+
+    cache.save_many("tool", _objects(1, "new"))
+    assert [obj["id"] for obj in ObjectCache(str(tmp_path)).load("tool")] == [
+        "tool--0", "tool--1", "tool--2", "new--0"
+    ]
+
+
+def test_partial_trailing_line_is_ignored_until_it_is_complete(tmp_path):
+    cache = ObjectCache(str(tmp_path))
+    cache.save_many("tool", _objects(2))
+    log_path = tmp_path / "tool.jsonl"
+    record = json.dumps(_objects(3)[2]).encode("utf-8")
+
+    with open(log_path, "ab") as f:
+        f.write(record[:10])
+    assert cache.count("tool") == 2
+    assert [obj["id"] for obj in cache.load("tool")] == ["tool--0", "tool--1"]
+
+    with open(log_path, "ab") as f:
+        f.write(record[10:] + b"\n")
+    assert cache.count("tool") == 3
+    assert cache.load("tool")[2]["id"] == "tool--2"
+
+
+def test_index_is_rebuilt_after_truncation(tmp_path):
+    cache = ObjectCache(str(tmp_path))
+    cache.save_many("tool", _objects(5))
+    assert cache.count("tool") == 5
+
+    log_path = tmp_path / "tool.jsonl"
+    lines = log_path.read_bytes().splitlines(keepends=True)
+    with open(log_path, "wb") as f:
+        f.writelines(lines[:2])
+
+    assert cache.count("tool") == 2
+    assert [obj["id"] for obj in cache.load("tool")] == ["tool--0", "tool--1"]
+
+
+def test_index_is_rebuilt_after_the_log_is_replaced(tmp_path):
+    cache = ObjectCache(str(tmp_path))
+    cache.save_many("tool", _objects(2))
+    assert cache.count("tool") == 2
+
+    # A longer file swapped in under the same name must not be read as an append
+    replacement = tmp_path / "replacement.jsonl"
+    replacement.write_text("".join(json.dumps(obj) + "\n" for obj in _objects(4, "other")), encoding="utf-8")
+    os.replace(replacement, tmp_path / "tool.jsonl")
+
+    assert cache.count("tool") == 4
+    assert [obj["id"] for obj in cache.load("tool")] == [f"other--{i}" for i in range(4)]
+
+
+@pytest.mark.parametrize("max_objects", [100, 3])
+def test_load_returns_the_first_objects_in_insertion_order(tmp_path, max_objects):
+    cache = ObjectCache(str(tmp_path), max_objects=max_objects)
+    cache.save_many("tool", _objects(3))
+    cache.save_many("tool", _objects(3, "later"))
+
+    assert [obj["id"] for obj in cache.load("tool", limit=4)] == ["tool--0", "tool--1", "tool--2", "later--0"]
+    assert [obj["id"] for obj in cache.load("tool", limit=0)] == []
+    assert len(cache.load("tool")) == 6
+
+
+def test_concurrent_saves_never_interleave_records(tmp_path):
+    cache = ObjectCache(str(tmp_path))
+    batches = [_objects(50, f"writer{i}") for i in range(8)]
+    threads = [threading.Thread(target=cache.save_many, args=("tool", batch)) for batch in batches]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    loaded = ObjectCache(str(tmp_path)).load("tool")
+    assert len(loaded) == 400
+    # Each batch is written with a single append, so it stays contiguous
+    writers = [obj["id"].split("--")[0] for obj in loaded]
+    assert [writers[i] for i in range(0, 400, 50)] == [writers[i + 49] for i in range(0, 400, 50)]
+    assert len(set(writers[::50])) == 8
@@ -0,0 +1,74 @@
+from stix_generator.core.graph import RelationshipGraph
+from stix_generator.utils.ids import relationship_stix_id
+from stix_generator.utils.metrics import analyze_stix_bundle
+
+ACTOR = "threat-actor--0a1b2c3d-4e5f-4a6b-8c7d-9e0f1a2b3c4d"
+MALWARE = "malware--1a1b2c3d-4e5f-4a6b-8c7d-9e0f1a2b3c4d"
+TOOL = "tool--2a1b2c3d-4e5f-4a6b-8c7d-9e0f1a2b3c4d"
+PATTERN = "attack-pattern--3a1b2c3d-4e5f-4a6b-8c7d-9e0f1a2b3c4d"
+
+
+def _graph():
+    graph = RelationshipGraph()
+    graph.add_objects([
+        {"type": "threat-actor", "id": ACTOR, "name": "APT"},
+        {"type": "malware", "id": MALWARE, "name": "Emotet"},
+        {"type": "tool", "id": TOOL, "name": "Mimikatz"},
+        {"type": "attack-pattern", "id": PATTERN, "name": "Phishing"},
+    ])
+    graph.add_edge(ACTOR, MALWARE, "uses", template=0)
+    graph.add_edge(ACTOR, TOOL, "uses", description="explicit")
+    return graph
+
+
+def test_duplicate_edges_are_rejected():
+    graph = _graph()
+
+    assert not graph.add_edge(ACTOR, MALWARE, "uses")
+    assert graph.add_edge(ACTOR, MALWARE, "targets")
+    assert graph.add_edge(MALWARE, ACTOR, "uses")
+    assert len(graph) == 4
+    assert graph.has_edge(ACTOR, MALWARE, "uses")
+    assert not graph.has_edge(MALWARE, TOOL, "uses")
+
+
+def test_edge_keys_do_not_collide_for_large_node_indexes():
+    graph = RelationshipGraph()
+    ids = [f"indicator--{i}" for i in range(70000)]
+    for obj_id in ids:
+        graph.add_node(obj_id)
+
+    assert graph.add_edge(ids[1], ids[65536], "indicates")
+    assert graph.add_edge(ids[65537], ids[0], "indicates")
+    assert graph.add_edge(ids[1], ids[0], "indicates")
+    assert len(graph) == 3
+
+
+def test_relationship_ids_are_stable_across_runs_and_distinct_per_edge():
+    first, second = list(_graph().iter_dicts()), list(_graph().iter_dicts())
+
+    assert [rel["id"] for rel in first] == [rel["id"] for rel in second]
+    assert first[0]["id"] == relationship_stix_id(ACTOR, "uses", MALWARE)
+    assert len({rel["id"] for rel in first}) == len(first)
+    assert first[0]["description"] == "APT utilizes Emotet in their operations"
+    assert first[1]["description"] == "explicit"
+
+
+def test_explicit_edge_ids_are_kept():
+    graph = RelationshipGraph.from_relationships([{
+        "id": "relationship--4a1b2c3d-4e5f-4a6b-8c7d-9e0f1a2b3c4d",
+        "source_ref": ACTOR, "target_ref": PATTERN, "relationship_type": "uses",
+    }])
+
+    assert graph.to_dicts()[0]["id"] == "relationship--4a1b2c3d-4e5f-4a6b-8c7d-9e0f1a2b3c4d"
+
+
+def test_components_and_largest_component():
+    graph = _graph()
+
+    assert graph.components() == [3, 1]
+
+    objects = [{"type": graph.node_type(i), "id": obj_id} for i, obj_id in enumerate(graph.ids)]
+    metrics = analyze_stix_bundle({"type": "bundle", "objects": objects + graph.to_dicts()})
+    assert metrics["advanced_metrics"]["largest_component"] == 75.0
+    assert metrics["basic_metrics"]["summary"]["relationship_count"] == 2
@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+
+from stix_generator.api.jobs import JobManager, JobQueueFullError
+
+
+def _wait_for(job, statuses=("completed", "failed"), timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while job.to_dict()["status"] not in statuses:
+        assert time.monotonic() < deadline, f"job stuck in {job.to_dict()['status']}"
+        time.sleep(0.01)
+    return job.to_dict()
+
+
+def test_submissions_beyond_the_queue_are_rejected_until_a_job_finishes():
+    manager = JobManager(max_workers=1, max_queued=1)
+    release = threading.Event()
+
+    def blocking(job):
+        release.wait(5)
+        return {"filename": job.id}
+
+    running = manager.submit({}, {"malware": 1}, blocking)
+    queued = manager.submit({}, {"malware": 1}, blocking)
+    with pytest.raises(JobQueueFullError):
+        manager.submit({}, {"malware": 1}, blocking)
+    assert len(manager.list()) == 2
+
+    release.set()
+    assert _wait_for(running)["status"] == "completed"
+    assert _wait_for(queued)["status"] == "completed"
+
+    later = manager.submit({}, {"malware": 1}, blocking)
+    assert _wait_for(later)["filename"] == later.id
+
+
+def test_zero_max_queued_accepts_any_number_of_jobs():
+    manager = JobManager(max_workers=1, max_queued=0)
+    jobs = [manager.submit({}, {}, lambda job: {}) for _ in range(10)]
+
+    assert [_wait_for(job)["status"] for job in jobs] == ["completed"] * 10
+
+
+def test_job_outcomes_are_recorded_with_status_and_phase():
+    manager = JobManager(max_workers=1)
+
+    def failing(job):
+        job.set_phase("generating_objects")
+        raise RuntimeError("no objects")
+
+    completed = manager.submit({}, {"tool": 2}, lambda job: {"filename": "bundle.json"})
+    failed = manager.submit({}, {"tool": 2}, failing)
+
+    completed_status = _wait_for(completed)
+    assert (completed_status["status"], completed_status["phase"]) == ("completed", "done")
+    assert completed_status["filename"] == "bundle.json"
+
+    failed_status = _wait_for(failed)
+    assert (failed_status["status"], failed_status["phase"]) == ("failed", "failed")
+    assert failed_status["error"] == "no objects"
+    assert manager.get(failed.id) is failed
+
+
+def test_job_routes_answer_429_when_the_queue_is_full(monkeypatch):
+    from flask import Flask
+
+    from stix_generator.api import routes
+
+    def full(*args, **kwargs):
+        raise JobQueueFullError("Job queue is full (12 jobs pending)")
+
+    monkeypatch.setattr(routes.job_manager, "submit", full)
+    app = Flask(__name__)
+    app.register_blueprint(routes.api_bp, url_prefix="/api")
+    client = app.test_client()
+
+    for path in ("/api/jobs", "/api/generate-stream"):
+        response = client.post(path, json={"counts": {"malware": 1}})
+        assert response.status_code == 429
+        assert response.get_json()["status"] == "error"
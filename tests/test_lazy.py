@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+import pytest
+
+from stix_generator.core.bundler import iter_bundle_json, iter_valid_objects
+from stix_generator.core.lazy import StixDict, canonical_stix_dict
+from stix_generator.core.object_generator import StixObjectGenerator
+from stix_generator.core.relationship_generator import RelationshipGenerator
+from stix_generator.core.validator import canonical_timestamp
+from stix_generator.utils import ids
+
+OBJECT_TYPES = [
+    "identity", "location", "vulnerability", "attack-pattern", "marking-definition",
+    "threat-actor", "malware", "tool", "course-of-action", "infrastructure", "malware-analysis",
+    "campaign", "intrusion-set", "indicator",
+    "observed-data", "report", "grouping", "incident", "sighting", "note", "opinion", "language-content",
+]
+
+
+def _bundle_json(construction_mode, seed):
+    generator = StixObjectGenerator(
+        api_key="", seed=seed, use_cache=False,
+        generation_mode="synthetic", construction_mode=construction_mode
+    )
+    dataset = asyncio.run(generator.generate_dataset({obj_type: 4 for obj_type in OBJECT_TYPES}))
+    objects = list(generator.create_stix2_objects(dataset).values())
+
+    relationship_generator = RelationshipGenerator(api_key="", seed=seed, construction_mode=construction_mode)
+    result = asyncio.run(relationship_generator.generate_relationships(
+        [obj for type_objects in dataset.values() for obj in type_objects]
+    ))
+    relationships = relationship_generator.create_stix2_relationships(result["graph"].iter_dicts())
+
+    return "".join(iter_bundle_json(iter_valid_objects(objects, relationships), False, "bundle--1"))
+
+
+@pytest.mark.parametrize("seed", [9, 42])
+def test_lazy_and_eager_modes_serialize_identically(monkeypatch, seed):
+    monkeypatch.setattr(ids, "GENERATION_REFERENCE_TIME", "2024-01-01T00:00:00Z")
+
+    lazy = _bundle_json("lazy", seed)
+    eager = _bundle_json("eager", seed)
+
+    assert {obj["type"] for obj in json.loads(lazy)["objects"]} >= set(OBJECT_TYPES) | {"relationship"}
+    assert lazy == eager
+
+
+@pytest.mark.parametrize("value, millisecond, expected", [
+    ("2024-01-01T00:00:00Z", True, "2024-01-01T00:00:00.000Z"),
+    ("2024-01-01T00:00:00.000Z", True, "2024-01-01T00:00:00.000Z"),
+    ("2024-01-01T00:00:00.1Z", True, "2024-01-01T00:00:00.100Z"),
+    ("2024-01-01T00:00:00.123456Z", True, "2024-01-01T00:00:00.123456Z"),
+    ("2024-01-01T00:00:00.000Z", False, "2024-01-01T00:00:00Z"),
+    ("2024-01-01T00:00:00.120000Z", False, "2024-01-01T00:00:00.12Z"),
+    ("not a timestamp", False, "not a timestamp"),
+])
+def test_canonical_timestamp_matches_stix2_precision(value, millisecond, expected):
+    assert canonical_timestamp(value, millisecond) == expected
+
+
+def test_canonical_stix_dict_uses_the_stix2_layout():
+    obj = {
+        "x_custom": 1,
+        "name": "Campaign",
+        "revoked": False,
+        "labels": [],
+        "last_seen": "2024-02-01T00:00:00.000Z",
+        "id": "campaign--6b1e3a4c-2f7d-4c1e-9a3b-5d8e7f6a1b2c",
+        "type": "campaign",
+        "spec_version": "2.1",
+        "created": "2024-01-01T00:00:00Z",
+        "modified": "2024-01-01T00:00:00.000Z",
+    }
+
+    lazy_obj = canonical_stix_dict(obj)
+
+    assert isinstance(lazy_obj, StixDict)
+    assert list(lazy_obj.items()) == [
+        ("type", "campaign"),
+        ("spec_version", "2.1"),
+        ("id", "campaign--6b1e3a4c-2f7d-4c1e-9a3b-5d8e7f6a1b2c"),
+        ("created", "2024-01-01T00:00:00.000Z"),
+        ("modified", "2024-01-01T00:00:00.000Z"),
+        ("name", "Campaign"),
+        ("last_seen", "2024-02-01T00:00:00Z"),
+        ("x_custom", 1),
+    ]
+    assert list(json.loads(lazy_obj.to_stix2().serialize()).items()) == list(lazy_obj.items())
+    assert obj["last_seen"] == "2024-02-01T00:00:00.000Z"
@@ -0,0 +1,56 @@
+import os
+
+from stix_generator.llm.memo import MemoStore, make_memo_key
+
+
+def _keys(count):
+    return [make_memo_key("model", 0.0, f"prompt {i}", seed=i) for i in range(count)]
+
+
+def test_put_and_get_round_trip(tmp_path):
+    store = MemoStore(str(tmp_path), ttl=0, max_entries=10)
+    key = _keys(1)[0]
+
+    assert store.get(key) is None
+    store.put(key, {"objects": [1, 2]})
+    assert store.get(key) == {"objects": [1, 2]}
+
+
+def test_eviction_drops_the_least_recently_used_entries(tmp_path):
+    store = MemoStore(str(tmp_path), ttl=0, max_entries=10)
+    keys = _keys(11)
+    for key in keys[:10]:
+        store.put(key, key)
+    # Reading the oldest entry makes it the most recently used
+    assert store.get(keys[0]) == keys[0]
+
+    store.put(keys[10], keys[10])
+
+    assert store.get(keys[0]) == keys[0]
+    assert store.get(keys[1]) is None
+    assert store.get(keys[10]) == keys[10]
+    assert sum(len(files) for _, _, files in os.walk(tmp_path)) == 9
+
+
+def test_index_is_built_from_entries_already_on_disk(tmp_path):
+    keys = _keys(10)
+    first = MemoStore(str(tmp_path), ttl=0, max_entries=10)
+    for key in keys:
+        first.put(key, key)
+
+    second = MemoStore(str(tmp_path), ttl=0, max_entries=10)
+    second.put(make_memo_key("model", 0.0, "new"), "new")
+
+    assert sum(len(files) for _, _, files in os.walk(tmp_path)) == 9
+
+
+def test_expired_entries_are_not_served(tmp_path):
+    store = MemoStore(str(tmp_path), ttl=1, max_entries=10)
+    key = _keys(1)[0]
+    store.put(key, "value")
+    path = store._path(key)
+    with open(path, "w") as f:
+        f.write('{"created": 0, "value": "value"}')
+
+    assert store.get(key) is None
+    assert not os.path.exists(path)
@@ -0,0 +1,56 @@
+import json
+
+from stix_generator.api import routes
+from stix_generator.core.relationship_generator import RelationshipGenerator
+from stix_generator.utils.metrics import analyze_stix_bundle
+
+
+def test_metrics_count_only_the_relationships_in_the_bundle(monkeypatch, tmp_path):
+    convert = RelationshipGenerator.create_stix2_relationships
+
+    def convert_dropping_one(self, relationships):
+        # Stand-in for a relationship that fails stix2 conversion
+        return convert(self, relationships)[1:]
+
+    monkeypatch.setattr(routes, "OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(RelationshipGenerator, "create_stix2_relationships", convert_dropping_one)
+
+    result = routes.run_generation(
+        {"threat-actor": 3, "malware": 4, "tool": 3, "indicator": 4},
+        {},
+        seed=5,
+        use_cache=False,
+        generation_mode="synthetic",
+        filename="bundle.json"
+    )
+
+    with open(tmp_path / "bundle.json", encoding="utf-8") as f:
+        bundle = json.load(f)
+    relationship_types = {}
+    for obj in bundle["objects"]:
+        if obj["type"] == "relationship":
+            relationship_types[obj["relationship_type"]] = relationship_types.get(obj["relationship_type"], 0) + 1
+
+    basic_metrics = result["metrics"]["basic_metrics"]
+    assert relationship_types
+    assert basic_metrics["summary"]["relationship_count"] == sum(relationship_types.values())
+    assert basic_metrics["relationship_type_distribution"] == relationship_types
+
+
+def test_metrics_graph_is_built_from_the_bundle_relationships():
+    objects = [
+        {"type": "malware", "id": "malware--6b1e3a4c-2f7d-4c1e-9a3b-5d8e7f6a1b2c"},
+        {"type": "tool", "id": "tool--1c2d3e4f-5a6b-4c7d-8e9f-0a1b2c3d4e5f"},
+        {
+            "type": "relationship",
+            "id": "relationship--0f1e2d3c-4b5a-4968-8776-655443322110",
+            "relationship_type": "uses",
+            "source_ref": "malware--6b1e3a4c-2f7d-4c1e-9a3b-5d8e7f6a1b2c",
+            "target_ref": "tool--1c2d3e4f-5a6b-4c7d-8e9f-0a1b2c3d4e5f",
+        },
+    ]
+
+    summary = analyze_stix_bundle({"type": "bundle", "objects": objects})["basic_metrics"]["summary"]
+
+    assert summary["relationship_count"] == 1
+    assert summary["relationship_density"] == 0.5
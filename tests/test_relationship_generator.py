@@ -0,0 +1,38 @@
+import random
+
+from stix_generator.config import RELATIONSHIP_MAP
+from stix_generator.core.relationship_generator import RelationshipGenerator
+
+
+def _objects(count, seed=1):
+    rng = random.Random(seed)
+    types = sorted(RELATIONSHIP_MAP)
+    return [{"type": rng.choice(types), "id": f"object--{i}"} for i in range(count)]
+
+
+def test_partition_puts_every_object_in_exactly_one_chunk():
+    objects = _objects(1000)
+    chunks = RelationshipGenerator(api_key="")._partition_objects(objects, chunk_size=40)
+
+    shipped = [obj["id"] for chunk, _ in chunks for obj in chunk]
+    assert sorted(shipped) == sorted(obj["id"] for obj in objects)
+    assert len(chunks) == 25
+    assert all(len(chunk) <= 40 for chunk, _ in chunks)
+
+
+def test_partition_maps_only_the_types_in_each_chunk():
+    chunks = RelationshipGenerator(api_key="")._partition_objects(_objects(300), chunk_size=40)
+
+    for chunk, relationship_map in chunks:
+        present = {obj["type"] for obj in chunk}
+        assert set(relationship_map) <= present
+        for source_type, targets in relationship_map.items():
+            assert set(targets) <= present
+            for target_type, rel_types in targets.items():
+                assert rel_types == RELATIONSHIP_MAP[source_type][target_type]
+
+
+def test_small_sets_go_out_as_one_prompt():
+    objects = _objects(30)
+
+    assert RelationshipGenerator(api_key="")._partition_objects(objects, chunk_size=40) == [(objects, RELATIONSHIP_MAP)]
@@ -0,0 +1,93 @@
+import os
+import subprocess
+import sys
+
+from stix_generator.core.object_generator import StixObjectGenerator
+from stix_generator.utils.ids import IdProvider
+from stix_generator.utils.rng import derive_seed, spawn_rng
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _draws(rng, count=20):
+    return [rng.random() for _ in range(count)]
+
+
+def test_same_seed_and_keys_reproduce_the_same_stream():
+    assert _draws(spawn_rng(42, "malware", 3)) == _draws(spawn_rng(42, "malware", 3))
+    assert derive_seed(42, "malware", 3) == "42:malware:3"
+
+
+def test_different_seeds_or_keys_give_different_streams():
+    base = _draws(spawn_rng(42, "malware", 3))
+
+    assert _draws(spawn_rng(43, "malware", 3)) != base
+    assert _draws(spawn_rng(42, "tool", 3)) != base
+    assert _draws(spawn_rng(42, "malware", 4)) != base
+    assert _draws(spawn_rng(42, "malware")) != base
+
+
+def test_streams_do_not_affect_each_other():
+    first, other = spawn_rng(42, "a"), spawn_rng(42, "b")
+    expected = _draws(spawn_rng(42, "a"))
+
+    interleaved = []
+    for _ in range(20):
+        other.random()
+        interleaved.append(first.random())
+    assert interleaved == expected
+
+
+def test_seeded_id_providers_reproduce_the_same_ids():
+    first, second = IdProvider(derive_seed(42, "ids")), IdProvider(derive_seed(42, "ids"))
+
+    assert first.stix_ids("malware", 5) == second.stix_ids("malware", 5)
+    assert [first.stix_id("tool") for _ in range(3)] == [second.stix_id("tool") for _ in range(3)]
+
+
+def test_bulk_and_single_ids_follow_the_same_sequence():
+    bulk = IdProvider(7).uuids(1024)
+    single = IdProvider(7)
+
+    assert [single.uuid() for _ in range(1024)] == bulk
+
+
+def test_different_keys_give_different_ids():
+    ids = IdProvider(derive_seed(42, "ids")).stix_ids("malware", 100)
+
+    assert len(set(ids)) == 100
+    assert not set(ids) & set(IdProvider(derive_seed(42, "synthetic-ids")).stix_ids("malware", 100))
+    assert not set(ids) & set(IdProvider(derive_seed(43, "ids")).stix_ids("malware", 100))
+
+
+def test_ids_are_version_4_uuids():
+    for value in IdProvider(1).uuids(50):
+        assert value[14] == "4"
+        assert value[19] in "89ab"
+
+
+def test_ids_are_the_same_in_another_process():
+    code = (
+        "from stix_generator.utils.ids import IdProvider;"
+        "from stix_generator.utils.rng import derive_seed, spawn_rng;"
+        "print(IdProvider(derive_seed(42, 'ids')).stix_ids('malware', 3), spawn_rng(42, 'malware').random())"
+    )
+    env = dict(os.environ, PYTHONHASHSEED="123")
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+    expected = f"{IdProvider(derive_seed(42, 'ids')).stix_ids('malware', 3)} {spawn_rng(42, 'malware').random()}"
+    assert output == expected
+
+
+def test_each_object_type_has_its_own_synthesizer_stream():
+    alone = StixObjectGenerator(api_key="", seed=5, use_cache=False)
+    after_other_types = StixObjectGenerator(api_key="", seed=5, use_cache=False)
+    for obj_type in ("identity", "location", "attack-pattern"):
+        after_other_types._get_synthesizer(obj_type).generate(obj_type, 10)
+
+    assert (
+        alone._get_synthesizer("vulnerability").generate("vulnerability", 5)
+        == after_other_types._get_synthesizer("vulnerability").generate("vulnerability", 5)
+    )
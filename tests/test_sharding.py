@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from stix_generator.core.sharding import MIN_SHARD_SIZE, plan_shards
+
+
+def _random_dataset(seed, object_count, relationship_count):
+    rng = random.Random(seed)
+    object_ids = [f"indicator--{i}" for i in range(object_count)]
+    refs = [(rng.choice(object_ids), rng.choice(object_ids)) for _ in range(relationship_count)]
+    return object_ids, refs
+
+
+def _shard_sizes(plan):
+    return [
+        len(objects) + len(relationships)
+        for objects, relationships in zip(plan.shard_objects, plan.shard_relationships)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("max_shard_size", [MIN_SHARD_SIZE, 7, 50])
+def test_every_relationship_ships_with_both_endpoints(seed, max_shard_size):
+    object_ids, refs = _random_dataset(seed, 120, 200)
+    plan = plan_shards(object_ids, refs, max_shard_size)
+
+    for objects, relationships in zip(plan.shard_objects, plan.shard_relationships):
+        shard_ids = {object_ids[i] for i in objects}
+        for edge in relationships:
+            source_ref, target_ref = refs[edge]
+            assert source_ref in shard_ids
+            assert target_ref in shard_ids
+    assert plan.dangling_relationships == 0
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("max_shard_size", [MIN_SHARD_SIZE, 7, 50])
+def test_shards_respect_the_size_bound(seed, max_shard_size):
+    object_ids, refs = _random_dataset(seed, 120, 200)
+    plan = plan_shards(object_ids, refs, max_shard_size)
+
+    assert max(_shard_sizes(plan)) <= max_shard_size
+    assert plan.stats()["largest_shard"] <= max_shard_size
+
+
+def test_every_object_and_relationship_is_shipped():
+    object_ids, refs = _random_dataset(0, 80, 150)
+    plan = plan_shards(object_ids, refs, 10)
+
+    shipped_relationships = sorted(edge for edges in plan.shard_relationships for edge in edges)
+    assert shipped_relationships == list(range(len(refs)))
+    assert {i for objects in plan.shard_objects for i in objects} == set(range(len(object_ids)))
+    assert plan.duplicated_objects == plan.shipped_objects - len(object_ids)
+
+
+def test_components_that_fit_are_not_split():
+    # Three disjoint stars of four objects and three relationships each
+    object_ids = [f"malware--{i}" for i in range(12)]
+    refs = [(object_ids[hub], object_ids[hub + leaf]) for hub in (0, 4, 8) for leaf in (1, 2, 3)]
+    plan = plan_shards(object_ids, refs, 14)
+
+    assert plan.duplicated_objects == 0
+    assert plan.stats()["duplication_overhead"] == 0.0
+    for hub in (0, 4, 8):
+        component = set(range(hub, hub + 4))
+        assert any(component <= set(objects) for objects in plan.shard_objects)
+
+
+def test_relationships_to_unknown_objects_are_counted_as_dangling():
+    object_ids = ["tool--1", "tool--2"]
+    refs = [("tool--1", "tool--2"), ("tool--1", "malware--missing"), (None, "tool--2")]
+    plan = plan_shards(object_ids, refs, 5)
+
+    assert plan.dangling_relationships == 2
+    assert sorted(edge for edges in plan.shard_relationships for edge in edges) == [0, 1, 2]
+    assert max(_shard_sizes(plan)) <= 5
+
+
+def test_rejects_shards_too_small_for_a_relationship():
+    with pytest.raises(ValueError):
+        plan_shards(["tool--1"], [], MIN_SHARD_SIZE - 1)
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from stix_generator.core.context import ContextStore
+from stix_generator.core.object_generator import StixObjectGenerator
+from stix_generator.core.synthesizer import StixObjectSynthesizer
+from stix_generator.core.validator import check_stix_object
+
+# In generation-phase order, so references can point at earlier types
+OBJECT_TYPES = [
+    "identity", "location", "vulnerability", "attack-pattern", "marking-definition",
+    "threat-actor", "malware", "tool", "course-of-action", "infrastructure", "malware-analysis",
+    "campaign", "intrusion-set", "indicator",
+    "observed-data", "report", "grouping", "incident", "sighting", "note", "opinion", "language-content",
+]
+
+
+def _dangling_refs(objects):
+    ids = {obj["id"] for obj in objects}
+    dangling = []
+    for obj in objects:
+        for key, value in obj.items():
+            if key.endswith("_ref") and value not in ids:
+                dangling.append((obj["id"], key, value))
+            elif key.endswith("_refs"):
+                dangling.extend((obj["id"], key, ref) for ref in value if ref not in ids)
+    return dangling
+
+
+def _expanded_dataset(seed, seed_count=3, expand_count=20):
+    synthesizer = StixObjectSynthesizer(seed)
+    context = ContextStore()
+    objects = []
+    for obj_type in OBJECT_TYPES:
+        seeds = synthesizer.generate(obj_type, seed_count, context)
+        context.extend(seeds)
+        expanded = synthesizer.expand(obj_type, seeds, expand_count, context)
+        context.extend(expanded)
+        observables = synthesizer.take_observables()
+        context.extend(observables)
+        objects.extend(seeds + expanded + observables)
+    return objects
+
+
+@pytest.mark.parametrize("seed", [1, 42])
+def test_expanded_objects_pass_the_schema_check(seed):
+    objects = _expanded_dataset(seed)
+
+    assert {obj["type"] for obj in objects} >= set(OBJECT_TYPES)
+    assert [(obj["id"], check_stix_object(obj)) for obj in objects if check_stix_object(obj)] == []
+
+
+@pytest.mark.parametrize("seed", [1, 42])
+def test_expanded_objects_only_reference_objects_in_the_bundle(seed):
+    assert _dangling_refs(_expanded_dataset(seed)) == []
+
+
+@pytest.mark.parametrize("seed", [1, 42])
+def test_object_refs_never_point_at_meta_objects(seed):
+    meta_refs = []
+    for obj in _expanded_dataset(seed):
+        refs = obj.get("object_refs", []) + ([obj["object_ref"]] if "object_ref" in obj else [])
+        meta_refs.extend(
+            (obj["id"], ref) for ref in refs
+            if ref.split("--", 1)[0] in ("marking-definition", "language-content")
+        )
+    assert meta_refs == []
+
+
+def test_expansion_is_reproducible():
+    assert _expanded_dataset(7) == _expanded_dataset(7)
+
+
+def test_types_with_required_references_are_skipped_without_candidates():
+    synthesizer = StixObjectSynthesizer(1)
+
+    assert synthesizer.generate("report", 5, ContextStore()) == []
+    assert synthesizer.generate("sighting", 5, ContextStore([{"type": "identity", "id": "identity--1"}])) == []
+
+
+def test_synthetic_dataset_has_no_dangling_references():
+    generator = StixObjectGenerator(api_key="", seed=3, use_cache=False, generation_mode="synthetic")
+    dataset = asyncio.run(generator.generate_dataset({obj_type: 10 for obj_type in OBJECT_TYPES}))
+    objects = [obj for objects in dataset.values() for obj in objects]
+
+    assert {"ipv4-addr", "domain-name", "file"} & set(dataset)
+    assert _dangling_refs(objects) == []
+    assert [obj["id"] for obj in objects if check_stix_object(obj)] == []
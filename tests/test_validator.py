@@ -0,0 +1,128 @@
+import pytest
+
+from stix_generator.core.context import ContextStore
+from stix_generator.core.object_generator import StixObjectGenerator
+from stix_generator.core.validator import check_stix_object, is_valid_timestamp, normalize_stix_object
+
+UUID = "0a1b2c3d-4e5f-4a6b-8c7d-9e0f1a2b3c4d"
+
+
+def _valid(obj_type, **properties):
+    return {
+        "type": obj_type,
+        "id": f"{obj_type}--{UUID}",
+        "created": "2024-01-01T00:00:00.000Z",
+        "modified": "2024-01-01T00:00:00.000Z",
+        **properties,
+    }
+
+
+@pytest.mark.parametrize("obj, problems", [
+    (_valid("malware"), ["is_family"]),
+    (_valid("malware-analysis", product="sandbox"), ["result/analysis_sco_refs"]),
+    (_valid("marking-definition", definition_type="statement"), ["definition"]),
+    (_valid("location"), ["region/country/latitude"]),
+    (_valid("report", name="r", published="2024-01-01T00:00:00Z"), ["object_refs"]),
+    (_valid("tool", name="t", id=f"malware--{UUID}"), ["id"]),
+    (_valid("tool", name="t", created="2024-02-30T00:00:00Z"), ["created"]),
+    (_valid("unknown-type"), ["type"]),
+])
+def test_check_rejects_missing_or_invalid_properties(obj, problems):
+    assert check_stix_object(obj) == problems
+
+
+@pytest.mark.parametrize("obj", [
+    _valid("malware", is_family=False),
+    _valid("malware-analysis", product="sandbox", result="malicious"),
+    _valid("malware-analysis", product="sandbox", analysis_sco_refs=[f"file--{UUID}"]),
+    _valid("marking-definition", definition_type="statement", definition={"statement": "x"}),
+    _valid("location", country="JP"),
+    _valid("file", name="a.exe"),
+])
+def test_check_accepts_complete_objects(obj):
+    assert check_stix_object(obj) == []
+
+
+@pytest.mark.parametrize("value, valid", [
+    ("2024-02-29T12:00:00Z", True),
+    ("2024-01-01T00:00:00.123456Z", True),
+    ("2023-02-29T12:00:00Z", False),
+    ("2024-13-01T00:00:00Z", False),
+    ("not a timestamp", False),
+])
+def test_timestamps_must_exist(value, valid):
+    assert is_valid_timestamp(value) is valid
+
+
+def test_normalize_fills_in_marking_definitions():
+    obj = {"type": "marking-definition", "id": f"marking-definition--{UUID}", "created": "2024-01-01T00:00:00Z"}
+
+    fixes = normalize_stix_object(obj)
+
+    assert {"definition_type", "definition"} <= set(fixes)
+    assert "modified" not in obj
+    assert check_stix_object(obj) == []
+
+
+def test_normalize_sanitizes_observed_data_without_touching_the_input_observables():
+    observable = {"type": "file", "name": "a.exe", "created": "2024-01-01T00:00:00Z"}
+    traffic = {"type": "network-traffic", "src_ref": 0, "protocols": ["tcp"]}
+    obj = _valid(
+        "observed-data",
+        first_observed="2024-01-01T00:00:00Z",
+        last_observed="2024-01-01T00:00:00Z",
+        number_observed=1,
+        objects={"0": observable, "1": traffic, "2": "not an observable"},
+    )
+
+    assert "objects" in normalize_stix_object(obj)
+
+    assert obj["objects"] == {
+        "0": {"type": "file", "name": "a.exe"},
+        "1": {"type": "network-traffic", "src_ref": "0", "protocols": ["tcp"]},
+    }
+    assert observable["created"] == "2024-01-01T00:00:00Z"
+    assert traffic["src_ref"] == 0
+
+
+def test_normalize_drops_or_replaces_invalid_references():
+    replacement = f"indicator--{UUID}"
+    obj = _valid(
+        "sighting",
+        sighting_of_ref="indicator--bogus",
+        observed_data_refs=["observed-data--bogus"],
+        where_sighted_refs=[f"identity--{UUID}", "bogus"],
+    )
+
+    fixes = normalize_stix_object(obj, find_reference=lambda ref_type: replacement if ref_type == "indicator" else None)
+
+    assert obj["sighting_of_ref"] == replacement
+    assert "observed_data_refs" not in obj
+    assert obj["where_sighted_refs"] == [f"identity--{UUID}"]
+    assert {"sighting_of_ref", "observed_data_refs", "where_sighted_refs"} <= set(fixes)
+
+
+def test_repaired_ids_are_derived_from_content():
+    generator = StixObjectGenerator(api_key="", seed=1, use_cache=False)
+    first = generator._prepare_object({"name": "Emotet", "is_family": True}, ContextStore(), "malware")
+    again = StixObjectGenerator(api_key="", seed=2, use_cache=False)._prepare_object(
+        {"name": "Emotet", "is_family": True}, ContextStore(), "malware"
+    )
+    other = generator._prepare_object({"name": "TrickBot", "is_family": True}, ContextStore(), "malware")
+
+    assert first["id"] == again["id"]
+    assert first["id"] != other["id"]
+
+
+def test_identical_objects_get_salted_ids_instead_of_sharing_one():
+    generator = StixObjectGenerator(api_key="", seed=1, use_cache=False)
+    context = ContextStore()
+    ids = []
+    for _ in range(3):
+        obj = generator._prepare_object({"name": "Emotet", "is_family": True}, context, "malware")
+        context.append(obj)
+        ids.append(obj["id"])
+
+    assert len(set(ids)) == 3
+    assert all(check_stix_object(obj) == [] for obj in context)
+    assert generator.repair_counts["id"] >= 3